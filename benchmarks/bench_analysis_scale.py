@@ -0,0 +1,86 @@
+"""Calibrate critic visual metrics rendered at reduced analysis scales.
+
+Renders designer frames at full resolution and at each reduced scale,
+then reports render + metric cost and the largest drift of every visual
+metric from its full-resolution value. Scales whose drift stays within
+the tolerance are safe values for CriticAgent.analysis_scale.
+
+Usage:
+    python benchmarks/bench_analysis_scale.py [--frames N] [--scales 0.5 0.25] [--tolerance T]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+
+from src.agents.critic import CriticAgent
+from src.agents.designer_agent import DesignerAgent
+from src.utils import raster
+
+METRICS = ("brightness", "contrast", "saturation", "color_variety")
+
+
+def make_frames(count):
+    """Generate distinct designer frames."""
+    designer = DesignerAgent()
+    return [
+        designer.generate_svg({'brightness': 1.0 + i / count, 'saturation': 2.0 - i / count, 'glow': 4.5})
+        for i in range(count)
+    ]
+
+
+def measure(critic, frames, scale):
+    """Render and analyze frames at a scale.
+
+    Returns:
+        Tuple of metric array (frames, metrics), pixels per frame and
+        average milliseconds per frame
+    """
+    values = []
+    start = time.perf_counter()
+    for frame in frames:
+        pixels = raster.render_svg(frame, scale=scale)
+        metrics = critic.compute_image_metrics(pixels)
+        values.append([metrics[name] for name in METRICS])
+    elapsed = (time.perf_counter() - start) / len(frames) * 1e3
+    return np.array(values), pixels.shape[0] * pixels.shape[1], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--scales', type=float, nargs='+', default=[0.5, 0.25])
+    parser.add_argument('--tolerance', type=float, default=0.01, help='max absolute metric drift')
+    args = parser.parse_args()
+
+    critic = CriticAgent()
+    frames = make_frames(args.frames)
+    reference, full_pixels, full_ms = measure(critic, frames, 1.0)
+    print(f"{len(frames)} frames, {full_pixels} pixels at full resolution, tolerance {args.tolerance}")
+
+    header = ''.join(f"{name:>15}" for name in METRICS)
+    print(f"{'scale':<8}{'pixels':>10}{'ms/frame':>10}{header}  result")
+    print(f"{1.0:<8}{full_pixels:>10}{full_ms:>10.2f}{'':>{15 * len(METRICS)}}  reference")
+
+    best = 1.0
+    for scale in sorted(args.scales, reverse=True):
+        values, pixels, ms = measure(critic, frames, scale)
+        drift = np.abs(values - reference).max(axis=0)
+        within = bool((drift <= args.tolerance).all())
+        if within and scale < best:
+            best = scale
+        columns = ''.join(f"{value:>15.5f}" for value in drift)
+        result = f"ok ({full_pixels / pixels:.1f}x fewer pixels)" if within else "exceeds tolerance"
+        print(f"{scale:<8}{pixels:>10}{ms:>10.2f}{columns}  {result}")
+
+    print(f"smallest scale within tolerance: {best}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark per-frame and batch animation timing analysis.
+
+Usage:
+    python benchmarks/bench_feedback.py [--frames N] [--values N]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.feedback_parser import FeedbackParser
+from src.utils.parsed_frame import ParsedFrame
+
+
+def make_frames(count, value_count):
+    """Generate frames whose animations each have a distinct values list."""
+    frames = []
+    for i in range(count):
+        values = ';'.join(str(step * 10 + (i + step) % 3) for step in range(value_count))
+        frames.append(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">'
+            f'<circle cx="50" cy="50" r="{i % 40}">'
+            f'<animate attributeName="r" dur="{1 + i % 5}s" values="{values}" repeatCount="indefinite"/>'
+            f'</circle></svg>'
+        )
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=10000)
+    parser.add_argument('--values', type=int, default=5, help='values per animation')
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, args.values)
+    start = time.perf_counter()
+    parsed = [ParsedFrame(frame) for frame in frames]
+    print(f"{len(frames)} frames, parsed in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    start = time.perf_counter()
+    for frame in parsed:
+        FeedbackParser.parse_animation_timing(frame)
+    print(f"{'per-frame parse_animation_timing':<36}{(time.perf_counter() - start) * 1e3:>10.1f} ms")
+
+    start = time.perf_counter()
+    FeedbackParser.parse_sequence_timing(parsed)
+    print(f"{'batch parse_sequence_timing':<36}{(time.perf_counter() - start) * 1e3:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Guard the startup cost of src.agents.critic against regressions.
+
+Imports the critic and constructs a CriticAgent in fresh interpreters,
+reporting the median wall time and the slowest packages from
+``python -X importtime``. Exits with status 1 if the median exceeds the
+budget or if a module that should only load on first use (OpenAI
+client, cairo rendering, PIL, python-dotenv, HTTP server) was imported,
+so it can run as a CI check.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs N] [--budget-ms MS] [--top N]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# Modules the critic must not import until they are used
+DEFERRED = ("openai", "cairosvg", "cairocffi", "PIL", "dotenv", "http.server")
+
+STARTUP = """
+import sys, time
+start = time.perf_counter()
+from src.agents.critic import CriticAgent
+CriticAgent()
+elapsed = time.perf_counter() - start
+print(repr((elapsed, sorted(name for name in {deferred!r} if name in sys.modules))))
+"""
+
+
+def measure():
+    """Time critic startup in a fresh interpreter.
+
+    Returns:
+        Tuple of seconds, deferred modules that were imported and the
+        ``-X importtime`` report
+    """
+    env = dict(os.environ, OPENAI_API_KEY="", LLM_BACKEND="")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP.format(deferred=DEFERRED)],
+        cwd=project_root, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed, loaded = ast.literal_eval(result.stdout.strip().splitlines()[-1])
+    return elapsed, loaded, result.stderr
+
+
+def slowest_packages(report, top):
+    """Parse an importtime report into the slowest packages other than src.
+
+    Returns:
+        (cumulative microseconds, package) pairs, slowest first
+    """
+    totals = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        if package != "src":
+            totals[package] = max(totals.get(package, 0), int(cumulative))
+    return sorted(((total, package) for package, total in totals.items()), reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=500.0, help='max median startup time')
+    parser.add_argument('--top', type=int, default=8, help='slowest packages to list')
+    args = parser.parse_args()
+
+    times, loaded, report = [], set(), ""
+    for _ in range(args.runs):
+        elapsed, modules, report = measure()
+        times.append(elapsed * 1e3)
+        loaded.update(modules)
+    median = statistics.median(times)
+
+    print(f"critic import + CriticAgent(): median {median:.1f} ms over {args.runs} runs "
+          f"(min {min(times):.1f}, max {max(times):.1f}), budget {args.budget_ms:.0f} ms")
+    print("slowest packages (cumulative ms):")
+    for microseconds, name in slowest_packages(report, args.top):
+        print(f"  {microseconds / 1e3:>8.1f}  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported at startup: {', '.join(sorted(loaded))}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: median startup exceeds budget by {median - args.budget_ms:.1f} ms")
+        failed = True
+    if not failed:
+        print("ok")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
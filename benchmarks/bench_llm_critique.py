@@ -0,0 +1,95 @@
+"""Load-test LLM critique throughput against the local stub backend.
+
+Critiques a set of candidate analyses through CriticAgent with a
+StubBackend of fixed latency and error rate, so no API key or network
+is needed. Reports wall time, requests sent, stub errors, peak
+concurrency and rate-limiter waits for sequential, concurrent, batched
+and cached runs. With --server the stub is served over localhost HTTP
+and reached through the OpenAI client, including its retries.
+
+Usage:
+    python benchmarks/bench_llm_critique.py [--candidates N] [--latency S] [--error-rate R] [--server]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.agents.critic import CriticAgent
+from src.utils.cache import FeedbackCache
+from src.utils.llm_backend import OpenAIBackend, StubBackend, serve_stub
+from src.utils.rate_limit import RateLimiter
+
+
+def make_analyses(count):
+    """Build distinct (metrics, technical_issues) pairs."""
+    return [
+        ({'brightness': 0.3 + 0.4 * i / count, 'contrast': 0.4, 'saturation': 0.5, 'color_variety': 0.2}, [])
+        for i in range(count)
+    ]
+
+
+def run(critic, stub, label, critique, analyses):
+    """Time one critique run and print its statistics."""
+    requests, errors = stub.requests, stub.errors
+    waits = critic.rate_limiter.waits
+    stub.peak_in_flight = 0
+    start = time.perf_counter()
+    critique(analyses)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12}{elapsed:>10.2f}{stub.requests - requests:>10}{stub.errors - errors:>8}"
+          f"{stub.peak_in_flight:>8}{critic.rate_limiter.waits - waits:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds per stub request')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--requests-per-minute', type=float, default=0, help='0 disables the limit')
+    parser.add_argument('--server', action='store_true', help='serve the stub over localhost HTTP')
+    args = parser.parse_args()
+
+    stub = StubBackend(latency=args.latency, error_rate=args.error_rate, seed=0)
+    critic = CriticAgent()
+    critic.rate_limiter = RateLimiter(args.requests_per_minute, 0)
+    critic.use_llm = True
+    critic.backend = stub
+    server = None
+    if args.server:
+        server = serve_stub(stub)
+        critic.backend = OpenAIBackend("stub", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+    critic.llm_concurrency = args.concurrency
+
+    print(f"{args.candidates} candidates, {args.latency}s latency, error rate {args.error_rate}, "
+          f"{'localhost server' if server else 'in-process stub'}")
+    print(f"{'mode':<12}{'seconds':>10}{'requests':>10}{'errors':>8}{'peak':>8}{'waits':>8}")
+    try:
+        def sequential(analyses):
+            return [critic.generate_llm_feedback(metrics, issues) for metrics, issues in analyses]
+
+        def concurrent(analyses):
+            critic.llm_batch_size = 1
+            return critic.critique_many(analyses)
+
+        def batched(analyses):
+            critic.llm_batch_size = args.batch_size
+            return critic.critique_many(analyses)
+
+        for label, critique in (("sequential", sequential), ("concurrent", concurrent), ("batched", batched)):
+            critic.feedback_cache = FeedbackCache()
+            run(critic, stub, label, critique, make_analyses(args.candidates))
+        run(critic, stub, "cached", batched, make_analyses(args.candidates))
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
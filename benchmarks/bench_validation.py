@@ -0,0 +1,74 @@
+"""Benchmark per-frame validation cost with and without strict schema checks.
+
+Usage:
+    python benchmarks/bench_validation.py [--frames N] [--circles N]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.agents.designer_agent import DesignerAgent
+from src.utils.parsed_frame import ParsedFrame
+from src.utils.svg_validator import SVGValidator
+from src.utils.svg_schema import load_schema
+
+
+def make_frames(count, extra_circles):
+    """Generate distinct designer frames, optionally padded with circles."""
+    designer = DesignerAgent()
+    padding = ''.join(
+        f'<circle cx="{i % 800}" cy="{i % 600}" r="{1 + i % 7}" fill="#ff00ff"/>'
+        for i in range(extra_circles)
+    )
+    frames = []
+    for i in range(count):
+        svg = designer.generate_svg({'brightness': 1.0 + i / count, 'saturation': 2.0, 'glow': 4.5})
+        frames.append(svg.replace('</svg>', padding + '</svg>'))
+    return frames
+
+
+def time_per_frame(func, frames):
+    """Average wall time of func over frames, in microseconds."""
+    start = time.perf_counter()
+    for frame in frames:
+        func(frame)
+    return (time.perf_counter() - start) / len(frames) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--circles', type=int, default=0, help='extra circles per frame')
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, args.circles)
+    print(f"{len(frames)} frames, {len(frames[0]) / 1024:.1f} KB each")
+
+    start = time.perf_counter()
+    load_schema()
+    print(f"{'schema compile (once per process)':<36}{(time.perf_counter() - start) * 1e6:>10.1f} us")
+
+    parsed = [ParsedFrame(frame) for frame in frames]
+    rows = [
+        ("parse only", lambda frame: ParsedFrame(frame)),
+        ("validate_all", lambda frame: SVGValidator.validate_all(frame, use_cache=False)),
+        ("validate_all strict", lambda frame: SVGValidator.validate_all(frame, use_cache=False, strict=True)),
+        ("schema check on parsed frame", None),
+    ]
+    for name, func in rows:
+        # Start every row from unparsed markup
+        ParsedFrame.cache.clear()
+        if func is None:
+            cost = time_per_frame(SVGValidator.validate_schema, parsed)
+        else:
+            cost = time_per_frame(func, frames)
+        print(f"{name:<36}{cost:>10.1f} us/frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,84 @@
-from typing import List, Dict, Any
-from lxml import etree
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import atexit
+import weakref
 from ..utils.svg_validator import SVGValidator
 from ..utils.feedback_parser import FeedbackParser
-import re
+from ..utils.delta_validator import DeltaValidator
+from ..utils.parsed_frame import ParsedFrame
+from ..utils.smil_timeline import SMILTimeline
+from ..utils.rate_limit import RateLimiter
+from ..utils.cache import FeedbackCache, RasterCache, content_hash
+from ..utils.llm_backend import CritiqueBackend, OpenAIBackend, StubBackend
+from ..utils import diagnostics
 import numpy as np
-from PIL import Image
-import io
-import cairosvg
-import openai
 import json
 import os
-from dotenv import load_dotenv
-import time
+
+# Rendering (cairo), the OpenAI client and python-dotenv are imported on
+# first use, so structural scoring does not pay for them at startup; the
+# nearest .env file is loaded once per process
+_environment_loaded = False
+
+def _load_environment() -> None:
+    """Load the nearest .env file into the environment, once per process.
+    
+    Searches this file's directory and its parents, like python-dotenv's
+    default lookup, and only imports python-dotenv if a file is found.
+    """
+    global _environment_loaded
+    if _environment_loaded:
+        return
+    _environment_loaded = True
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, '.env')
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+# Per-frame series reported by CriticAgent.analyze_frame_visuals
+VISUAL_SERIES = ("brightness", "contrast", "saturation", "color_variety", "distribution_score", "score")
+
+def _frame_metrics_task(args: Tuple[str, float, int]) -> Dict[str, Any]:
+    """Process pool entry point for CriticAgent.analyze_frame_visuals."""
+    svg_content, scale, palette_bits = args
+    from ..utils import image_stats, raster
+    try:
+        pixels = raster.render_svg(svg_content, scale=scale)
+        return image_stats.image_statistics(pixels, palette_bits)
+    except Exception as e:
+        return {"error": str(e)}
 
 class CriticAgent:
     """Agent responsible for analyzing and providing feedback on SVG animations."""
     
+    # Decoded renders keyed by canonical SVG hash and output size, shared by
+    # all critics; set RASTER_CACHE_DIR to add a disk tier, or use
+    # raster_cache.configure(...) to change budgets or opt out
+    raster_cache = RasterCache(max_bytes=256 * 2 ** 20)
+    
+    # Request and token rate limits of the LLM API key, shared by all
+    # critics; set LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE or use
+    # rate_limiter.configure(...) to match the account's quota
+    rate_limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=90000)
+    
+    # LLM feedback keyed on model and rendered prompt, shared by all critics;
+    # set LLM_CACHE_PATH to persist it in an SQLite file across runs
+    feedback_cache = FeedbackCache()
+    
+    # Worker processes for multi-frame visual analysis, started on first use
+    # and kept for later calls by all critics; see shutdown_render_pool(),
+    # which also runs at interpreter exit
+    _render_pool: Optional[ProcessPoolExecutor] = None
+    _render_pool_workers = 0
+    
     def __init__(self):
         """Initialize the Critic agent."""
         self.timing_weight = 0.3
@@ -33,6 +96,10 @@ class CriticAgent:
         self.extreme_position_threshold = 100.0
         self.timing_penalty = 0.3
         
+        # Batch validation: frame counts above the threshold use a process pool
+        self.parallel_validation_threshold = 64
+        self.validation_workers = None  # Default: CPU count
+        
         # Visual analysis parameters
         self.min_contrast = 0.3
         self.min_brightness = 0.2
@@ -40,25 +107,75 @@ class CriticAgent:
         self.min_saturation = 0.3
         self.max_saturation = 0.8
         
+        # Visual metrics are global image statistics, so frames can be
+        # rendered at a fraction of their native size per axis (0.5 renders
+        # 4x fewer pixels, 0.25 16x fewer); see benchmarks/bench_analysis_scale.py
+        # for the metric drift at each scale
+        self.analysis_scale = 1.0
+        
+        # Bits per channel used for color variety: 8 counts exact colors,
+        # fewer quantize to a palette of 2 ** (3 * bits) colors first
+        self.color_palette_bits = 8
+        
+        # Multi-frame visual analysis: None analyzes only the last frame,
+        # k renders every k-th frame (and the last) in the render pool,
+        # 1 renders all of them
+        self.visual_frame_step = None
+        self.visual_workers = None  # Default: CPU count
+        
+        # Snapshots per animation period sampled by analyze_motion()
+        self.motion_samples = 16
+        
         # Load environment variables
-        load_dotenv()
+        _load_environment()
+        
+        raster_cache_dir = os.getenv('RASTER_CACHE_DIR')
+        if raster_cache_dir and self.raster_cache.directory is None:
+            self.raster_cache.configure(directory=raster_cache_dir)
+        self.analysis_scale = float(os.getenv('CRITIC_ANALYSIS_SCALE', self.analysis_scale))
         
-        # Initialize OpenAI client if API key is available
+        # LLM critiques in flight at once on the async path, across all
+        # concurrent calls on this critic, and completion tokens reserved
+        # from the token budget per request
+        self.llm_concurrency = int(os.getenv('LLM_CONCURRENCY', 4))
+        self._llm_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self.llm_completion_tokens = 800
+        
+        # Analyses critiqued per request by critique_many(); 1 sends each alone
+        self.llm_batch_size = int(os.getenv('LLM_BATCH_SIZE', 8))
+        llm_cache_path = os.getenv('LLM_CACHE_PATH')
+        if llm_cache_path and self.feedback_cache.path is None:
+            self.feedback_cache.configure(path=llm_cache_path)
+        requests_per_minute = os.getenv('LLM_REQUESTS_PER_MINUTE')
+        tokens_per_minute = os.getenv('LLM_TOKENS_PER_MINUTE')
+        if requests_per_minute or tokens_per_minute:
+            self.rate_limiter.configure(
+                requests_per_minute=float(requests_per_minute) if requests_per_minute else None,
+                tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None
+            )
+        
+        # Chat-completions backend: OpenAI if an API key is available, or
+        # the local stub with LLM_BACKEND=stub for offline load tests
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.model = os.getenv('OPENAI_MODEL', 'gpt-4-turbo-preview')
-        self.use_llm = bool(self.api_key)
+        self.backend: Optional[CritiqueBackend] = None
+        if os.getenv('LLM_BACKEND', '').lower() == 'stub':
+            self.backend = StubBackend(
+                latency=float(os.getenv('LLM_STUB_LATENCY', 0.0)),
+                error_rate=float(os.getenv('LLM_STUB_ERROR_RATE', 0.0))
+            )
+        elif self.api_key:
+            self.backend = OpenAIBackend(self.api_key, base_url=os.getenv('OPENAI_BASE_URL'))
+        self.use_llm = self.backend is not None
         
-        if self.use_llm:
-            self.client = openai.OpenAI(api_key=self.api_key)
-        else:
-            print("\n" + "="*80)
-            print("OpenAI API key not found. To enable LLM-powered feedback:")
-            print("1. Create a .env file in the project root")
-            print("2. Add your OpenAI API key:")
-            print("   OPENAI_API_KEY=sk-your-api-key-here")
-            print("3. Optional: Specify model (default: gpt-4-turbo-preview):")
-            print("   OPENAI_MODEL=gpt-4-turbo-preview")
-            print("="*80 + "\n")
+        if not self.use_llm:
+            diagnostics.record(
+                "critic", "llm_backend", False,
+                "OpenAI API key not found; using rule-based feedback. To enable LLM-powered feedback, "
+                "set OPENAI_API_KEY (and optionally OPENAI_MODEL, default: gpt-4-turbo-preview) "
+                "in the environment or a .env file in the project root",
+                diagnostics.WARNING
+            )
         
         # Enhanced system prompt for the LLM
         self.system_prompt = """You are an expert animation critic and visual designer with deep knowledge of SVG animations, motion design, and user experience. Your role is to provide detailed, constructive feedback on SVG animations.
@@ -127,35 +244,20 @@ Always provide specific, measurable feedback that can be directly implemented.""
             }
         }
     
-    def generate_llm_feedback(self, metrics: Dict[str, Any], technical_issues: List[str]) -> Dict[str, List[str]]:
-        """Generate natural language feedback using LLM.
+    def build_feedback_prompt(self, metrics: Dict[str, Any], technical_issues: List[str]) -> str:
+        """Build the LLM critique prompt for one analysis.
         
         Args:
             metrics: Dictionary of visual and technical metrics
             technical_issues: List of technical issues found
             
         Returns:
-            Dictionary containing feedback and suggestions
+            User prompt text
         """
-        if not self.use_llm:
-            return self.generate_fallback_feedback(metrics, technical_issues)
-        
-        try:
-            # Add a small delay to avoid rate limiting
-            time.sleep(1)  # 1 second delay between API calls
-            
-            # Enhanced prompt with more context and specific questions
-            prompt = f"""Analyze this SVG animation with the following detailed metrics:
-
-Visual Metrics:
-- Brightness: {metrics.get('brightness', 0):.2f} (target: 0.5)
-- Contrast: {metrics.get('contrast', 0):.2f} (minimum: 0.3)
-- Saturation: {metrics.get('saturation', 0):.2f} (target range: 0.3-0.8)
-- Color Variety: {metrics.get('color_variety', 0):.2f} (minimum: 0.1)
-- Distribution Score: {metrics.get('distribution_score', 0):.2f} (minimum: 0.7)
+        # Enhanced prompt with more context and specific questions
+        prompt = f"""Analyze this SVG animation with the following detailed metrics:
 
-Technical Issues:
-{chr(10).join(f'- {issue}' for issue in technical_issues) if technical_issues else 'No technical issues found'}
+{self._metrics_section(metrics, technical_issues)}
 
 Please provide detailed feedback in these areas:
 
@@ -194,31 +296,326 @@ Example format:
         "Adjust circle positions to achieve a distribution score above 0.7"
     ]
 }}"""
+        return prompt
+    
+    @staticmethod
+    def _metrics_section(metrics: Dict[str, Any], technical_issues: List[str]) -> str:
+        """Describe one analysis's metrics and issues for a prompt."""
+        return f"""Visual Metrics:
+- Brightness: {metrics.get('brightness', 0):.2f} (target: 0.5)
+- Contrast: {metrics.get('contrast', 0):.2f} (minimum: 0.3)
+- Saturation: {metrics.get('saturation', 0):.2f} (target range: 0.3-0.8)
+- Color Variety: {metrics.get('color_variety', 0):.2f} (minimum: 0.1)
+- Distribution Score: {metrics.get('distribution_score', 0):.2f} (minimum: 0.7)
+
+Technical Issues:
+{chr(10).join(f'- {issue}' for issue in technical_issues) if technical_issues else 'No technical issues found'}"""
+    
+    def build_batch_prompt(self, analyses: List[Tuple[Dict[str, Any], List[str]]]) -> str:
+        """Build one LLM critique prompt covering several analyses.
+        
+        Args:
+            analyses: (metrics, technical_issues) pairs
+            
+        Returns:
+            User prompt text asking for one JSON entry per candidate
+        """
+        candidates = "\n\n".join(
+            f"Candidate {i}:\n{self._metrics_section(metrics, issues)}"
+            for i, (metrics, issues) in enumerate(analyses)
+        )
+        return f"""Analyze each of these {len(analyses)} SVG animation candidates independently, using their detailed metrics:
+
+{candidates}
+
+For every candidate, provide 2-3 points each on visual design, technical implementation and user experience, referencing its metrics.
+
+Format your response as JSON with a single key 'candidates': a list with one object per candidate, in order, each with these keys:
+- 'id': The candidate number
+- 'positive_feedback': List of specific positive aspects with metrics
+- 'improvements': List of specific areas for improvement with metrics
+- 'suggestions': List of concrete, actionable suggestions with specific values"""
+    
+    @staticmethod
+    def _split_batch_response(content: str, count: int) -> List[Dict[str, List[str]]]:
+        """Split a batch critique response into per-candidate feedback.
+        
+        Raises:
+            ValueError: If the response does not hold exactly one
+                well-formed entry per candidate
+        """
+        entries = json.loads(content).get("candidates")
+        if not isinstance(entries, list):
+            raise ValueError("Batch response has no candidates list")
+        if len(entries) != count:
+            raise ValueError(f"Batch response has {len(entries)} entries, expected {count}")
+        by_id = {}
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                raise ValueError("Batch response entry is not an object")
+            candidate = entry.get("id", position)
+            if not isinstance(candidate, int) or isinstance(candidate, bool):
+                raise ValueError(f"Batch response entry {position} has invalid id {candidate!r}")
+            if candidate in by_id:
+                raise ValueError(f"Batch response has duplicate entries for candidate {candidate}")
+            by_id[candidate] = entry
+        if sorted(by_id) != list(range(count)):
+            raise ValueError(f"Batch response covers candidates {sorted(by_id)}, expected {count}")
+        results = []
+        for i in range(count):
+            lists = [by_id[i].get(key, []) for key in ("positive_feedback", "improvements", "suggestions")]
+            if not all(isinstance(items, list) for items in lists):
+                raise ValueError(f"Batch response entry {i} is malformed")
+            results.append({"feedback": lists[0] + lists[1], "suggestions": lists[2]})
+        return results
+    
+    def estimate_tokens(self, prompt: str) -> int:
+        """Estimate the tokens a critique request uses, for rate limiting.
+        
+        Args:
+            prompt: User prompt text
+            
+        Returns:
+            Approximate prompt tokens (four characters each) plus the
+            reserved completion budget
+        """
+        return (len(self.system_prompt) + len(prompt)) // 4 + self.llm_completion_tokens
+    
+    def _completion_request(self, prompt: str) -> Dict[str, Any]:
+        """Arguments of a chat completion request for a critique prompt."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.7,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _record_usage(self, response: Dict[str, Any], estimated_tokens: int) -> None:
+        """Correct the rate limiter with a completion's reported token usage."""
+        total_tokens = (response.get("usage") or {}).get("total_tokens")
+        if total_tokens:
+            self.rate_limiter.record_usage(estimated_tokens, total_tokens)
+    
+    def _parse_llm_response(self, response: Dict[str, Any], estimated_tokens: int) -> Dict[str, List[str]]:
+        """Extract feedback from a chat completion and record its token usage."""
+        self._record_usage(response, estimated_tokens)
+        
+        # Parse the response
+        feedback = response["choices"][0]["message"]["content"]
+        feedback_dict = json.loads(feedback)
+        
+        return {
+            "feedback": feedback_dict.get("positive_feedback", []) + feedback_dict.get("improvements", []),
+            "suggestions": feedback_dict.get("suggestions", [])
+        }
+    
+    def generate_llm_feedback(self, metrics: Dict[str, Any], technical_issues: List[str]) -> Dict[str, List[str]]:
+        """Generate natural language feedback using LLM.
+        
+        Prompts already answered for the same model are served from
+        feedback_cache without a request.
+        
+        Args:
+            metrics: Dictionary of visual and technical metrics
+            technical_issues: List of technical issues found
+            
+        Returns:
+            Dictionary containing feedback and suggestions
+        """
+        if not self.use_llm:
+            return self.generate_fallback_feedback(metrics, technical_issues)
+        
+        try:
+            prompt = self.build_feedback_prompt(metrics, technical_issues)
+            cache_key = FeedbackCache.make_key(self.model, self.system_prompt, prompt)
+            cached = self.feedback_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            estimated_tokens = self.estimate_tokens(prompt)
+            
+            # Wait only as long as the shared rate limits require
+            self.rate_limiter.wait(estimated_tokens)
             
             # Get response from LLM
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
+            response = self.backend.complete(self._completion_request(prompt))
+            feedback = self._parse_llm_response(response, estimated_tokens)
+            self.feedback_cache.put(cache_key, feedback)
+            return feedback
+            
+        except Exception as e:
+            diagnostics.record("critic", "llm_feedback", False, f"Error generating LLM feedback: {str(e)}", diagnostics.ERROR)
+            return self.generate_fallback_feedback(metrics, technical_issues)
+    
+    def _llm_limiter(self) -> asyncio.Semaphore:
+        """Get the semaphore capping this critic's requests in flight.
+        
+        Semaphores belong to an event loop, so each running loop gets one
+        of llm_concurrency slots, shared by every call on that loop.
+        """
+        loop = asyncio.get_running_loop()
+        slots = self._llm_slots.get(loop)
+        if slots is None:
+            slots = self._llm_slots[loop] = asyncio.Semaphore(max(1, self.llm_concurrency))
+        return slots
+    
+    async def aclose(self) -> None:
+        """Release the backend's connections bound to the running event loop.
+        
+        Call this (or use the critic as an async context manager) before
+        the loop that awaited the async critique methods is closed.
+        """
+        if self.backend is not None:
+            await self.backend.aclose()
+    
+    async def __aenter__(self) -> "CriticAgent":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def generate_llm_feedback_async(
+        self,
+        metrics: Dict[str, Any],
+        technical_issues: List[str]
+    ) -> Dict[str, List[str]]:
+        """Generate natural language feedback using LLM without blocking.
+        
+        Prompts already answered for the same model are served from
+        feedback_cache without a request. At most llm_concurrency
+        requests of this critic are in flight at once.
+        
+        Args:
+            metrics: Dictionary of visual and technical metrics
+            technical_issues: List of technical issues found
             
-            # Parse the response
-            feedback = response.choices[0].message.content
-            feedback_dict = json.loads(feedback)
+        Returns:
+            Dictionary containing feedback and suggestions
+        """
+        if not self.use_llm:
+            return self.generate_fallback_feedback(metrics, technical_issues)
+        
+        try:
+            prompt = self.build_feedback_prompt(metrics, technical_issues)
+            cache_key = FeedbackCache.make_key(self.model, self.system_prompt, prompt)
+            cached = self.feedback_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            estimated_tokens = self.estimate_tokens(prompt)
             
-            return {
-                "feedback": feedback_dict.get("positive_feedback", []) + feedback_dict.get("improvements", []),
-                "suggestions": feedback_dict.get("suggestions", [])
-            }
+            async with self._llm_limiter():
+                await self.rate_limiter.acquire(estimated_tokens)
+                response = await self.backend.acomplete(self._completion_request(prompt))
+            feedback = self._parse_llm_response(response, estimated_tokens)
+            self.feedback_cache.put(cache_key, feedback)
+            return feedback
             
         except Exception as e:
-            print(f"Error generating LLM feedback: {str(e)}")
+            diagnostics.record("critic", "llm_feedback", False, f"Error generating LLM feedback: {str(e)}", diagnostics.ERROR)
             return self.generate_fallback_feedback(metrics, technical_issues)
     
+    async def critique_many_async(
+        self,
+        analyses: List[Tuple[Dict[str, Any], List[str]]]
+    ) -> List[Dict[str, List[str]]]:
+        """Generate LLM feedback for many analyses concurrently.
+        
+        Analyses not in feedback_cache are sent in batches of up to
+        llm_batch_size per request, so the system prompt and instructions
+        are sent once per batch. At most llm_concurrency requests are in
+        flight, counting those of other calls on this critic, and all of
+        them respect the shared rate limiter. The backend stays open for
+        later calls; see aclose().
+        
+        Args:
+            analyses: (metrics, technical_issues) pairs
+            
+        Returns:
+            Feedback dictionaries, in input order
+        """
+        if not self.use_llm:
+            return [self.generate_fallback_feedback(metrics, issues) for metrics, issues in analyses]
+        
+        results: List[Optional[Dict[str, List[str]]]] = [None] * len(analyses)
+        keys = []
+        for i, (metrics, issues) in enumerate(analyses):
+            keys.append(FeedbackCache.make_key(
+                self.model, self.system_prompt, self.build_feedback_prompt(metrics, issues)
+            ))
+            results[i] = self.feedback_cache.get(keys[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+        size = max(1, self.llm_batch_size)
+        batches = [pending[start:start + size] for start in range(0, len(pending), size)]
+        
+        batch_results = await asyncio.gather(*(
+            self.critique_batch_async([analyses[i] for i in batch])
+            for batch in batches
+        ))
+        for batch, feedback in zip(batches, batch_results):
+            for i, result in zip(batch, feedback):
+                results[i] = result
+        return results
+    
+    async def critique_batch_async(
+        self,
+        analyses: List[Tuple[Dict[str, Any], List[str]]]
+    ) -> List[Dict[str, List[str]]]:
+        """Critique several analyses in one request, splitting the response.
+        
+        If the request fails or its response cannot be split into one
+        entry per analysis, each analysis is critiqued on its own.
+        
+        Args:
+            analyses: (metrics, technical_issues) pairs
+            
+        Returns:
+            Feedback dictionaries, in input order
+        """
+        if len(analyses) > 1:
+            prompt = self.build_batch_prompt(analyses)
+            estimated_tokens = self.estimate_tokens(prompt) + (len(analyses) - 1) * self.llm_completion_tokens
+            try:
+                async with self._llm_limiter():
+                    await self.rate_limiter.acquire(estimated_tokens)
+                    response = await self.backend.acomplete(self._completion_request(prompt))
+                self._record_usage(response, estimated_tokens)
+                feedback = self._split_batch_response(response["choices"][0]["message"]["content"], len(analyses))
+            except Exception as e:
+                diagnostics.record(
+                    "critic", "llm_batch", False,
+                    f"Batch critique failed, retrying per item: {str(e)}", diagnostics.WARNING
+                )
+            else:
+                for (metrics, issues), result in zip(analyses, feedback):
+                    key = FeedbackCache.make_key(self.model, self.system_prompt, self.build_feedback_prompt(metrics, issues))
+                    self.feedback_cache.put(key, result)
+                return feedback
+        
+        return list(await asyncio.gather(*(
+            self.generate_llm_feedback_async(metrics, issues)
+            for metrics, issues in analyses
+        )))
+    
+    def critique_many(self, analyses: List[Tuple[Dict[str, Any], List[str]]]) -> List[Dict[str, List[str]]]:
+        """Blocking wrapper around critique_many_async().
+        
+        Must not be called from a running event loop; await
+        critique_many_async() there instead. The backend's connections on
+        the temporary event loop are closed before it returns.
+        
+        Args:
+            analyses: (metrics, technical_issues) pairs
+            
+        Returns:
+            Feedback dictionaries, in input order
+        """
+        async def critique():
+            async with self:
+                return await self.critique_many_async(analyses)
+        return asyncio.run(critique())
+    
     def generate_fallback_feedback(self, metrics: Dict[str, Any], technical_issues: List[str]) -> Dict[str, List[str]]:
         """Generate fallback feedback when LLM is not available.
         
@@ -274,118 +671,385 @@ Example format:
             "suggestions": suggestions
         }
     
-    def analyze_visual_appearance(self, svg_content: str) -> Dict[str, Any]:
-        """Analyze the visual appearance of the rendered SVG.
+    def rasterize(self, svg_content: str, scale: Optional[float] = None) -> np.ndarray:
+        """Render SVG content to a pixel array, using the raster cache.
         
         Args:
             svg_content: SVG markup string
+            scale: Fraction of the native size per axis (default: analysis_scale)
             
         Returns:
-            Dictionary containing visual analysis results
+            Read-only array of shape (height, width, 4) in the premultiplied
+            raster.PIXEL_FORMAT layout; use image_stats.channel_views() for RGB
         """
-        try:
-            # Convert SVG to PNG
-            png_data = cairosvg.svg2png(bytestring=svg_content.encode('utf-8'))
-            image = Image.open(io.BytesIO(png_data))
+        from ..utils import raster
+        if scale is None:
+            scale = self.analysis_scale
+        key = RasterCache.make_key(svg_content, pixel_format=raster.PIXEL_FORMAT, scale=scale)
+        img_array = self.raster_cache.get(key)
+        if img_array is None:
+            img_array = self.raster_cache.put(key, raster.render_svg(svg_content, scale=scale))
+        return img_array
+    
+    def compute_image_metrics(self, img_array: np.ndarray) -> Dict[str, float]:
+        """Compute global color statistics of a rendered image.
+        
+        Args:
+            img_array: Array from rasterize()
+            
+        Returns:
+            Dictionary with brightness, contrast, saturation and
+            color_variety, each between 0 and 1
+        """
+        if len(img_array.shape) == 3:  # Color image
+            # One fused pass over the buffer; no HSV image is built
+            from ..utils import image_stats
+            return image_stats.image_statistics(img_array, self.color_palette_bits)
+        
+        return {
+            "brightness": np.mean(img_array) / 255.0,
+            "contrast": np.std(img_array) / 255.0,
+            "saturation": 0.0,
+            "color_variety": 0.0
+        }
+    
+    def distribution_score(self, svg_content: str) -> float:
+        """Score how evenly circles are spread around their common center.
+        
+        Args:
+            svg_content: SVG markup string
             
-            # Convert to numpy array for analysis
-            img_array = np.array(image)
+        Returns:
+            1.0 for perfectly even spacing (or fewer than two circles),
+            lower for uneven spacing
+        """
+        circle_positions = [
+            (circle['cx'], circle['cy'])
+            for circle in ParsedFrame.shared(svg_content).numeric_attributes('circle', ('cx', 'cy'))
+            if circle.get('cx') is not None and circle.get('cy') is not None
+        ]
+        
+        if len(circle_positions) > 1:
+            positions = np.array(circle_positions)
+            center = np.mean(positions, axis=0)
+            distances = np.linalg.norm(positions - center, axis=1)
+            return 1.0 - np.std(distances) / np.mean(distances)
+        return 1.0
+    
+    def visual_issues(self, metrics: Dict[str, float], color: bool = True) -> List[str]:
+        """List visual metrics that fall outside their configured ranges.
+        
+        Args:
+            metrics: Image metrics plus distribution_score
+            color: Whether the metrics come from a color image
             
-            # Calculate basic metrics
-            brightness = np.mean(img_array) / 255.0
-            contrast = np.std(img_array) / 255.0
+        Returns:
+            List of technical issue messages
+        """
+        technical_issues = []
+        if metrics["brightness"] < self.min_brightness:
+            technical_issues.append("Image is too dark")
+        elif metrics["brightness"] > self.max_brightness:
+            technical_issues.append("Image is too bright")
+        if metrics["contrast"] < self.min_contrast:
+            technical_issues.append("Image lacks contrast")
+        if color:
+            if metrics["saturation"] < self.min_saturation:
+                technical_issues.append("Colors are too muted")
+            elif metrics["saturation"] > self.max_saturation:
+                technical_issues.append("Colors are too intense")
+            if metrics["color_variety"] < 0.1:
+                technical_issues.append("Limited color variety")
+        if metrics["distribution_score"] < 0.7:
+            technical_issues.append("Elements are not well-distributed")
+        return technical_issues
+    
+    def score_visual_metrics(self, metrics: Dict[str, float]) -> float:
+        """Combine visual metrics into a single score.
+        
+        Args:
+            metrics: Image metrics plus distribution_score
             
-            # Calculate color metrics
-            if len(img_array.shape) == 3:  # Color image
-                # Convert to HSV for better color analysis
-                hsv = np.array(image.convert('HSV'))
-                saturation = np.mean(hsv[:, :, 1]) / 255.0
-                
-                # Analyze color distribution
-                unique_colors = np.unique(img_array.reshape(-1, img_array.shape[2]), axis=0)
-                color_variety = len(unique_colors) / (256 * 256 * 256)  # Normalize by possible colors
-            else:
-                saturation = 0.0
-                color_variety = 0.0
+        Returns:
+            Visual score, 1.0 for a balanced image
+        """
+        return (
+            0.3 * (1.0 - abs(metrics["brightness"] - 0.5) * 2) +  # Brightness score
+            0.3 * min(1.0, metrics["contrast"] / self.min_contrast) +  # Contrast score
+            0.2 * (1.0 - abs(metrics["saturation"] - 0.5) * 2) +  # Saturation score
+            0.2 * metrics["distribution_score"]  # Distribution score
+        )
+    
+    @classmethod
+    def render_pool(cls, workers: int) -> ProcessPoolExecutor:
+        """Get the persistent render pool, starting it on first use.
+        
+        Args:
+            workers: Number of worker processes; a running pool of a
+                different size is replaced
             
-            # Analyze composition
-            # Check if circles are well-distributed
-            circle_positions = []
-            for match in re.finditer(r'<(?:svg:)?circle[^>]+>', svg_content):
-                circle = match.group(0)
-                cx_match = re.search(r'cx="([^"]+)"', circle)
-                cy_match = re.search(r'cy="([^"]+)"', circle)
-                if cx_match and cy_match:
-                    circle_positions.append((float(cx_match.group(1)), float(cy_match.group(1))))
+        Returns:
+            Process pool shared by all critics
+        """
+        if cls._render_pool is None or cls._render_pool_workers != workers:
+            cls.shutdown_render_pool()
+            cls._render_pool = ProcessPoolExecutor(max_workers=workers)
+            cls._render_pool_workers = workers
+        return cls._render_pool
+    
+    @classmethod
+    def shutdown_render_pool(cls) -> None:
+        """Stop the render pool's worker processes, if it is running."""
+        if cls._render_pool is not None:
+            cls._render_pool.shutdown()
+            cls._render_pool = None
+            cls._render_pool_workers = 0
+    
+    def _frame_metrics(self, svg_content: str) -> Dict[str, Any]:
+        """Compute image metrics of one frame in this process."""
+        try:
+            return self.compute_image_metrics(self.rasterize(svg_content))
+        except Exception as e:
+            return {"error": str(e)}
+    
+    @diagnostics.traced(
+        "critic", "visual_timeline",
+        lambda result: (not result["errors"], "; ".join(
+            f"Frame {index}: {error}" for index, error in result["errors"].items()
+        ))
+    )
+    def analyze_frame_visuals(
+        self,
+        frames: List[str],
+        step: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Render sampled frames and aggregate their visual metrics over time.
+        
+        Each distinct sampled frame is rendered once, across the
+        persistent render pool when there are several to render.
+        Worker renders do not populate the raster cache.
+        
+        Args:
+            frames: List of SVG markup strings
+            step: Analyze every step-th frame, plus the last one (default:
+                visual_frame_step, or every frame if that is unset)
+            workers: Number of worker processes (default: visual_workers,
+                or the CPU count); 1 or less renders in this process
             
-            # Calculate distribution score
-            if len(circle_positions) > 1:
-                positions = np.array(circle_positions)
-                center = np.mean(positions, axis=0)
-                distances = np.linalg.norm(positions - center, axis=1)
-                distribution_score = 1.0 - np.std(distances) / np.mean(distances)
-            else:
-                distribution_score = 1.0
+        Returns:
+            Dictionary containing:
+            - indices: Indices of the analyzed frames
+            - metrics: Each VISUAL_SERIES metric per analyzed frame
+            - summary: mean, min, max and max_change (largest change
+              between consecutive analyzed frames) of each metric
+            - issues: Technical issue messages mapped to frame indices
+            - errors: Frame indices mapped to rendering errors
+        """
+        if step is None:
+            step = self.visual_frame_step or 1
+        if step < 1:
+            raise ValueError(f"Frame step must be positive, got {step}")
+        indices = list(range(0, len(frames), step))
+        if indices and indices[-1] != len(frames) - 1:
+            indices.append(len(frames) - 1)
+        
+        # Render each distinct frame once
+        keys = [content_hash(frames[i]) for i in indices]
+        sources = {}
+        for key, i in zip(keys, indices):
+            sources.setdefault(key, frames[i])
+        pending = list(sources)
+        
+        if workers is None:
+            workers = self.visual_workers or os.cpu_count() or 1
+        if workers <= 1 or len(pending) <= 1:
+            computed = [self._frame_metrics(sources[key]) for key in pending]
+        else:
+            tasks = [(sources[key], self.analysis_scale, self.color_palette_bits) for key in pending]
+            chunksize = max(1, len(tasks) // (workers * 4))
+            computed = list(self.render_pool(workers).map(_frame_metrics_task, tasks, chunksize=chunksize))
+        results = dict(zip(pending, computed))
+        
+        analyzed = []
+        series = {name: [] for name in VISUAL_SERIES}
+        issues = {}
+        errors = {}
+        for key, i in zip(keys, indices):
+            metrics = results[key]
+            if "error" in metrics:
+                errors[i] = metrics["error"]
+                continue
+            metrics = dict(metrics, distribution_score=self.distribution_score(frames[i]))
+            metrics["score"] = self.score_visual_metrics(metrics)
+            analyzed.append(i)
+            for name in VISUAL_SERIES:
+                series[name].append(float(metrics[name]))
+            for issue in self.visual_issues(metrics):
+                issues.setdefault(issue, []).append(i)
+        
+        summary = {}
+        if analyzed:
+            for name, values in series.items():
+                values = np.array(values)
+                summary[name] = {
+                    "mean": float(values.mean()),
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                    "max_change": float(np.abs(np.diff(values)).max()) if len(values) > 1 else 0.0
+                }
+        
+        return {
+            "indices": analyzed,
+            "metrics": series,
+            "summary": summary,
+            "issues": issues,
+            "errors": errors
+        }
+    
+    def analyze_motion(self, svg_content: str, samples: Optional[int] = None) -> Dict[str, Any]:
+        """Analyze the visuals of an animated SVG over time.
+        
+        Renderers only draw an animated document's base state, so static
+        snapshots are sampled from its SMIL timeline at evenly spaced
+        times over one period and analyzed like animation frames.
+        
+        Args:
+            svg_content: SVG markup string
+            samples: Number of snapshots (default: motion_samples)
             
-            # Collect technical issues
-            technical_issues = []
-            if brightness < self.min_brightness:
-                technical_issues.append("Image is too dark")
-            elif brightness > self.max_brightness:
-                technical_issues.append("Image is too bright")
-            if contrast < self.min_contrast:
-                technical_issues.append("Image lacks contrast")
-            if len(img_array.shape) == 3:
-                if saturation < self.min_saturation:
-                    technical_issues.append("Colors are too muted")
-                elif saturation > self.max_saturation:
-                    technical_issues.append("Colors are too intense")
-                if color_variety < 0.1:
-                    technical_issues.append("Limited color variety")
-            if distribution_score < 0.7:
-                technical_issues.append("Elements are not well-distributed")
+        Returns:
+            analyze_frame_visuals() results for the snapshots, plus:
+            - times: Snapshot times in seconds
+            - timeline_issues: Animations that could not be sampled
+        """
+        if samples is None:
+            samples = self.motion_samples
+        timeline = SMILTimeline(svg_content)
+        period = timeline.period
+        times = np.linspace(0.0, period, samples, endpoint=False) if period > 0 else np.zeros(1)
+        result = self.analyze_frame_visuals(timeline.snapshots(times), step=1)
+        result["times"] = [float(times[i]) for i in result["indices"]]
+        result["timeline_issues"] = timeline.issues
+        return result
+    
+    @diagnostics.traced(
+        "critic", "visual_appearance",
+        lambda result: (bool(result["metrics"]), "; ".join(result["feedback"]) if not result["metrics"] else "")
+    )
+    def analyze_visual_appearance(self, svg_content: str) -> Dict[str, Any]:
+        """Analyze the visual appearance of the rendered SVG.
+        
+        Metrics read the rendered buffer in place; colors of translucent
+        pixels are premultiplied by their alpha.
+        
+        Args:
+            svg_content: SVG markup string
+            
+        Returns:
+            Dictionary containing visual analysis results
+        """
+        try:
+            metrics, technical_issues = self._visual_metrics(svg_content)
             
             # Generate LLM feedback
             llm_feedback = self.generate_llm_feedback(
-                metrics={
-                    "brightness": brightness,
-                    "contrast": contrast,
-                    "saturation": saturation,
-                    "color_variety": color_variety,
-                    "distribution_score": distribution_score
-                },
+                metrics=metrics,
                 technical_issues=technical_issues
             )
+            return self._visual_result(metrics, llm_feedback)
             
-            # Calculate visual score
-            visual_score = (
-                0.3 * (1.0 - abs(brightness - 0.5) * 2) +  # Brightness score
-                0.3 * min(1.0, contrast / self.min_contrast) +  # Contrast score
-                0.2 * (1.0 - abs(saturation - 0.5) * 2) +  # Saturation score
-                0.2 * distribution_score  # Distribution score
-            )
+        except Exception as e:
+            return self._visual_error(e)
+    
+    def analyze_visual_appearance_many(self, svgs: List[str]) -> List[Dict[str, Any]]:
+        """Analyze the visual appearance of many SVGs, critiquing them concurrently.
+        
+        Metrics are computed in turn, then LLM feedback for all of them
+        is requested through critique_many().
+        
+        Args:
+            svgs: SVG markup strings
             
-            return {
-                "score": visual_score,
-                "feedback": llm_feedback["feedback"],
-                "suggestions": llm_feedback["suggestions"],
-                "metrics": {
-                    "brightness": brightness,
-                    "contrast": contrast,
-                    "saturation": saturation,
-                    "color_variety": color_variety,
-                    "distribution_score": distribution_score
-                }
-            }
+        Returns:
+            analyze_visual_appearance() results, in input order
+        """
+        analyzed = []
+        for svg_content in svgs:
+            try:
+                analyzed.append(self._visual_metrics(svg_content))
+            except Exception as e:
+                analyzed.append(e)
+        pending = [analysis for analysis in analyzed if not isinstance(analysis, Exception)]
+        feedback = iter(self.critique_many(pending)) if pending else iter(())
+        return [
+            self._visual_error(analysis) if isinstance(analysis, Exception)
+            else self._visual_result(analysis[0], next(feedback))
+            for analysis in analyzed
+        ]
+    
+    def _visual_metrics(self, svg_content: str) -> Tuple[Dict[str, float], List[str]]:
+        """Compute the visual metrics and technical issues of one SVG."""
+        # Render at the analysis scale, or reuse the pixels of an
+        # identical document
+        img_array = self.rasterize(svg_content)
+        metrics = self.compute_image_metrics(img_array)
+        
+        # Check if circles are well-distributed
+        metrics["distribution_score"] = self.distribution_score(svg_content)
+        
+        # Collect technical issues
+        return metrics, self.visual_issues(metrics, color=len(img_array.shape) == 3)
+    
+    def _visual_result(self, metrics: Dict[str, float], llm_feedback: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Assemble a visual analysis result."""
+        return {
+            "score": self.score_visual_metrics(metrics),
+            "feedback": llm_feedback["feedback"],
+            "suggestions": llm_feedback["suggestions"],
+            "metrics": metrics
+        }
+    
+    def _timeline_visual_appearance(self, timeline: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """analyze_visual_appearance() result for a frame analyzed by analyze_frame_visuals()."""
+        if index in timeline["errors"]:
+            return self._visual_error(RuntimeError(timeline["errors"][index]))
+        position = timeline["indices"].index(index)
+        metrics = {name: timeline["metrics"][name][position] for name in VISUAL_SERIES if name != "score"}
+        llm_feedback = self.generate_llm_feedback(
+            metrics=metrics,
+            technical_issues=self.visual_issues(metrics)
+        )
+        return self._visual_result(metrics, llm_feedback)
+    
+    @staticmethod
+    def _visual_error(error: Exception) -> Dict[str, Any]:
+        """Visual analysis result for an SVG that could not be analyzed."""
+        return {
+            "score": 0.0,
+            "feedback": [f"Error analyzing visual appearance: {str(error)}"],
+            "suggestions": ["Fix SVG rendering issues"],
+            "metrics": {}
+        }
+    
+    @staticmethod
+    def _frame_facts(frame: ParsedFrame) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Optional[float]]]]:
+        """Read the values analyze_animation checks from a parsed frame.
+        
+        Args:
+            frame: Parsed SVG frame
             
-        except Exception as e:
-            return {
-                "score": 0.0,
-                "feedback": [f"Error analyzing visual appearance: {str(e)}"],
-                "suggestions": ["Fix SVG rendering issues"],
-                "metrics": {}
-            }
+        Returns:
+            Tuple of the first animation with a dur attribute (or None) and
+            the numeric cx/cy values of each circle
+        """
+        animation = next((a for a in frame.animations if a["dur"] is not None), None)
+        return animation, frame.numeric_attributes('circle', ('cx', 'cy'))
     
+    @diagnostics.traced(
+        "critic", "animation",
+        lambda result: (result["is_valid"], "; ".join(result["errors"]))
+    )
     def analyze_animation(self, frames: List[str]) -> Dict[str, Any]:
         """Analyze an SVG animation sequence.
         
@@ -414,10 +1078,25 @@ Example format:
         feedback = []
         suggestions = []
         
-        # Validate SVG structure
+        # Validate SVG structure, keeping the timing and position values of
+        # each frame whose tree the validator built; other frames are
+        # parsed only if the timing and alignment checks are reached
         structure_scores = []
-        for i, frame in enumerate(frames):
-            validation = SVGValidator.validate_all(frame, require_animation=True)
+        frame_facts = [None] * len(frames)
+        if len(frames) > self.parallel_validation_threshold:
+            validations = SVGValidator.validate_many(
+                frames, workers=self.validation_workers, require_animation=True
+            )["results"]
+        else:
+            # Consecutive frames usually differ in a few attribute values;
+            # the next validate() may patch the tree, so read it right away
+            delta_validator = DeltaValidator(require_animation=True)
+            validations = []
+            for i, frame in enumerate(frames):
+                validations.append(delta_validator.validate(frame))
+                if delta_validator.frame is not None:
+                    frame_facts[i] = self._frame_facts(delta_validator.frame)
+        for i, validation in enumerate(validations):
             if not validation["is_valid"]:
                 errors.extend([f"Frame {i}: {error}" for error in validation["errors"]])
                 structure_scores.append(0.0)
@@ -434,18 +1113,21 @@ Example format:
                 "suggestions": ["Fix SVG structure issues in all frames"]
             }
         
+        frame_facts = [
+            facts if facts is not None else self._frame_facts(ParsedFrame.shared(frame))
+            for frame, facts in zip(frames, frame_facts)
+        ]
+        
         # Analyze timing
         timing_scores = []
         timing_consistency = []
         prev_duration = None
-        for frame in frames:
+        for animation, _ in frame_facts:
             try:
-                duration_match = re.search(r'dur="([^"]+)s"', frame)
-                if not duration_match:
-                    duration_match = re.search(r'<svg:animate[^>]+dur="([^"]+)s"', frame)
-                
-                if duration_match:
-                    duration = float(duration_match.group(1))
+                if animation is not None:
+                    duration = animation["duration"]
+                    if duration is None:
+                        raise ValueError(f"Invalid duration: {animation['dur']}")
                     if duration <= 0:
                         errors.append(f"Invalid duration: {duration}s")
                         timing_scores.append(0.0)
@@ -483,22 +1165,20 @@ Example format:
         prev_cy = None
         has_alignment_issues = False
         
-        for frame in frames:
+        for _, circles in frame_facts:
             try:
-                circle_match = re.search(r'<(?:svg:)?circle[^>]+>', frame)
-                if not circle_match:
+                if not circles:
                     errors.append("Missing circle element")
                     alignment_scores.append(0.0)
                     suggestions.append("Add circle element to frame")
                     continue
                 
-                circle = circle_match.group(0)
-                cx_match = re.search(r'cx="([^"]+)"', circle)
-                cy_match = re.search(r'cy="([^"]+)"', circle)
-                
-                if cx_match and cy_match:
-                    cx = float(cx_match.group(1))
-                    cy = float(cy_match.group(1))
+                circle = circles[0]
+                if 'cx' in circle and 'cy' in circle:
+                    if circle['cx'] is None or circle['cy'] is None:
+                        raise ValueError("Invalid circle position")
+                    cx = circle['cx']
+                    cy = circle['cy']
                     
                     if prev_cx is not None and prev_cy is not None:
                         position_diff = ((cx - prev_cx) ** 2 + (cy - prev_cy) ** 2) ** 0.5
@@ -534,12 +1214,30 @@ Example format:
             feedback.append("Position changes detected in animation")
             suggestions.append("Use consistent circle positions across frames")
         
-        # Analyze visual appearance of the last frame
-        visual_analysis = self.analyze_visual_appearance(frames[-1])
+        # Analyze visual appearance of the last frame; when sampled frames
+        # are scored over time, the timeline already covers the last frame
+        visual_timeline = None
+        if self.visual_frame_step:
+            visual_timeline = self.analyze_frame_visuals(frames)
+            visual_analysis = self._timeline_visual_appearance(visual_timeline, len(frames) - 1)
+        else:
+            visual_analysis = self.analyze_visual_appearance(frames[-1])
         visual_score = visual_analysis["score"]
         feedback.extend(visual_analysis["feedback"])
         suggestions.extend(visual_analysis["suggestions"])
         
+        # Optionally score the visuals of sampled frames over time
+        if visual_timeline is not None:
+            if visual_timeline["indices"]:
+                visual_score = visual_timeline["summary"]["score"]["mean"]
+            analyzed = len(visual_timeline["indices"])
+            for issue, indices in visual_timeline["issues"].items():
+                shown = ", ".join(str(i) for i in indices[:5])
+                more = f" and {len(indices) - 5} more" if len(indices) > 5 else ""
+                feedback.append(f"{issue} in {len(indices)} of {analyzed} analyzed frames (frames {shown}{more})")
+            for i, error in visual_timeline["errors"].items():
+                feedback.append(f"Error analyzing visual appearance of frame {i}: {error}")
+        
         # Calculate weighted scores
         avg_structure = sum(structure_scores) / len(structure_scores) if structure_scores else 0.0
         avg_alignment = sum(alignment_scores) / len(alignment_scores) if alignment_scores else 0.0
@@ -606,7 +1304,8 @@ Example format:
             "errors": errors,
             "feedback": feedback,
             "suggestions": suggestions,
-            "visual_metrics": visual_analysis["metrics"]
+            "visual_metrics": visual_analysis["metrics"],
+            "visual_timeline": visual_timeline
         }
     
     def generate_feedback(self, frames: List[str]) -> List[str]:
@@ -631,4 +1330,8 @@ Example format:
             Quality score between 0 and 1
         """
         analysis = self.analyze_animation(frames)
-        return analysis["score"] 
\ No newline at end of file
+        return analysis["score"]
+
+
+# Stop the render pool's worker processes at exit, if it was started
+atexit.register(CriticAgent.shutdown_render_pool)
@@ -0,0 +1,588 @@
+"""Content-hash keyed caches shared by the validation and critique pipeline."""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import numpy as np
+
+
+def normalize_svg(svg_content: str) -> str:
+    """Normalize line endings, as XML parsers do before parsing.
+
+    No other whitespace is touched: text content, token lists such as
+    path data and whitespace between elements (e.g. between <tspan>s)
+    can be significant, so documents differing there must not compare
+    equal.
+
+    Args:
+        svg_content: String containing SVG markup
+
+    Returns:
+        Normalized markup
+    """
+    return svg_content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def content_hash(svg_content: str) -> str:
+    """Hash the markup of an SVG document, up to line endings.
+
+    Args:
+        svg_content: String containing SVG markup
+
+    Returns:
+        Hex digest identifying the document content
+    """
+    return hashlib.blake2b(normalize_svg(svg_content).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 1024, enabled: bool = True):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries; 0 disables storage
+            enabled: Whether lookups and stores are performed
+        """
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up an entry, marking it most recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        if not self.enabled:
+            return default
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if not self.enabled or self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def configure(self, maxsize: Optional[int] = None, enabled: Optional[bool] = None) -> None:
+        """Change the size limit or enable/disable the cache.
+
+        Args:
+            maxsize: New maximum number of entries
+            enabled: Whether the cache is used
+        """
+        if maxsize is not None:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+        if enabled is not None:
+            self.enabled = enabled
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, size and maxsize
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "enabled": self.enabled
+        }
+
+
+class RasterCache:
+    """Two-tier cache of decoded raster images with byte-size budgets.
+
+    Pixel arrays are kept in an in-memory LRU bounded by their total size
+    and, when a directory is configured, in ``.npy`` files bounded by a
+    separate disk budget. Disk hits are promoted to memory. Cached arrays
+    are read-only; copy them before modifying.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 2 ** 20,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 2 ** 30,
+        enabled: bool = True
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached arrays; 0 disables the tier
+            directory: Directory for the disk tier (default: memory only)
+            max_disk_bytes: Disk budget for cached arrays
+            enabled: Whether lookups and stores are performed
+        """
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.enabled = enabled
+        self.directory: Optional[str] = None
+        self.bytes = 0
+        self.disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        if directory is not None:
+            self._open_directory(directory)
+
+    @staticmethod
+    def make_key(
+        svg_content: str,
+        size: Optional[Tuple[int, int]] = None,
+        pixel_format: str = "rgba",
+        scale: float = 1.0
+    ) -> str:
+        """Build a key from the canonical SVG hash, output size and pixel layout.
+
+        Args:
+            svg_content: String containing SVG markup
+            size: Output (width, height), or None for the document's own size
+            pixel_format: Channel layout of the stored raster
+            scale: Factor applied to the document's own size when size is None
+
+        Returns:
+            Cache key, usable as a file name
+        """
+        if size:
+            suffix = f"{size[0]}x{size[1]}"
+        else:
+            suffix = "native" if scale == 1.0 else f"x{scale:g}"
+        return f"{content_hash(svg_content)}-{suffix}-{pixel_format}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or key in self._files
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Look up a raster in memory, then on disk.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Read-only pixel array, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        array = self._entries.get(key)
+        if array is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return array
+        array = self._load(key)
+        if array is not None:
+            self.disk_hits += 1
+            self._store_memory(key, array)
+            return array
+        self.misses += 1
+        return None
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        """Store a raster in both tiers, evicting least recently used ones.
+
+        Args:
+            key: Key from make_key()
+            array: Pixel array
+
+        Returns:
+            The stored read-only array
+        """
+        if not self.enabled:
+            return array
+        array.setflags(write=False)
+        self._store_memory(key, array)
+        if self.directory is not None and key not in self._files:
+            self._store_disk(key, array)
+        return array
+
+    def configure(
+        self,
+        max_bytes: Optional[int] = None,
+        directory: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ) -> None:
+        """Change budgets, attach a disk directory or enable/disable the cache.
+
+        Args:
+            max_bytes: New memory budget
+            directory: Directory for the disk tier
+            max_disk_bytes: New disk budget
+            enabled: Whether the cache is used
+        """
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+            self._evict_memory()
+        if max_disk_bytes is not None:
+            self.max_disk_bytes = max_disk_bytes
+        if directory is not None:
+            self._open_directory(directory)
+        elif max_disk_bytes is not None:
+            self._evict_disk()
+        if enabled is not None:
+            self.enabled = enabled
+
+    def clear(self, disk: bool = False) -> None:
+        """Remove memory entries and reset the counters.
+
+        Args:
+            disk: Also delete the disk tier's files
+        """
+        self._entries.clear()
+        self.bytes = 0
+        if disk:
+            while self._files:
+                self._remove_file(next(iter(self._files)))
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits per tier, misses, hit rate, entry counts
+            and bytes used per tier
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "disk_size": len(self._files),
+            "disk_bytes": self.disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes,
+            "enabled": self.enabled
+        }
+
+    def _store_memory(self, key: str, array: np.ndarray) -> None:
+        """Add an array to the memory tier if it fits the budget."""
+        if array.nbytes > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous.nbytes
+        self._entries[key] = array
+        self.bytes += array.nbytes
+        self._evict_memory()
+
+    def _evict_memory(self) -> None:
+        """Drop least recently used arrays until within the memory budget."""
+        while self._entries and self.bytes > self.max_bytes:
+            _, array = self._entries.popitem(last=False)
+            self.bytes -= array.nbytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _open_directory(self, directory: str) -> None:
+        """Attach a disk directory, indexing existing files oldest first."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._files.clear()
+        self.disk_bytes = 0
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith('.npy'):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._files[key] = size
+            self.disk_bytes += size
+        self._evict_disk()
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        """Read an array from the disk tier, marking it recently used."""
+        if key not in self._files:
+            return None
+        path = self._path(key)
+        try:
+            array = np.load(path, allow_pickle=False)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Removed or truncated by another process
+            self._remove_file(key)
+            return None
+        self._files.move_to_end(key)
+        array.setflags(write=False)
+        return array
+
+    def _store_disk(self, key: str, array: np.ndarray) -> None:
+        """Write an array to the disk tier atomically."""
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.save(file, array, allow_pickle=False)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        size = os.path.getsize(self._path(key))
+        self._files[key] = size
+        self.disk_bytes += size
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files until within the disk budget."""
+        while self._files and self.disk_bytes > self.max_disk_bytes:
+            self._remove_file(next(iter(self._files)))
+
+    def _remove_file(self, key: str) -> None:
+        self.disk_bytes -= self._files.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class FeedbackCache:
+    """SQLite-backed cache of LLM feedback with expiry and an entry budget.
+
+    Entries are keyed on the model name and a hash of the rendered
+    prompt, so near-identical frames whose prompts round to the same
+    metrics share one critique. A database path makes the cache persist
+    across runs and processes; the default in-memory database lasts for
+    the process only.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+        enabled: bool = True
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file (default: in memory)
+            ttl: Seconds before an entry expires; 0 or less keeps entries
+            max_entries: Maximum number of entries kept
+            enabled: Whether lookups and stores are performed
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.path: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._open(path)
+
+    def _open(self, path: Optional[str]) -> None:
+        """Open or create the database."""
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = sqlite3.connect(path or ":memory:", isolation_level=None, check_same_thread=False)
+        if path is not None:
+            # Write-ahead logging without a sync per commit keeps lookups in
+            # the microsecond range and lets several processes share the file
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS feedback ("
+            "key TEXT PRIMARY KEY, model TEXT, value TEXT, created REAL, accessed REAL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS feedback_accessed ON feedback (accessed)")
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = db
+            self.path = path
+
+    @staticmethod
+    def make_key(model: str, *messages: str) -> str:
+        """Build a key from the model name and the rendered prompt messages.
+
+        Args:
+            model: Model name
+            messages: Prompt texts sent to the model, e.g. system and user
+
+        Returns:
+            Cache key
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for message in messages:
+            digest.update(message.encode('utf-8'))
+            digest.update(b"\0")
+        return f"{model}:{digest.hexdigest()}"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM feedback WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up feedback, dropping it if it has expired.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached feedback, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM feedback WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl > 0 and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM feedback WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE feedback SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store feedback, evicting expired and least recently used entries.
+
+        Args:
+            key: Key from make_key()
+            value: JSON-serializable feedback
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        model = key.rpartition(':')[0]
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO feedback (key, model, value, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(value), now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used over budget."""
+        if self.ttl > 0:
+            self.expired += self._db.execute(
+                "DELETE FROM feedback WHERE created < ?", (now - self.ttl,)
+            ).rowcount
+        excess = self._db.execute("SELECT COUNT(*) FROM feedback").fetchone()[0] - max(self.max_entries, 0)
+        if excess > 0:
+            self.evicted += self._db.execute(
+                "DELETE FROM feedback WHERE key IN (SELECT key FROM feedback ORDER BY accessed LIMIT ?)",
+                (excess,)
+            ).rowcount
+
+    def configure(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ) -> None:
+        """Attach a database file, change limits or enable/disable the cache.
+
+        Args:
+            path: SQLite database file to use from now on
+            ttl: New expiry in seconds
+            max_entries: New entry budget
+            enabled: Whether the cache is used
+        """
+        if path is not None and path != self.path:
+            self._open(path)
+        if ttl is not None:
+            self.ttl = ttl
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if ttl is not None or max_entries is not None:
+            with self._lock:
+                self._evict(time.time())
+        if enabled is not None:
+            self.enabled = enabled
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._db.execute("DELETE FROM feedback")
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, expired and evicted
+            counts, size and limits
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "path": self.path,
+            "enabled": self.enabled
+        }
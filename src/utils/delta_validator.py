@@ -0,0 +1,327 @@
+"""Incremental validation of consecutive animation frames."""
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+from lxml import etree
+from .cache import content_hash
+from .parsed_frame import ParsedFrame
+from .svg_rules import DEFAULT_RULES
+from .svg_validator import SVGValidator
+
+# Start tag head ending inside an attribute value: captures the tag name,
+# the attribute name and its quote character
+_OPEN_VALUE = re.compile(
+    r'<([A-Za-z_][\w.-]*(?::[\w.-]+)?)'
+    r'(?:\s+[\w:.-]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*'
+    r'\s+([\w.-]+)\s*=\s*(["\'])[^"\'<&]*\Z'
+)
+
+# Characters whose presence in a changed span means the markup changed
+_MARKUP_CHARS = frozenset('<>&"\'')
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common prefix of two strings, using slice comparisons."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix of two strings, at most ``limit``."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _start_tags_before(source: str, position: int) -> int:
+    """Count start tags before a position without scanning in Python."""
+    return (
+        source.count('<', 0, position)
+        - source.count('</', 0, position)
+        - source.count('<!', 0, position)
+        - source.count('<?', 0, position)
+    )
+
+
+def _normalize_attribute(value: str) -> str:
+    """Apply XML attribute-value whitespace normalization."""
+    return value.replace('\r\n', ' ').replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
+
+
+class DeltaValidator:
+    """Validate a sequence of frames, re-checking only what changed.
+
+    The validator keeps the previous frame's tree and per-element rule
+    results. When the next frame differs from it only inside attribute
+    values, those attributes are patched into the kept tree and only the
+    affected elements are re-checked; the Python-level work is then
+    proportional to the number of changes rather than the document size.
+    Any other change falls back to a full validation.
+
+    Fully validated frames come from the shared ParsedFrame cache; the
+    kept tree is copied before its first in-place patch, so shared
+    frames are never modified. Frames already in SVGValidator.cache are
+    answered from it without any delta work, and the next changed frame
+    is compared against the last kept tree instead.
+
+    Usage:
+        validator = DeltaValidator(require_animation=True)
+        results = [validator.validate(frame) for frame in frames]
+    """
+
+    def __init__(self, require_animation: bool = False, use_cache: bool = True):
+        """Initialize the validator.
+
+        Args:
+            require_animation: Whether to require animation elements
+            use_cache: Whether to read and fill SVGValidator.cache
+        """
+        self.require_animation = require_animation
+        self.use_cache = use_cache
+        self.full_validations = 0
+        self.incremental_validations = 0
+        self.elements_rechecked = 0
+        self.cache_hits = 0
+        self._frame: Optional[ParsedFrame] = None
+        self._current: Optional[ParsedFrame] = None
+        self._owned = False
+        self._results: Optional[Dict[str, Any]] = None
+        self._elements: List[etree._Element] = []
+        self._found: Dict[str, bool] = {}
+        self._failures: Dict[str, Dict[int, str]] = {}
+
+    def reset(self) -> None:
+        """Forget the previous frame so the next one is fully validated."""
+        self._frame = None
+        self._current = None
+        self._results = None
+        self._elements = []
+
+    @property
+    def frame(self) -> Optional[ParsedFrame]:
+        """Tree of the last validated frame, or None if it came from the cache.
+
+        The tree may be patched in place by the next validate() call, so
+        values must be read from it before then.
+        """
+        return self._current
+
+    def validate(self, svg_content: Union[str, ParsedFrame]) -> Dict[str, Any]:
+        """Validate the next frame in the sequence.
+
+        Args:
+            svg_content: String containing SVG markup, or an already parsed frame
+
+        Returns:
+            Dictionary containing validation results, as from
+            SVGValidator.validate_all
+        """
+        source = svg_content.source if isinstance(svg_content, ParsedFrame) else svg_content
+        cache = SVGValidator.cache
+        key = None
+        if self.use_cache and cache.enabled:
+            digest = content_hash(source)
+            key = (digest, self.require_animation, False)
+            cached = cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                self._current = None
+                return SVGValidator._copy_results(cached)
+
+        results = None
+        if self._frame is not None and self._elements:
+            results = self._validate_delta(source)
+        if results is None:
+            if not isinstance(svg_content, ParsedFrame):
+                svg_content = ParsedFrame.shared(svg_content, key[0] if key else None)
+            results = self._validate_full(svg_content)
+        self._results = results
+        self._current = self._frame
+        if key is not None:
+            cache.put(key, results)
+        return SVGValidator._copy_results(results)
+
+    def stats(self) -> Dict[str, int]:
+        """Get counts of full, incremental and cached validations."""
+        return {
+            "full_validations": self.full_validations,
+            "incremental_validations": self.incremental_validations,
+            "elements_rechecked": self.elements_rechecked,
+            "cache_hits": self.cache_hits
+        }
+
+    def _validate_full(self, svg_content: Union[str, ParsedFrame]) -> Dict[str, Any]:
+        """Parse and check every element, keeping per-element results."""
+        self.full_validations += 1
+        frame = ParsedFrame.from_source(svg_content)
+        self._frame = frame
+        self._owned = False
+        self._elements = []
+        if not frame.is_parsed:
+            return SVGValidator._run_checks(frame, self.require_animation)
+
+        elements = list(frame.root.iter(etree.Element))
+        self._found = {rule["check"]: False for rule in DEFAULT_RULES.rules}
+        self._failures = {check: {} for check in self._found}
+        for index, element in enumerate(elements):
+            for check, error in DEFAULT_RULES.check_element(element).items():
+                self._found[check] = True
+                if error:
+                    self._failures[check][index] = error
+
+        frame.rule_results = self._rule_results()
+        # Incremental updates locate elements by counting start tags, which
+        # is only reliable when no comment or CDATA text contains '<'
+        if _start_tags_before(frame.source, len(frame.source)) == len(elements):
+            self._elements = elements
+        return SVGValidator._run_checks(frame, self.require_animation)
+
+    def _validate_delta(self, svg_content: str) -> Optional[Dict[str, Any]]:
+        """Patch changed attribute values into the kept tree.
+
+        Returns:
+            Validation results, or None if a full validation is needed
+        """
+        old = self._frame.source
+        new = svg_content
+        prefix = _common_prefix(old, new)
+        if prefix == len(old) == len(new):
+            self.incremental_validations += 1
+            return self._results
+        suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+
+        spans = self._changed_spans(old, new, prefix, len(old) - suffix, len(new) - suffix)
+        if spans is None:
+            return None
+
+        patches = []
+        for old_start, old_end, new_start, new_end in spans:
+            patch = self._locate_patch(old, new, old_start, old_end, new_start, new_end)
+            if patch is None:
+                return None
+            patches.append(patch)
+
+        if not self._owned:
+            self._own_frame()
+        changed = set()
+        for index, attr, value in patches:
+            self._elements[index].set(attr, value)
+            changed.add(index)
+        for index in changed:
+            errors = DEFAULT_RULES.check_element(self._elements[index])
+            for check, error in errors.items():
+                if error:
+                    self._failures[check][index] = error
+                else:
+                    self._failures[check].pop(index, None)
+        self.elements_rechecked += len(changed)
+        self.incremental_validations += 1
+
+        self._frame.source = new
+        self._frame.attributes_changed()
+        self._frame.rule_results = self._rule_results()
+        return SVGValidator._run_checks(self._frame, self.require_animation)
+
+    def _own_frame(self) -> None:
+        """Replace the kept frame with a private copy before patching it."""
+        self._frame = self._frame.copy()
+        self._elements = list(self._frame.root.iter(etree.Element))
+        self._owned = True
+
+    def _changed_spans(
+        self, old: str, new: str, start: int, old_end: int, new_end: int
+    ) -> Optional[List[Tuple[int, int, int, int]]]:
+        """Split the changed region into markup-free spans.
+
+        A single differing region is used as-is; otherwise the region is
+        compared line by line so changes on separate lines become
+        separate spans.
+
+        Returns:
+            List of (old_start, old_end, new_start, new_end) spans, or
+            None if the line structure changed
+        """
+        if not _MARKUP_CHARS.intersection(old[start:old_end]) and not _MARKUP_CHARS.intersection(new[start:new_end]):
+            return [(start, old_end, start, new_end)]
+
+        line_start = old.rfind('\n', 0, start) + 1
+        old_line_end = old.find('\n', old_end)
+        new_line_end = new.find('\n', new_end)
+        old_lines = old[line_start:old_line_end if old_line_end != -1 else len(old)].split('\n')
+        new_lines = new[line_start:new_line_end if new_line_end != -1 else len(new)].split('\n')
+        if len(old_lines) != len(new_lines):
+            return None
+
+        spans = []
+        old_offset = new_offset = line_start
+        for old_line, new_line in zip(old_lines, new_lines):
+            if old_line != new_line:
+                prefix = _common_prefix(old_line, new_line)
+                suffix = _common_suffix(old_line, new_line, min(len(old_line), len(new_line)) - prefix)
+                spans.append((
+                    old_offset + prefix, old_offset + len(old_line) - suffix,
+                    new_offset + prefix, new_offset + len(new_line) - suffix
+                ))
+            old_offset += len(old_line) + 1
+            new_offset += len(new_line) + 1
+        return spans
+
+    def _locate_patch(
+        self, old: str, new: str, old_start: int, old_end: int, new_start: int, new_end: int
+    ) -> Optional[Tuple[int, str, str]]:
+        """Resolve a changed span to an attribute of a kept element.
+
+        Returns:
+            (element index, attribute name, new value), or None if the
+            span is not confined to a single attribute value
+        """
+        if _MARKUP_CHARS.intersection(old[old_start:old_end]) or _MARKUP_CHARS.intersection(new[new_start:new_end]):
+            return None
+        tag_start = old.rfind('<', 0, old_start)
+        match = _OPEN_VALUE.match(old, tag_start, old_start) if tag_start != -1 else None
+        if match is None:
+            return None
+
+        index = _start_tags_before(old, tag_start)
+        if index >= len(self._elements):
+            return None
+        element = self._elements[index]
+        tag, attr, quote = match.groups()
+        if etree.QName(element).localname != tag.split(':')[-1]:
+            return None
+
+        value_start = match.end(3)
+        old_value_end = old.find(quote, old_end)
+        new_value_end = new.find(quote, new_end)
+        if old_value_end == -1 or new_value_end == -1:
+            return None
+        old_value = old[value_start:old_value_end]
+        if '&' in old_value or element.get(attr) != _normalize_attribute(old_value):
+            return None
+        new_value = new[value_start + new_start - old_start:new_value_end]
+        if '&' in new_value or '<' in new_value:
+            return None
+        return index, attr, _normalize_attribute(new_value)
+
+    def _rule_results(self) -> Dict[str, Dict[str, Any]]:
+        """Build rule results from per-element failures."""
+        state = DEFAULT_RULES.new_state()
+        for check, result in state.items():
+            failures = self._failures[check]
+            if failures:
+                result["found"] = True
+                result["error"] = failures[min(failures)]
+            elif self._found[check]:
+                result["found"] = True
+                result["error"] = ""
+        return state
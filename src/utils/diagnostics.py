@@ -0,0 +1,188 @@
+"""Structured diagnostics for validation and critique.
+
+Diagnostics are off by default. Attach a collector to record one
+structured entry per check (component, check name, pass/fail, message,
+timing) instead of printing to stdout:
+
+    collector = diagnostics.attach(diagnostics.WARNING)
+    SVGValidator.validate_all(svg)
+    failures = collector.get_records()
+    diagnostics.detach()
+"""
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Record levels, shared with the standard logging module
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+
+class Diagnostics:
+    """Collector for structured diagnostics records."""
+
+    def __init__(self, level: int = DEBUG):
+        """Initialize the collector.
+
+        Args:
+            level: Minimum level of records to keep. Passing checks are
+                recorded at DEBUG, failing checks at WARNING and
+                unexpected errors at ERROR.
+        """
+        self.level = level
+        self.records: List[Dict[str, Any]] = []
+
+    def enabled_for(self, level: int) -> bool:
+        """Whether records at the given level are kept."""
+        return level >= self.level
+
+    def record(
+        self,
+        component: str,
+        check: str,
+        passed: bool,
+        message: str = "",
+        duration: float = 0.0,
+        level: Optional[int] = None
+    ) -> None:
+        """Add a record if its level is enabled.
+
+        Args:
+            component: Name of the reporting component
+            check: Name of the check
+            passed: Whether the check passed
+            message: Optional detail message
+            duration: Time spent in the check, in seconds
+            level: Record level; derived from ``passed`` if omitted
+        """
+        if level is None:
+            level = DEBUG if passed else WARNING
+        if not self.enabled_for(level):
+            return
+        self.records.append({
+            "component": component,
+            "check": check,
+            "passed": passed,
+            "message": message,
+            "duration": duration,
+            "level": logging.getLevelName(level)
+        })
+
+    def get_records(self, component: Optional[str] = None, check: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get collected records, optionally filtered.
+
+        Args:
+            component: Only return records from this component
+            check: Only return records for this check
+
+        Returns:
+            List of record dictionaries
+        """
+        return [
+            record for record in self.records
+            if (component is None or record["component"] == component)
+            and (check is None or record["check"] == check)
+        ]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate records per ``component.check``.
+
+        Returns:
+            Dictionary mapping check keys to count, failures and total time
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            key = f"{record['component']}.{record['check']}"
+            entry = summary.setdefault(key, {"count": 0, "failures": 0, "total_time": 0.0})
+            entry["count"] += 1
+            entry["failures"] += 0 if record["passed"] else 1
+            entry["total_time"] += record["duration"]
+        return summary
+
+    def clear(self) -> None:
+        """Discard all collected records."""
+        self.records.clear()
+
+
+_collector: Optional[Diagnostics] = None
+
+
+def attach(level: int = DEBUG) -> Diagnostics:
+    """Attach a new process-wide collector.
+
+    Args:
+        level: Minimum level of records to keep
+
+    Returns:
+        The attached collector
+    """
+    global _collector
+    _collector = Diagnostics(level)
+    return _collector
+
+
+def detach() -> Optional[Diagnostics]:
+    """Detach the active collector.
+
+    Returns:
+        The previously attached collector, if any
+    """
+    global _collector
+    collector, _collector = _collector, None
+    return collector
+
+
+def get_collector() -> Optional[Diagnostics]:
+    """Return the active collector, or None when diagnostics are off."""
+    return _collector
+
+
+@contextmanager
+def collecting(level: int = DEBUG) -> Iterator[Diagnostics]:
+    """Attach a collector for the duration of a ``with`` block."""
+    global _collector
+    previous = _collector
+    collector = attach(level)
+    try:
+        yield collector
+    finally:
+        _collector = previous
+
+
+def record(component: str, check: str, passed: bool, message: str = "", level: Optional[int] = None) -> None:
+    """Add a record to the active collector, if any."""
+    if _collector is not None:
+        _collector.record(component, check, passed, message, level=level)
+
+
+def traced(component: str, check: str, outcome: Callable[[Any], Tuple[bool, str]]) -> Callable:
+    """Decorator recording the outcome and timing of each call.
+
+    When no collector is attached the wrapped function runs untimed.
+
+    Args:
+        component: Name of the reporting component
+        check: Name of the check
+        outcome: Maps the function result to ``(passed, message)``
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            collector = _collector
+            if collector is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            duration = time.perf_counter() - start
+            passed, message = outcome(result)
+            collector.record(component, check, passed, message, duration)
+            return result
+        return wrapper
+    return decorator
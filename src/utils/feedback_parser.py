@@ -1,131 +1,201 @@
-from typing import List, Dict, Any, Tuple
-from lxml import etree
+from typing import List, Dict, Any, Union
 import numpy as np
-from .svg_validator import SVGValidator
+from .parsed_frame import ParsedFrame
+from .smil_timing import SMILTimingAnalyzer
+from . import diagnostics
+
+
+# Circle attributes extracted by analyze_circle_attributes
+CIRCLE_ATTRIBUTES = ('cx', 'cy', 'r')
+
+
+def _circle_list(indices: np.ndarray, limit: int = 5) -> str:
+    """Describe circle indices for an error message."""
+    shown = ', '.join(str(index) for index in indices[:limit])
+    more = f" and {len(indices) - limit} more" if len(indices) > limit else ""
+    return f" (circle{'s' if len(indices) > 1 else ''} {shown}{more})"
+
+
+def _timing_summary(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a SMILTimingAnalyzer result to the timing of its document.
+    
+    The timing error is the worst over animations with a valid duration:
+    one minus the animation's smoothness, or 0.8 for fewer than two
+    values. Documents without such an animation score 1.0.
+    
+    Args:
+        analysis: SMILTimingAnalyzer.analyze() result
+        
+    Returns:
+        Dictionary with has_timing, duration (of the longest animation),
+        timing_error and smoothness
+    """
+    timed = [element for element in analysis["elements"] if element["duration"] is not None]
+    if not timed:
+        return {
+            "has_timing": False,
+            "duration": 0,
+            "timing_error": 1.0,
+            "smoothness": analysis["smoothness"]
+        }
+    
+    errors = [0.8 if element["smoothness"] is None else 1.0 - element["smoothness"] for element in timed]
+    return {
+        "has_timing": True,
+        "duration": max(element["duration"] for element in timed),
+        "timing_error": max(errors),
+        "smoothness": analysis["smoothness"]
+    }
+
 
 class FeedbackParser:
     """Utility class for analyzing SVG animations and generating feedback."""
     
     @staticmethod
-    def parse_animation_timing(svg_string: str) -> Dict[str, Any]:
+    @diagnostics.traced(
+        "feedback_parser", "animation_timing",
+        lambda result: (result["has_timing"] and result["timing_error"] <= 0.1, f"timing_error={result['timing_error']:.3f}")
+    )
+    def parse_animation_timing(svg_string: Union[str, ParsedFrame]) -> Dict[str, Any]:
         """Parse animation timing information from SVG.
         
+        Every animation element is analyzed with SMILTimingAnalyzer, so
+        keyTimes, keySplines and calcMode count towards the timing error.
+        
         Args:
-            svg_string: String containing SVG markup
+            svg_string: String containing SVG markup, or an already parsed frame
             
         Returns:
-            Dictionary containing timing analysis
+            Dictionary containing timing analysis: has_timing, duration,
+            timing_error and smoothness
         """
-        try:
-            root = etree.fromstring(svg_string.encode('utf-8'))
-            animate = SVGValidator._find_element(root, 'animate')
-            
-            if animate is None:
-                return {
-                    "has_timing": False,
-                    "duration": 0,
-                    "timing_error": 1.0
-                }
-            
-            # Parse duration
-            dur = animate.get('dur', '0s')
-            duration = float(dur.replace('s', ''))
-            
-            # Parse values
-            values = animate.get('values', '').split(';')
-            if len(values) < 2:
-                return {
-                    "has_timing": True,
-                    "duration": duration,
-                    "timing_error": 0.8
-                }
-            
-            # Check timing distribution
-            try:
-                values = [float(v) for v in values]
-                expected_step = (values[-1] - values[0]) / (len(values) - 1)
-                actual_steps = np.diff(values)
-                timing_error = np.mean(np.abs(actual_steps - expected_step)) / expected_step
-            except (ValueError, ZeroDivisionError):
-                timing_error = 0.5
-            
-            return {
-                "has_timing": True,
-                "duration": duration,
-                "timing_error": min(timing_error, 1.0)
-            }
-        except (etree.XMLSyntaxError, ValueError):
-            return {
-                "has_timing": False,
-                "duration": 0,
-                "timing_error": 1.0
-            }
+        return _timing_summary(SMILTimingAnalyzer.analyze(svg_string))
     
     @staticmethod
-    def analyze_circle_attributes(svg_string: str) -> Dict[str, Any]:
-        """Analyze circle element attributes.
+    @diagnostics.traced(
+        "feedback_parser", "animation_timing",
+        lambda result: (
+            bool(result["has_timing"].all() and (result["timing_error"] <= 0.1).all()),
+            f"timing_error={np.max(result['timing_error'], initial=0.0):.3f}"
+        )
+    )
+    def parse_sequence_timing(svg_frames: List[Union[str, ParsedFrame]]) -> Dict[str, np.ndarray]:
+        """Parse animation timing for a whole frame sequence at once.
+        
+        Gives the same per-frame results as parse_animation_timing, but
+        samples the easing curves of all frames in one bulk evaluation,
+        and only once per distinct animation timing.
         
         Args:
-            svg_string: String containing SVG markup
+            svg_frames: List of SVG markup strings or parsed frames
             
         Returns:
-            Dictionary containing circle analysis
+            Dictionary of per-frame arrays: has_timing, duration,
+            timing_error and smoothness
         """
-        try:
-            root = etree.fromstring(svg_string.encode('utf-8'))
-            circle = SVGValidator._find_element(root, 'circle')
-            
-            if circle is None:
-                return {
-                    "has_circle": False,
-                    "alignment_errors": ["No circle element found"],
-                    "attribute_errors": []
-                }
-            
-            alignment_errors = []
-            attribute_errors = []
-            
-            # Check required attributes
-            for attr in ['cx', 'cy', 'r']:
-                if attr not in circle.attrib:
-                    attribute_errors.append(f"Missing {attr} attribute")
-                    continue
-                
-                try:
-                    value = float(circle.attrib[attr])
-                    if value < 0:
-                        alignment_errors.append(f"Negative {attr} value")
-                except ValueError:
-                    attribute_errors.append(f"Invalid {attr} value")
-            
-            # Check centering
-            if 'cx' in circle.attrib and 'cy' in circle.attrib:
-                try:
-                    cx = float(circle.attrib['cx'])
-                    cy = float(circle.attrib['cy'])
-                    if abs(cx - cy) > 1:  # Allow small difference
-                        alignment_errors.append("Circle not centered (cx != cy)")
-                except ValueError:
-                    pass
+        summaries = [_timing_summary(analysis) for analysis in SMILTimingAnalyzer.analyze_many(svg_frames)]
+        return {
+            "has_timing": np.array([summary["has_timing"] for summary in summaries], dtype=bool),
+            "duration": np.array([summary["duration"] for summary in summaries], dtype=np.float64),
+            "timing_error": np.array([summary["timing_error"] for summary in summaries], dtype=np.float64),
+            "smoothness": np.array([summary["smoothness"] for summary in summaries], dtype=np.float64)
+        }
+    
+    @staticmethod
+    @diagnostics.traced(
+        "feedback_parser", "circle_attributes",
+        lambda result: (
+            result["has_circle"] and not result["alignment_errors"] and not result["attribute_errors"],
+            "; ".join(result["alignment_errors"] + result["attribute_errors"])
+        )
+    )
+    def analyze_circle_attributes(svg_string: Union[str, ParsedFrame]) -> Dict[str, Any]:
+        """Analyze the attributes of every circle element.
+        
+        Attributes of all circles are extracted into arrays at once and
+        each check runs as a single vectorized mask. Messages name the
+        offending circles when there is more than one. Centering (cx ==
+        cy) is only required of the first circle, the main shape of a
+        scene.
+        
+        Args:
+            svg_string: String containing SVG markup, or an already parsed frame
             
+        Returns:
+            Dictionary containing:
+            - has_circle: Whether any circle was found
+            - alignment_errors: List of alignment error messages
+            - attribute_errors: List of attribute error messages
+            - circles: Arrays of cx, cy and r per circle, NaN
+              where absent or invalid
+            - error_indices: Circle indices per error message
+        """
+        frame = ParsedFrame.from_source(svg_string)
+        if not frame.is_parsed:
             return {
-                "has_circle": True,
-                "alignment_errors": alignment_errors,
-                "attribute_errors": attribute_errors
+                "has_circle": False,
+                "alignment_errors": ["Invalid SVG syntax"],
+                "attribute_errors": [],
+                "circles": {},
+                "error_indices": {}
             }
-        except etree.XMLSyntaxError:
+        
+        values, missing = frame.attribute_array('circle', CIRCLE_ATTRIBUTES)
+        if not len(values):
             return {
                 "has_circle": False,
-                "alignment_errors": ["Invalid SVG syntax"],
-                "attribute_errors": []
+                "alignment_errors": ["No circle element found"],
+                "attribute_errors": [],
+                "circles": {},
+                "error_indices": {}
             }
+        
+        circles = dict(zip(CIRCLE_ATTRIBUTES, values.T))
+        invalid = np.isnan(values) & ~missing
+        multiple = len(values) > 1
+        alignment_errors = []
+        attribute_errors = []
+        error_indices = {}
+        
+        def report(errors: List[str], message: str, mask: np.ndarray) -> None:
+            indices = np.flatnonzero(mask)
+            if len(indices):
+                error_indices[message] = indices.tolist()
+                errors.append(message + _circle_list(indices) if multiple else message)
+        
+        # Check attributes
+        with np.errstate(invalid='ignore'):
+            for column, attr in enumerate(CIRCLE_ATTRIBUTES):
+                report(attribute_errors, f"Missing {attr} attribute", missing[:, column])
+                report(attribute_errors, f"Invalid {attr} value", invalid[:, column])
+                report(alignment_errors, f"Negative {attr} value", values[:, column] < 0)
+            
+            # Check centering of the first circle, allowing a small difference
+            if abs(circles['cx'][0] - circles['cy'][0]) > 1:
+                message = "Circle not centered (cx != cy)"
+                error_indices[message] = [0]
+                alignment_errors.append(message)
+        
+        return {
+            "has_circle": True,
+            "alignment_errors": alignment_errors,
+            "attribute_errors": attribute_errors,
+            "circles": circles,
+            "error_indices": error_indices
+        }
     
     @staticmethod
-    def generate_feedback(svg_frames: List[str]) -> Dict[str, Any]:
+    @diagnostics.traced(
+        "feedback_parser", "feedback",
+        lambda result: (result["overall_error"] <= 0.1, f"overall_error={result['overall_error']:.3f}")
+    )
+    def generate_feedback(svg_frames: List[Union[str, ParsedFrame]]) -> Dict[str, Any]:
         """Generate comprehensive feedback for a sequence of SVG frames.
         
+        Each frame is parsed once, through the shared ParsedFrame cache.
+        
         Args:
-            svg_frames: List of SVG markup strings
+            svg_frames: List of SVG markup strings or parsed frames
             
         Returns:
             Dictionary containing feedback analysis
@@ -137,15 +207,14 @@ class FeedbackParser:
                 "overall_error": 1.0
             }
         
+        frames = [ParsedFrame.from_source(frame) for frame in svg_frames]
+        
         # Analyze first frame for structure
-        circle_analysis = FeedbackParser.analyze_circle_attributes(svg_frames[0])
+        circle_analysis = FeedbackParser.analyze_circle_attributes(frames[0])
         
         # Analyze timing across frames
-        timing_errors = []
-        for frame in svg_frames:
-            timing = FeedbackParser.parse_animation_timing(frame)
-            if timing["has_timing"]:
-                timing_errors.append(timing["timing_error"])
+        timing = FeedbackParser.parse_sequence_timing(frames)
+        timing_errors = timing["timing_error"][timing["has_timing"]].tolist()
         
         timing_mismatch = max(timing_errors) if timing_errors else 1.0
         
@@ -0,0 +1,166 @@
+"""Linear-time color statistics over rendered pixel buffers.
+
+Images are processed in bounded row chunks, so memory use does not grow
+with the render size: a 4K frame costs the same scratch space as a small
+one, apart from a fixed lookup table.
+"""
+import sys
+from typing import Dict, Tuple
+import numpy as np
+
+# Pixels processed per chunk; bounds temporary arrays independently of size
+CHUNK_PIXELS = 1 << 16
+
+
+def channel_views(pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get zero-copy RGB and alpha views of rendered pixels.
+
+    Rendered pixels use the raster.PIXEL_FORMAT layout: premultiplied
+    ARGB32 in native byte order. The RGB view reorders channels through
+    strides, so no pixel data is moved. Color values stay premultiplied
+    by alpha.
+
+    Args:
+        pixels: Array from raster.render_svg()
+
+    Returns:
+        Tuple of an (height, width, 3) RGB view and an (height, width)
+        alpha view
+    """
+    if sys.byteorder == 'little':
+        return pixels[..., 2::-1], pixels[..., 3]
+    return pixels[..., 1:], pixels[..., 0]
+
+
+def row_chunks(pixels: np.ndarray):
+    """Yield consecutive row slices of an image holding about CHUNK_PIXELS.
+
+    Args:
+        pixels: Array of shape (height, width, ...)
+
+    Yields:
+        Views of whole rows of the image
+    """
+    rows = max(1, CHUNK_PIXELS // max(1, pixels.shape[1]))
+    for start in range(0, pixels.shape[0], rows):
+        yield pixels[start:start + rows]
+
+
+def pack_colors(rgb: np.ndarray, bits: int = 8) -> np.ndarray:
+    """Pack RGB pixels into integer color codes.
+
+    Args:
+        rgb: uint8 array of shape (..., 3) in R, G, B order (may be a view)
+        bits: Bits kept per channel; fewer bits quantize to a coarser palette
+
+    Returns:
+        Flat uint32 array of codes below 2 ** (3 * bits)
+    """
+    shift = 8 - bits
+    codes = (rgb[..., 0] >> shift).astype(np.uint32)
+    codes <<= bits
+    codes |= rgb[..., 1] >> shift
+    codes <<= bits
+    codes |= rgb[..., 2] >> shift
+    return codes.ravel()
+
+
+def count_colors(pixels: np.ndarray, bits: int = 8) -> int:
+    """Count distinct colors of a rendered image in one linear pass.
+
+    Colors are packed into integers and marked in a table with one entry
+    per possible color (16 MB for exact 24-bit color, 4 KB for a 4-bit
+    palette), instead of sorting every pixel. Alpha is not a separate
+    dimension; colors of translucent pixels are premultiplied.
+
+    Args:
+        pixels: Array from raster.render_svg()
+        bits: Bits kept per channel; below 8, colors are first quantized
+            to a palette of 2 ** (3 * bits) colors
+
+    Returns:
+        Number of distinct (quantized) colors
+    """
+    if not 1 <= bits <= 8:
+        raise ValueError(f"bits must be between 1 and 8, got {bits}")
+    seen = np.zeros(1 << (3 * bits), dtype=bool)
+    for chunk in row_chunks(pixels):
+        rgb, _ = channel_views(chunk)
+        seen[pack_colors(rgb, bits)] = True
+    return int(np.count_nonzero(seen))
+
+
+def color_variety(pixels: np.ndarray, bits: int = 8) -> float:
+    """Fraction of the (quantized) color space used by an image.
+
+    Args:
+        pixels: Array from raster.render_svg()
+        bits: Bits kept per channel, as in count_colors()
+
+    Returns:
+        Distinct colors divided by the palette size, between 0 and 1
+    """
+    return count_colors(pixels, bits) / float(1 << (3 * bits))
+
+
+def image_statistics(pixels: np.ndarray, bits: int = 8) -> Dict[str, float]:
+    """Compute every global color statistic of an image in one pass.
+
+    Each row chunk is read once for brightness and contrast (mean and
+    standard deviation over all channel values), HSV saturation and the
+    color table. Chunk means and centered sums of squares are merged with
+    Chan's parallel variance update, in float64, so contrast stays exact
+    for bright, nearly uniform images. Saturation is
+    (max - min) / max of each pixel's RGB values, the same quantity as
+    the S channel of an HSV conversion, without building an HSV image.
+
+    Args:
+        pixels: Array from raster.render_svg()
+        bits: Bits kept per channel for color variety, as in count_colors()
+
+    Returns:
+        Dictionary with brightness, contrast, saturation and
+        color_variety, each between 0 and 1
+    """
+    if not 1 <= bits <= 8:
+        raise ValueError(f"bits must be between 1 and 8, got {bits}")
+    pixel_count = pixels.shape[0] * pixels.shape[1]
+    if pixel_count == 0:
+        raise ValueError("Image is empty")
+    value_count = pixel_count * pixels.shape[2]
+
+    count = 0
+    mean = squares = saturation = 0.0
+    seen = np.zeros(1 << (3 * bits), dtype=bool)
+    for chunk in row_chunks(pixels):
+        values = chunk.reshape(-1).astype(np.float64)
+        chunk_count = values.size
+        chunk_mean = float(values.mean())
+        values -= chunk_mean
+        chunk_squares = float(np.dot(values, values))
+
+        # Merge the centered chunk moments into the running ones
+        delta = chunk_mean - mean
+        merged = count + chunk_count
+        mean += delta * chunk_count / merged
+        squares += chunk_squares + delta * delta * count * chunk_count / merged
+        count = merged
+
+        # Elementwise over channel planes; reducing the short strided
+        # channel axis with max()/min() is several times slower
+        rgb, _ = channel_views(chunk)
+        red, green, blue = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+        high = np.maximum(np.maximum(red, green), blue)
+        spread = np.subtract(high, np.minimum(np.minimum(red, green), blue), dtype=np.float32)
+        np.divide(spread, high, out=spread, where=high > 0)
+        saturation += float(spread.sum(dtype=np.float64))
+
+        seen[pack_colors(rgb, bits)] = True
+
+    variance = squares / value_count
+    return {
+        "brightness": mean / 255.0,
+        "contrast": variance ** 0.5 / 255.0,
+        "saturation": saturation / pixel_count,
+        "color_variety": int(np.count_nonzero(seen)) / float(1 << (3 * bits))
+    }
@@ -0,0 +1,306 @@
+"""Pluggable chat-completion backends for LLM critiques.
+
+The critic sends chat-completions requests as plain dictionaries and
+reads responses in the same JSON format, so any backend speaking that
+format can stand in for OpenAI:
+
+- OpenAIBackend talks to the OpenAI API, or to any compatible server
+  given its base URL.
+- StubBackend answers in-process with configurable latency, error rate
+  and canned responses, for offline load tests of throughput, fallback
+  and caching behavior.
+- serve_stub() exposes a StubBackend as a localhost HTTP server, so the
+  real OpenAI client, including its retries, can be tested against it.
+
+The OpenAI library and the HTTP server are imported on first use, so
+importing this module stays cheap.
+"""
+import asyncio
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+
+class BackendError(Exception):
+    """A failed chat-completion request."""
+
+    def __init__(self, message: str, status: int = 500):
+        """Initialize the error.
+
+        Args:
+            message: Error message
+            status: HTTP status code of the failure
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class CritiqueBackend(ABC):
+    """Interface of chat-completion backends.
+
+    Requests are the keyword arguments of a chat-completions call (model,
+    messages, temperature, response_format); responses are dictionaries
+    in the chat-completions JSON format.
+    """
+
+    @abstractmethod
+    def complete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a chat-completions request, blocking until it completes.
+
+        Args:
+            request: Chat-completions request
+
+        Returns:
+            Chat-completions response
+        """
+        raise NotImplementedError
+
+    async def acomplete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a chat-completions request without blocking the event loop.
+
+        Args:
+            request: Chat-completions request
+
+        Returns:
+            Chat-completions response
+        """
+        return await asyncio.to_thread(self.complete, request)
+
+    async def aclose(self) -> None:
+        """Release resources bound to the running event loop.
+
+        The backend stays usable; later requests reopen what they need.
+        """
+
+
+class OpenAIBackend(CritiqueBackend):
+    """Backend using the OpenAI client library."""
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, max_retries: int = 2):
+        """Initialize the backend; clients are created on first use.
+
+        Args:
+            api_key: API key
+            base_url: Base URL of an OpenAI-compatible API (default: OpenAI)
+            max_retries: Retries of rate-limited or failed requests
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self._client = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    def _options(self) -> Dict[str, Any]:
+        """Client constructor arguments."""
+        return {"api_key": self.api_key, "base_url": self.base_url, "max_retries": self.max_retries}
+
+    def complete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(**self._options())
+        return self._client.chat.completions.create(**request).model_dump()
+
+    async def acomplete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        # An async client's connections belong to the loop that opened
+        # them, so each running loop gets its own client
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import openai
+            client = self._async_clients[loop] = openai.AsyncOpenAI(**self._options())
+        response = await client.chat.completions.create(**request)
+        return response.model_dump()
+
+    async def aclose(self) -> None:
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+
+def stub_content(request: Dict[str, Any]) -> str:
+    """Default canned critique: valid single or batch feedback JSON.
+
+    Args:
+        request: Chat-completions request
+
+    Returns:
+        Response message content
+    """
+    prompt = request["messages"][-1]["content"]
+    entry = {
+        "positive_feedback": ["Stub feedback"],
+        "improvements": ["Stub improvement"],
+        "suggestions": ["Stub suggestion"]
+    }
+    candidates = re.findall(r"^Candidate (\d+):", prompt, re.MULTILINE)
+    if candidates:
+        return json.dumps({"candidates": [dict(entry, id=int(i)) for i in candidates]})
+    return json.dumps(entry)
+
+
+class StubBackend(CritiqueBackend):
+    """In-process stand-in for an OpenAI-compatible chat-completions API."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        responses: Union[None, str, Iterable[str], Callable[[Dict[str, Any]], str]] = None,
+        seed: Optional[int] = None
+    ):
+        """Initialize the stub.
+
+        Args:
+            latency: Seconds each request takes
+            jitter: Extra latency drawn uniformly from [0, jitter]
+            error_rate: Probability of a request failing
+            error_status: HTTP status of failed requests
+            responses: Message content: one string, strings used in
+                turn, or a function of the request (default: stub_content)
+            seed: Seed for latency and error draws
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        if responses is None or callable(responses):
+            self._content = responses or stub_content
+        elif isinstance(responses, str):
+            self._content = lambda request: responses
+        else:
+            cycle = itertools.cycle(list(responses))
+            self._content = lambda request: next(cycle)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def _draw(self) -> Any:
+        """Count a starting request and draw its delay and outcome."""
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            delay = self.latency + self._random.uniform(0.0, self.jitter) if self.jitter else self.latency
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return self.requests, delay, failed
+
+    def _respond(self, request: Dict[str, Any], number: int, failed: bool) -> Dict[str, Any]:
+        """Count a finished request and build its response, or raise its failure."""
+        with self._lock:
+            self.in_flight -= 1
+        if failed:
+            raise BackendError(f"Stub error on request {number}", self.error_status)
+        content = self._content(request)
+        prompt_tokens = sum(len(message["content"]) for message in request["messages"]) // 4
+        completion_tokens = len(content) // 4
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return {
+            "id": f"chatcmpl-stub-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def complete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        number, delay, failed = self._draw()
+        if delay > 0:
+            time.sleep(delay)
+        return self._respond(request, number, failed)
+
+    async def acomplete(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        number, delay, failed = self._draw()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._respond(request, number, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get request statistics.
+
+        Returns:
+            Dictionary with request, error and token counts and the most
+            requests that were in flight at once
+        """
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "peak_in_flight": self.peak_in_flight,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens
+        }
+
+
+def serve_stub(backend: StubBackend, host: str = "127.0.0.1", port: int = 0) -> "ThreadingHTTPServer":
+    """Serve a stub backend as an OpenAI-compatible HTTP API in a thread.
+
+    Point OpenAIBackend (or any OpenAI client) at
+    ``f"http://{host}:{server.server_address[1]}/v1"``; stop the server
+    with server.shutdown().
+
+    Args:
+        backend: Stub answering the requests
+        host: Interface to listen on
+        port: Port to listen on (default: any free port)
+
+    Returns:
+        Running server
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._reply(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                self._reply(200, backend.complete(request))
+            except BackendError as e:
+                self._reply(e.status, {"error": {"message": str(e), "type": "stub_error"}})
+            except (ValueError, KeyError, TypeError) as e:
+                self._reply(400, {"error": {"message": str(e), "type": "invalid_request_error"}})
+
+        def _reply(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
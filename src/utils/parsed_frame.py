@@ -0,0 +1,308 @@
+import copy
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from lxml import etree
+import numpy as np
+from .cache import LRUCache, content_hash
+
+# SMIL animation elements, matched in any or no namespace
+ANIMATION_TAGS = ('animate', 'animateTransform', 'animateMotion', 'animateColor', 'set')
+
+# Seconds per SMIL clock value unit, longest suffix first
+_CLOCK_UNITS = (('min', 60.0), ('ms', 0.001), ('h', 3600.0), ('s', 1.0))
+
+
+def _local_name(element: etree._Element) -> str:
+    """Return the tag name of an element without its namespace."""
+    return etree.QName(element).localname
+
+
+def parse_clock_value(value: Optional[str]) -> Optional[float]:
+    """Convert a SMIL clock value to seconds.
+
+    Supports timecount values with an optional unit ("2s", "500ms",
+    "1.5min", "1h", "2") and full or partial clock values ("00:01:30",
+    "01:30.5").
+
+    Args:
+        value: Clock value string
+
+    Returns:
+        Duration in seconds, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        if ':' in value:
+            parts = value.split(':')
+            if len(parts) > 3:
+                return None
+            seconds = 0.0
+            for part in parts:
+                seconds = seconds * 60.0 + float(part)
+            return seconds
+        for unit, scale in _CLOCK_UNITS:
+            if value.endswith(unit):
+                return float(value[:-len(unit)]) * scale
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_float(value: str) -> float:
+    """Convert a string to float, or NaN if it is not a number."""
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+def build_tag_index(root: etree._Element) -> Dict[str, List[etree._Element]]:
+    """Map local tag names to elements in one traversal.
+
+    Elements are indexed regardless of namespace, in document order,
+    including the root itself.
+
+    Args:
+        root: Root element to index
+
+    Returns:
+        Dictionary mapping local tag names to element lists
+    """
+    index: Dict[str, List[etree._Element]] = {}
+    for element in root.iter(etree.Element):
+        index.setdefault(element.tag.rpartition('}')[2], []).append(element)
+    return index
+
+
+class ParsedFrame:
+    """A single SVG document parsed once with lxml.
+
+    Every validation check runs against the parsed tree instead of
+    re-normalizing and regex-scanning the raw markup. Values extracted
+    from the tree (rule results, animation timing, numeric attributes)
+    are memoized on the frame, so consumers sharing a frame through
+    ParsedFrame.shared() neither re-parse nor re-extract it.
+    """
+
+    # Shared parser: no entity expansion or network access for untrusted markup
+    PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+    # Frames shared by the validator, feedback parser and critic, keyed by
+    # content hash; use cache.configure(maxsize=..., enabled=False)
+    # to resize or opt out. Shared frames must not be modified in place.
+    cache = LRUCache(maxsize=256)
+
+    def __init__(self, svg_content: str):
+        """Parse SVG content.
+
+        Args:
+            svg_content: String containing SVG markup
+        """
+        self.source = svg_content
+        self.root: Optional[etree._Element] = None
+        self.error = ""
+        self._index: Optional[Dict[str, List[etree._Element]]] = None
+        self.attributes_changed()
+        try:
+            # Encode to bytes so documents with an encoding declaration parse
+            self.root = etree.fromstring(svg_content.strip().encode('utf-8'), self.PARSER)
+        except (etree.XMLSyntaxError, ValueError) as e:
+            self.error = str(e) or "Malformed XML"
+
+    @classmethod
+    def shared(cls, svg_content: str, digest: Optional[str] = None) -> "ParsedFrame":
+        """Get the shared parsed frame for SVG content, parsing it at most once.
+
+        Args:
+            svg_content: String containing SVG markup
+            digest: Precomputed content_hash() of the markup, if known
+
+        Returns:
+            Cached or newly parsed ParsedFrame
+        """
+        if not cls.cache.enabled:
+            return cls(svg_content)
+        key = digest or content_hash(svg_content)
+        frame = cls.cache.get(key)
+        if frame is None:
+            frame = cls(svg_content)
+            cls.cache.put(key, frame)
+        return frame
+
+    @classmethod
+    def from_source(cls, frame: Union[str, "ParsedFrame"]) -> "ParsedFrame":
+        """Return a parsed frame, parsing only if given unseen raw markup.
+
+        Args:
+            frame: SVG markup string or an already parsed frame
+
+        Returns:
+            ParsedFrame instance, shared for markup strings
+        """
+        if isinstance(frame, ParsedFrame):
+            return frame
+        return cls.shared(frame)
+
+    def copy(self) -> "ParsedFrame":
+        """Copy the frame with a private tree that may be modified in place.
+
+        Returns:
+            New ParsedFrame with the same source and a deep-copied tree
+        """
+        frame = object.__new__(type(self))
+        frame.source = self.source
+        frame.root = copy.deepcopy(self.root) if self.root is not None else None
+        frame.error = self.error
+        frame._index = None
+        frame.attributes_changed()
+        return frame
+
+    def tree_changed(self) -> None:
+        """Forget the tag index and extracted values after elements are added or removed."""
+        self._index = None
+        self.attributes_changed()
+
+    def attributes_changed(self) -> None:
+        """Forget values extracted from attributes after an in-place change.
+
+        The tag index is kept, as it only depends on the tree structure;
+        call tree_changed() after adding or removing elements.
+        """
+        # Per-check element rule results, filled on first validation
+        self.rule_results: Optional[Dict[str, Dict[str, Any]]] = None
+        self._animations: Optional[List[Dict[str, Any]]] = None
+        self._numeric: Dict[Any, List[Dict[str, Optional[float]]]] = {}
+        self._arrays: Dict[Any, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def is_parsed(self) -> bool:
+        """Whether the document is well-formed XML."""
+        return self.root is not None
+
+    @property
+    def root_tag(self) -> str:
+        """Local tag name of the root element, or empty string if unparsed."""
+        if self.root is None:
+            return ""
+        return _local_name(self.root)
+
+    @property
+    def index(self) -> Dict[str, List[etree._Element]]:
+        """Namespace-agnostic tag index, built in one traversal on first use.
+
+        The index belongs to this frame and is dropped by tree_changed().
+        """
+        if self._index is None:
+            self._index = build_tag_index(self.root) if self.root is not None else {}
+        return self._index
+
+    def find_all(self, tag: str) -> List[etree._Element]:
+        """Find all elements with a local tag name, in any or no namespace.
+
+        Args:
+            tag: Local tag name to find
+
+        Returns:
+            List of found elements in document order
+        """
+        return list(self.index.get(tag, ()))
+
+    def find(self, tag: str) -> Optional[etree._Element]:
+        """Find the first element with a local tag name.
+
+        Args:
+            tag: Local tag name to find
+
+        Returns:
+            Found element or None
+        """
+        elements = self.index.get(tag)
+        return elements[0] if elements else None
+
+    @property
+    def animations(self) -> List[Dict[str, Any]]:
+        """SMIL animation elements and their timing, extracted on first use.
+
+        Each entry has the ``element``, its local ``tag``, the target
+        ``attribute``, the raw ``dur`` and ``values`` strings (None if
+        absent) and ``duration`` in seconds (None if absent or invalid),
+        in document order.
+        """
+        if self._animations is None:
+            self._animations = []
+            if self.root is not None:
+                for element in self.root.iter(*(f"{{*}}{tag}" for tag in ANIMATION_TAGS)):
+                    dur = element.get('dur')
+                    self._animations.append({
+                        "element": element,
+                        "tag": _local_name(element),
+                        "attribute": element.get('attributeName'),
+                        "dur": dur,
+                        "duration": parse_clock_value(dur),
+                        "values": element.get('values')
+                    })
+        return self._animations
+
+    def numeric_attributes(self, tag: str, names: Sequence[str]) -> List[Dict[str, Optional[float]]]:
+        """Numeric attribute values of every element with a local tag name.
+
+        Args:
+            tag: Local tag name, e.g. 'circle'
+            names: Attribute names to extract, e.g. ('cx', 'cy', 'r')
+
+        Returns:
+            One dictionary per element in document order, mapping each
+            present attribute to its float value, or None if it is not a
+            number; absent attributes are left out
+        """
+        key = (tag, tuple(names))
+        values = self._numeric.get(key)
+        if values is None:
+            values = []
+            for element in self.index.get(tag, ()):
+                numbers: Dict[str, Optional[float]] = {}
+                for name in names:
+                    raw = element.get(name)
+                    if raw is None:
+                        continue
+                    try:
+                        numbers[name] = float(raw)
+                    except ValueError:
+                        numbers[name] = None
+                values.append(numbers)
+            self._numeric[key] = values
+        return values
+
+    def attribute_array(self, tag: str, names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Numeric attribute values of every element with a tag, as arrays.
+
+        Values are read in one pass over the indexed elements and
+        converted to floats in a single NumPy call.
+
+        Args:
+            tag: Local tag name, e.g. 'circle'
+            names: Attribute names to extract, e.g. ('cx', 'cy', 'r')
+
+        Returns:
+            Tuple of a float array of shape (elements, len(names)), NaN
+            where an attribute is absent or not a number, and a boolean
+            array of the same shape marking absent attributes
+        """
+        key = (tag, tuple(names))
+        arrays = self._arrays.get(key)
+        if arrays is None:
+            elements = self.index.get(tag, ())
+            raw = [element.get(name) for element in elements for name in names]
+            missing = np.fromiter((value is None for value in raw), bool, len(raw))
+            present = [value for value in raw if value is not None]
+            try:
+                numbers = np.fromiter(map(float, present), np.float64, len(present))
+            except ValueError:
+                numbers = np.fromiter(map(_to_float, present), np.float64, len(present))
+            values = np.full(len(raw), np.nan)
+            values[~missing] = numbers
+            shape = (len(elements), len(names))
+            arrays = (values.reshape(shape), missing.reshape(shape))
+            self._arrays[key] = arrays
+        return arrays
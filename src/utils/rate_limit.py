@@ -0,0 +1,154 @@
+"""Token-bucket rate limiting for LLM API calls.
+
+Limits are enforced by reservation: each call takes its share from the
+bucket immediately, possibly overdrawing it, and is told how long to
+wait until the bucket has refilled. The same limiter therefore serves
+blocking callers (time.sleep) and asyncio tasks (asyncio.sleep), and
+concurrent callers queue fairly in the order they reserved.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    """Bucket refilling continuously up to a capacity."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """Initialize a full bucket.
+
+        Args:
+            per_minute: Refill rate; 0 or less disables the limit
+            capacity: Largest burst (default: one minute's worth)
+        """
+        self.per_minute = per_minute
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the bucket limits anything."""
+        return self.per_minute > 0
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take tokens, returning the seconds until they are available.
+
+        Args:
+            amount: Tokens to take
+            now: Current time.monotonic() value
+
+        Returns:
+            Seconds to wait before the reserved tokens may be used
+        """
+        if not self.enabled:
+            return 0.0
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level * 60.0 / self.per_minute)
+
+    def refund(self, amount: float) -> None:
+        """Return tokens taken in excess, or take more if amount is negative."""
+        if self.enabled:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one API quota."""
+
+    def __init__(self, requests_per_minute: float = 60, tokens_per_minute: float = 90000):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request rate limit; 0 disables it
+            tokens_per_minute: Token rate limit; 0 disables it
+        """
+        self._lock = threading.Lock()
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.waits = 0
+        self.waited = 0.0
+
+    def configure(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ) -> None:
+        """Change the limits; the affected buckets start full.
+
+        Args:
+            requests_per_minute: New request rate limit
+            tokens_per_minute: New token rate limit
+        """
+        with self._lock:
+            if requests_per_minute is not None:
+                self.requests = TokenBucket(requests_per_minute)
+            if tokens_per_minute is not None:
+                self.tokens = TokenBucket(tokens_per_minute)
+
+    def reserve(self, tokens: float) -> float:
+        """Reserve one request using an estimated number of tokens.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(self.requests.reserve(1, now), self.tokens.reserve(tokens, now))
+            if delay > 0:
+                self.waits += 1
+                self.waited += delay
+            return delay
+
+    def record_usage(self, estimated: float, actual: float) -> None:
+        """Correct the token bucket once a request's real usage is known.
+
+        Args:
+            estimated: Tokens reserved for the request
+            actual: Tokens the API reported
+        """
+        with self._lock:
+            self.tokens.refund(estimated - actual)
+
+    def wait(self, tokens: float) -> None:
+        """Block until a request may be sent.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self, tokens: float) -> None:
+        """Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter statistics.
+
+        Returns:
+            Dictionary with the limits, the number of delayed requests and
+            the total delay in seconds
+        """
+        return {
+            "requests_per_minute": self.requests.per_minute,
+            "tokens_per_minute": self.tokens.per_minute,
+            "waits": self.waits,
+            "waited": self.waited
+        }
@@ -0,0 +1,365 @@
+"""SMIL timeline sampling: static snapshots of animated SVG documents.
+
+Renderers such as cairosvg ignore animation elements and draw only the
+base document. SMILTimeline compiles every value animation of a
+document into flat NumPy keyframe arrays once, then evaluates all
+animations at any number of timestamps in a single vectorized pass and
+writes the results into static copies of the document.
+
+Supported: animate, animateColor, animateTransform and set with values
+or from/to, keyTimes, keySplines and every calcMode, offset begin
+times, dur, repeatCount, repeatDur and fill="freeze". Event-based begin
+times never start, and additive or accumulated animations replace the
+base value instead of adding to it.
+"""
+import copy
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from lxml import etree
+from .parsed_frame import ParsedFrame, parse_clock_value
+from .smil_timing import bezier, parse_color, parse_numbers, resolve_keyframes
+
+# Animation elements sampled on the timeline
+TIMELINE_TAGS = ('animate', 'animateColor', 'animateTransform', 'set')
+
+# Bisection steps solving keySpline x(s) = t; error below 2 ** -30
+SPLINE_ITERATIONS = 30
+
+XLINK_HREF = '{http://www.w3.org/1999/xlink}href'
+
+
+def _repeat_count(value: Optional[str]) -> Optional[float]:
+    """Parse repeatCount, or None if absent or invalid."""
+    if value is None:
+        return None
+    if value.strip() == 'indefinite':
+        return np.inf
+    try:
+        count = float(value)
+    except ValueError:
+        return None
+    return count if count > 0 else None
+
+
+def _repeat_dur(value: Optional[str]) -> Optional[float]:
+    """Parse repeatDur in seconds, or None if absent or invalid."""
+    if value is None:
+        return None
+    if value.strip() == 'indefinite':
+        return np.inf
+    return parse_clock_value(value)
+
+
+def _begin_time(value: Optional[str]) -> Optional[float]:
+    """Earliest offset begin time, or None if the animation never begins."""
+    if value is None:
+        return 0.0
+    offsets = [parse_clock_value(part.lstrip('+')) for part in value.split(';')]
+    offsets = [offset for offset in offsets if offset is not None]
+    return min(offsets) if offsets else None
+
+
+def _value_vectors(values: List[str]):
+    """Interpret animation values as vectors.
+
+    Returns:
+        Tuple of the value kind ('number', 'color' or 'string') and a
+        float array with one row per value; string values are numbered
+    """
+    for kind, parse in (('number', parse_numbers), ('color', parse_color)):
+        vectors = [parse(value) for value in values]
+        if all(vector is not None for vector in vectors) and len({len(vector) for vector in vectors}) == 1:
+            return kind, np.array(vectors, dtype=np.float64)
+    return 'string', np.arange(len(values), dtype=np.float64).reshape(-1, 1)
+
+
+def _ease(progress: np.ndarray, splines: np.ndarray) -> np.ndarray:
+    """Map interval progress through keySpline easing curves.
+
+    Solves x(s) = progress by bisection, which converges for every valid
+    spline since x is monotonic, then evaluates y(s).
+
+    Args:
+        progress: Flat array of progress through each interval, between 0 and 1
+        splines: (x1, y1, x2, y2) control points, one row per entry of progress
+
+    Returns:
+        Eased progress, same shape as progress
+    """
+    x1, y1, x2, y2 = splines.T
+    low = np.zeros_like(progress)
+    high = np.ones_like(progress)
+    for _ in range(SPLINE_ITERATIONS):
+        middle = (low + high) * 0.5
+        below = bezier(middle, x1, x2) < progress
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    return bezier((low + high) * 0.5, y1, y2)
+
+
+def _format_number(value: float) -> str:
+    """Format an interpolated number compactly."""
+    return f"{value:.6g}"
+
+
+class SMILTimeline:
+    """SMIL animations of one document compiled for sampling at any time."""
+
+    def __init__(self, svg_content: Union[str, ParsedFrame]):
+        """Compile the animations of a document.
+
+        Args:
+            svg_content: String containing SVG markup, or an already parsed frame
+        """
+        self.frame = ParsedFrame.from_source(svg_content)
+        self.tracks: List[Dict[str, Any]] = []
+        self.issues: List[str] = []
+        if self.frame.root is None:
+            self.issues.append(f"Invalid XML: {self.frame.error}")
+            return
+
+        # Targets and animation elements are addressed by document position,
+        # so snapshots can find them in copies of the tree
+        self._elements = list(self.frame.root.iter())
+        positions = {id(element): i for i, element in enumerate(self._elements)}
+        ids = {element.get('id'): element for element in self._elements if element.get('id')}
+        self._animation_positions = []
+
+        for animation in self.frame.animations:
+            if animation["tag"] not in TIMELINE_TAGS:
+                continue
+            element = animation["element"]
+            self._animation_positions.append(positions[id(element)])
+            track = self._compile(animation, ids)
+            if track is not None:
+                track["target"] = positions[id(track.pop("target_element"))]
+                self.tracks.append(track)
+        self._pack()
+
+    def _compile(self, animation: Dict[str, Any], ids: Dict[str, etree._Element]) -> Optional[Dict[str, Any]]:
+        """Compile one animation element into a track, or None if it never applies."""
+        element = animation["element"]
+        name = f"{animation['tag']} {animation['attribute']}"
+
+        href = element.get(XLINK_HREF) or element.get('href')
+        target = ids.get(href[1:]) if href and href.startswith('#') else element.getparent()
+        if target is None or not (animation["attribute"] or animation["tag"] == 'animateTransform'):
+            self.issues.append(f"{name}: no target element or attribute")
+            return None
+
+        begin = _begin_time(element.get('begin'))
+        if begin is None:
+            self.issues.append(f"{name}: begin time is not an offset; never sampled")
+            return None
+
+        if animation["tag"] == 'set':
+            if element.get('to') is None:
+                self.issues.append(f"{name}: set requires a to value")
+                return None
+            values = [element.get('to').strip()]
+            calc_mode = 'discrete'
+            key_times = np.zeros(1)
+            splines = np.zeros((0, 4))
+        else:
+            keyframes = resolve_keyframes(animation)
+            self.issues.extend(f"{name}: {issue}" for issue in keyframes["issues"])
+            values = keyframes["values"]
+            calc_mode = keyframes["calc_mode"]
+            key_times = keyframes["key_times"]
+            splines = keyframes["splines"]
+        if not values:
+            self.issues.append(f"{name}: no values to animate")
+            return None
+
+        duration = animation["duration"]
+        if duration is None or duration <= 0:
+            if animation["tag"] != 'set':
+                self.issues.append(f"{name}: missing or invalid duration")
+                return None
+            duration = np.inf
+
+        # Active duration per SMIL: the repeat limits, or one simple duration
+        repeat_count = _repeat_count(element.get('repeatCount'))
+        repeat_dur = _repeat_dur(element.get('repeatDur'))
+        if repeat_count is None and repeat_dur is None:
+            active = duration
+        else:
+            active = min(
+                duration * repeat_count if repeat_count is not None else np.inf,
+                repeat_dur if repeat_dur is not None else np.inf
+            )
+
+        kind, vectors = _value_vectors(values)
+        if kind == 'string' or len(values) < 2:
+            calc_mode = 'discrete'
+        if calc_mode == 'discrete' and element.get('keyTimes') is None:
+            # Discrete values hold for equal shares of the simple duration
+            key_times = np.arange(len(values)) / len(values)
+        if calc_mode != 'spline':
+            splines = np.zeros((max(len(values) - 1, 0), 4))
+
+        attribute = animation["attribute"]
+        transform_type = None
+        if animation["tag"] == 'animateTransform':
+            attribute = attribute or 'transform'
+            transform_type = element.get('type', 'translate')
+
+        return {
+            "tag": animation["tag"],
+            "target_element": target,
+            "attribute": attribute,
+            "kind": kind,
+            "transform_type": transform_type,
+            "values": values,
+            "vectors": vectors,
+            "key_times": np.asarray(key_times, dtype=np.float64),
+            "splines": np.asarray(splines, dtype=np.float64).reshape(-1, 4),
+            "calc_mode": calc_mode,
+            "begin": begin,
+            "duration": duration,
+            "active": active,
+            "freeze": element.get('fill') == 'freeze'
+        }
+
+    def _pack(self) -> None:
+        """Concatenate every track's keyframes into flat arrays."""
+        tracks = self.tracks
+        counts = np.array([len(track["values"]) for track in tracks], dtype=np.intp)
+        self._starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+        self._counts = counts
+        width = max((track["vectors"].shape[1] for track in tracks), default=1)
+        self._vectors = np.full((int(counts.sum()), width), np.nan)
+        for track, start in zip(tracks, self._starts):
+            vectors = track["vectors"]
+            self._vectors[start:start + len(vectors), :vectors.shape[1]] = vectors
+
+        # Key times of track a are shifted by 2a, so one sorted array
+        # locates the keyframe of every track at once
+        self._keys = np.concatenate(
+            [track["key_times"] + 2.0 * a for a, track in enumerate(tracks)]
+        ) if tracks else np.zeros(0)
+        self._splines = np.concatenate([track["splines"] for track in tracks]) if tracks else np.zeros((0, 4))
+        self._begin = np.array([track["begin"] for track in tracks], dtype=np.float64)[:, None]
+        self._duration = np.array([track["duration"] for track in tracks], dtype=np.float64)[:, None]
+        self._active = np.array([track["active"] for track in tracks], dtype=np.float64)[:, None]
+        self._freeze = np.array([track["freeze"] for track in tracks], dtype=bool)[:, None]
+        self._interpolated = np.array(
+            [track["calc_mode"] != 'discrete' for track in tracks], dtype=bool
+        )[:, None]
+        self._spline = np.array([track["calc_mode"] == 'spline' for track in tracks], dtype=bool)[:, None]
+
+    @property
+    def period(self) -> float:
+        """Longest simple duration of a repeating track, or the time at which
+        the last non-repeating track ends; 0.0 without finite tracks."""
+        ends = [
+            track["duration"] if track["active"] > track["duration"] else track["begin"] + track["active"]
+            for track in self.tracks
+        ]
+        ends = [end for end in ends if np.isfinite(end)]
+        return max(ends, default=0.0)
+
+    def evaluate(self, times: Sequence[float]) -> Dict[str, np.ndarray]:
+        """Evaluate every track at every timestamp in one pass.
+
+        Args:
+            times: Document times in seconds
+
+        Returns:
+            Dictionary of arrays with one row per track and one column
+            per timestamp:
+            - values: Animated value vectors, shape (tracks, times, width)
+            - rows: Index of the value in effect, for discrete tracks
+            - applied: Whether the track sets its attribute at that time
+        """
+        times = np.asarray(times, dtype=np.float64).reshape(1, -1)
+        count = len(self.tracks)
+        if count == 0:
+            empty = np.zeros((0, times.shape[1]))
+            return {"values": empty[..., None], "rows": empty.astype(np.intp), "applied": empty.astype(bool)}
+
+        local = times - self._begin
+        ended = local >= self._active
+        applied = (local >= 0) & (~ended | self._freeze)
+
+        # Progress through the simple duration; a frozen animation whose
+        # active duration ends on a repeat boundary keeps its last value
+        with np.errstate(invalid='ignore'):
+            elapsed = np.clip(np.minimum(local, self._active), 0.0, None)
+            remainder = np.fmod(elapsed, self._duration)
+            progress = np.where(np.isfinite(self._duration), remainder / self._duration, 0.0)
+            boundary = ended & (remainder == 0) & (elapsed > 0)
+        progress = np.where(boundary, 1.0, np.nan_to_num(progress))
+
+        offsets = 2.0 * np.arange(count)[:, None]
+        first = self._starts[:, None]
+        last = (self._starts + self._counts - 1)[:, None]
+        rows = np.searchsorted(self._keys, progress + offsets, side='right') - 1
+        rows = np.clip(rows, first, last)
+
+        # Interpolated tracks blend the keyframes bounding their interval
+        interval = np.clip(rows, first, np.maximum(last - 1, first))
+        following = np.minimum(interval + 1, last)
+        span = self._keys[following] - self._keys[interval]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(span > 0, (progress + offsets - self._keys[interval]) / span, 1.0)
+        fraction = np.clip(fraction, 0.0, 1.0)
+
+        spline_rows = np.clip(interval - np.arange(count)[:, None], 0, max(len(self._splines) - 1, 0))
+        if len(self._splines) and self._spline.any():
+            eased = _ease(fraction.ravel(), self._splines[spline_rows.ravel()]).reshape(fraction.shape)
+            fraction = np.where(self._spline, eased, fraction)
+
+        start = self._vectors[interval]
+        blended = start + fraction[..., None] * (self._vectors[following] - start)
+        values = np.where(self._interpolated[..., None], blended, self._vectors[rows])
+        rows = np.where(self._interpolated, np.where(fraction >= 1.0, following, interval), rows)
+        return {"values": values, "rows": rows - first, "applied": applied}
+
+    def _format(self, track: Dict[str, Any], vector: np.ndarray, row: int) -> str:
+        """Format an evaluated value as attribute text."""
+        kind = track["kind"]
+        if kind == 'string':
+            return track["values"][row]
+        width = track["vectors"].shape[1]
+        vector = vector[:width]
+        if kind == 'color':
+            red, green, blue = np.clip(np.rint(vector), 0, 255).astype(int)
+            return f"#{red:02x}{green:02x}{blue:02x}"
+        text = ' '.join(_format_number(value) for value in vector)
+        if track["transform_type"] is not None:
+            return f"{track['transform_type']}({text})"
+        return text
+
+    def snapshots(self, times: Sequence[float]) -> List[str]:
+        """Write static documents showing the animation at each timestamp.
+
+        Animation elements are removed from the snapshots, and animated
+        attributes hold their value at that time.
+
+        Args:
+            times: Document times in seconds
+
+        Returns:
+            One SVG markup string per timestamp
+        """
+        if self.frame.root is None:
+            return [self.frame.source for _ in times]
+        evaluated = self.evaluate(times)
+        values, rows, applied = evaluated["values"], evaluated["rows"], evaluated["applied"]
+
+        snapshots = []
+        for column in range(len(times)):
+            root = copy.deepcopy(self.frame.root)
+            elements = list(root.iter())
+            for a, track in enumerate(self.tracks):
+                if applied[a, column]:
+                    text = self._format(track, values[a, column], int(rows[a, column]))
+                    elements[track["target"]].set(track["attribute"], text)
+            for position in self._animation_positions:
+                element = elements[position]
+                parent = element.getparent()
+                if parent is not None:
+                    parent.remove(element)
+            snapshots.append(etree.tostring(root, encoding='unicode'))
+        return snapshots
@@ -0,0 +1,393 @@
+"""SMIL timing model analysis for animation elements.
+
+Each animation element's values, keyTimes, keySplines and calcMode are
+resolved into per-interval keyframes. The easing curves of every
+interval in a document, or in a whole frame sequence, are then sampled
+together in one NumPy evaluation, rather than element by element.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from .cache import LRUCache
+from .parsed_frame import ParsedFrame
+from . import diagnostics
+
+# Animation elements interpolating a values list
+VALUE_TAGS = ('animate', 'animateColor', 'animateTransform')
+
+CALC_MODES = ('discrete', 'linear', 'paced', 'spline')
+
+# Attributes besides values that determine an element's keyframes and
+# smoothness; elements agreeing on all of them are analyzed once
+TIMING_ATTRIBUTES = ('from', 'to', 'calcMode', 'keyTimes', 'keySplines', 'repeatCount', 'repeatDur', 'accumulate')
+
+# Bezier control points (x1, y1, x2, y2) for which x(t) = y(t) = t
+LINEAR_SPLINE = (1 / 3, 1 / 3, 2 / 3, 2 / 3)
+
+_SEPARATOR = re.compile(r'[\s,]+')
+_HEX_COLOR = re.compile(r'#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})\Z')
+_RGB_COLOR = re.compile(r'rgb\(\s*([^,\s]+)\s*,\s*([^,\s]+)\s*,\s*([^,\s)]+)\s*\)\Z')
+
+
+def parse_numbers(text: str) -> Optional[List[float]]:
+    """Parse a whitespace or comma separated number list."""
+    parts = [part for part in _SEPARATOR.split(text.strip()) if part]
+    if not parts:
+        return None
+    try:
+        return [float(part) for part in parts]
+    except ValueError:
+        return None
+
+
+def parse_color(text: str) -> Optional[List[float]]:
+    """Parse a hex or rgb() color into RGB channels."""
+    text = text.strip()
+    match = _HEX_COLOR.match(text)
+    if match:
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = ''.join(digit * 2 for digit in digits)
+        return [float(int(digits[i:i + 2], 16)) for i in (0, 2, 4)]
+    match = _RGB_COLOR.match(text)
+    if match:
+        try:
+            return [
+                float(channel[:-1]) * 2.55 if channel.endswith('%') else float(channel)
+                for channel in match.groups()
+            ]
+        except ValueError:
+            return None
+    return None
+
+
+def split_values(text: Optional[str]) -> List[str]:
+    """Split a SMIL ``values`` attribute, ignoring a trailing separator.
+
+    Args:
+        text: Attribute value
+
+    Returns:
+        List of value strings
+    """
+    if text is None:
+        return []
+    values = [value.strip() for value in text.split(';')]
+    if values and not values[-1]:
+        values.pop()
+    return values
+
+
+def value_steps(values: List[str]) -> np.ndarray:
+    """Change between consecutive animation values.
+
+    Numbers, number lists (such as transform arguments) and colors are
+    subtracted as vectors; other values change by 1 whenever they differ.
+
+    Args:
+        values: Animation values
+
+    Returns:
+        Array of shape (len(values) - 1, dimensions)
+    """
+    for parse in (parse_numbers, parse_color):
+        vectors = [parse(value) for value in values]
+        if all(vector is not None for vector in vectors) and len({len(vector) for vector in vectors}) == 1:
+            return np.diff(np.array(vectors), axis=0).reshape(len(values) - 1, -1)
+    return np.array([[float(a != b)] for a, b in zip(values, values[1:])]).reshape(-1, 1)
+
+
+def _turns(steps: np.ndarray) -> np.ndarray:
+    """Cosine of the angle from each step to the next, wrapping to the first.
+
+    Steps without movement have no direction and count as cosine 1.
+    """
+    norms = np.linalg.norm(steps, axis=1)
+    following = np.roll(steps, -1, axis=0)
+    products = norms * np.roll(norms, -1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cosines = np.einsum('ij,ij->i', steps, following) / products
+    return np.where(products > 0, cosines, 1.0)
+
+
+def _repeats(element: Any) -> bool:
+    """Whether an animation element plays more than once."""
+    if element.get('repeatDur') is not None:
+        return True
+    count = (element.get('repeatCount') or '').strip()
+    if count == 'indefinite':
+        return True
+    try:
+        return float(count) > 1
+    except ValueError:
+        return False
+
+
+def resolve_keyframes(animation: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve the SMIL timing model of one animation element.
+
+    Invalid keyTimes or keySplines are reported and replaced by their
+    defaults, as user agents do.
+
+    Args:
+        animation: Entry of ParsedFrame.animations
+
+    Returns:
+        Dictionary containing:
+        - values: List of value strings
+        - steps: Change between consecutive values, one row per interval
+        - deltas: Distances between consecutive values
+        - calc_mode: Effective calcMode
+        - key_times: Array of one time per value, from 0 to 1
+        - splines: Array of (x1, y1, x2, y2) control points per interval
+        - issues: List of timing model problems
+    """
+    element = animation["element"]
+    issues = []
+
+    values = split_values(animation["values"])
+    if not values and element.get('from') is not None and element.get('to') is not None:
+        values = [element.get('from').strip(), element.get('to').strip()]
+    count = len(values)
+    steps = value_steps(values) if count > 1 else np.zeros((0, 1))
+    deltas = np.linalg.norm(steps, axis=1)
+
+    calc_mode = element.get('calcMode', 'linear')
+    if calc_mode not in CALC_MODES:
+        issues.append(f"Unknown calcMode '{calc_mode}'")
+        calc_mode = 'linear'
+
+    key_times = np.linspace(0.0, 1.0, count)
+    key_times_attr = element.get('keyTimes')
+    if calc_mode == 'paced':
+        total = deltas.sum()
+        if total > 0:
+            key_times = np.concatenate(([0.0], np.cumsum(deltas) / total))
+    elif key_times_attr is not None and count:
+        parsed = parse_numbers(key_times_attr.replace(';', ' '))
+        if parsed is None or len(parsed) != count:
+            issues.append("keyTimes must list one time per value")
+        elif parsed[0] != 0 or (calc_mode != 'discrete' and parsed[-1] != 1):
+            issues.append("keyTimes must start at 0 and end at 1")
+        elif any(b < a for a, b in zip(parsed, parsed[1:])):
+            issues.append("keyTimes must not decrease")
+        else:
+            key_times = np.array(parsed)
+
+    splines = np.tile(LINEAR_SPLINE, (max(count - 1, 0), 1))
+    if calc_mode == 'spline':
+        key_splines = element.get('keySplines')
+        rows = [parse_numbers(spline) for spline in split_values(key_splines)]
+        if not key_splines:
+            issues.append("calcMode spline requires keySplines")
+        elif len(rows) != count - 1 or any(row is None or len(row) != 4 for row in rows):
+            issues.append("keySplines must list four control values per interval")
+        elif any(not 0 <= value <= 1 for row in rows for value in row):
+            issues.append("keySplines control values must be between 0 and 1")
+        else:
+            splines = np.array(rows)
+
+    return {
+        "values": values,
+        "steps": steps,
+        "deltas": deltas,
+        "calc_mode": calc_mode,
+        "key_times": key_times,
+        "splines": splines,
+        "issues": issues
+    }
+
+
+def bezier(t: np.ndarray, p1: np.ndarray, p2: np.ndarray) -> np.ndarray:
+    """Evaluate a unit cubic Bezier coordinate with end points 0 and 1."""
+    u = 1.0 - t
+    return 3.0 * u * u * t * p1 + 3.0 * u * t * t * p2 + t * t * t
+
+
+class SMILTimingAnalyzer:
+    """Utility class for analyzing the timing of every animation in a document."""
+
+    # Easing curve samples per keyframe interval
+    SAMPLES = 32
+
+    # Resolved keyframes and smoothness per element timing (values plus
+    # TIMING_ATTRIBUTES), shared across calls; use cache.configure(maxsize=...,
+    # enabled=False) to resize or opt out. Cached keyframes are read-only.
+    cache = LRUCache(maxsize=1024)
+
+    @staticmethod
+    def analyze(svg_content: Union[str, ParsedFrame]) -> Dict[str, Any]:
+        """Analyze the SMIL timing model of all animation elements.
+
+        Smoothness measures how continuously each animated value moves:
+        1.0 when its velocity never jumps, 0.0 when it reverses at full
+        speed or changes discretely. Velocities are sampled along every
+        keyframe interval's easing curve, including a repeating
+        animation's wrap from its last value back to its first.
+
+        Args:
+            svg_content: String containing SVG markup, or an already parsed frame
+
+        Returns:
+            Dictionary containing:
+            - elements: Per-element tag, attribute, duration, calc_mode,
+              key_times, smoothness (None without two values) and issues
+            - smoothness: Mean smoothness over analyzed elements
+            - min_smoothness: Lowest element smoothness
+            - issues: Timing model problems across all elements
+        """
+        return SMILTimingAnalyzer.analyze_many([svg_content])[0]
+
+    @staticmethod
+    @diagnostics.traced(
+        "smil_timing", "analysis",
+        lambda results: (
+            not any(result["issues"] for result in results),
+            f"smoothness={min((result['min_smoothness'] for result in results), default=0.0):.3f}"
+        )
+    )
+    def analyze_many(svg_frames: List[Union[str, ParsedFrame]]) -> List[Dict[str, Any]]:
+        """Analyze the SMIL timing of many documents in one bulk evaluation.
+
+        Gives the same per-document results as analyze(). Elements with
+        the same values and timing attributes, such as an animation
+        repeated across the frames of a sequence, are resolved and
+        sampled once, and then served from SMILTimingAnalyzer.cache.
+
+        Args:
+            svg_frames: List of SVG markup strings or parsed frames
+
+        Returns:
+            List of analyze() results, one per frame
+        """
+        cache = SMILTimingAnalyzer.cache
+        timings: Dict[Tuple, Tuple[Dict[str, Any], Optional[float]]] = {}  # (keyframes, smoothness)
+        sampled = []  # (timing, element, keyframes) of uncached continuously animated timings
+        documents = []
+        for svg_content in svg_frames:
+            animations = []
+            for animation in ParsedFrame.from_source(svg_content).animations:
+                if animation["tag"] not in VALUE_TAGS:
+                    continue
+                element = animation["element"]
+                timing = (animation["values"],) + tuple(element.get(name) for name in TIMING_ATTRIBUTES)
+                if timing not in timings:
+                    cached = cache.get(timing)
+                    if cached is not None:
+                        timings[timing] = cached
+                    else:
+                        keyframes = resolve_keyframes(animation)
+                        if len(keyframes["values"]) < 2:
+                            timings[timing] = (keyframes, None)
+                        elif keyframes["calc_mode"] == 'discrete':
+                            timings[timing] = (keyframes, 0.0 if keyframes["deltas"].any() else 1.0)
+                        else:
+                            sampled.append((timing, element, keyframes))
+                            timings[timing] = (keyframes, None)
+                        cache.put(timing, timings[timing])
+                animations.append((animation, timing))
+            documents.append(animations)
+
+        if sampled:
+            for (timing, _, keyframes), value in zip(sampled, SMILTimingAnalyzer._sampled_smoothness(sampled)):
+                timings[timing] = (keyframes, float(value))
+                cache.put(timing, timings[timing])
+
+        results = []
+        for animations in documents:
+            elements = []
+            for animation, timing in animations:
+                keyframes, smoothness = timings[timing]
+                issues = list(keyframes["issues"])
+                if animation["duration"] is None:
+                    issues.insert(0, "Missing or invalid duration")
+                if len(keyframes["values"]) < 2:
+                    issues.append("Animation needs at least two values")
+                elements.append({
+                    "tag": animation["tag"],
+                    "attribute": animation["attribute"],
+                    "duration": animation["duration"],
+                    "calc_mode": keyframes["calc_mode"],
+                    "key_times": keyframes["key_times"].tolist(),
+                    "smoothness": smoothness,
+                    "issues": issues
+                })
+
+            scores = [entry["smoothness"] for entry in elements if entry["smoothness"] is not None]
+            results.append({
+                "elements": elements,
+                "smoothness": sum(scores) / len(scores) if scores else 0.0,
+                "min_smoothness": min(scores) if scores else 0.0,
+                "issues": [
+                    f"{entry['tag']} {entry['attribute']}: {issue}"
+                    for entry in elements for issue in entry["issues"]
+                ]
+            })
+        return results
+
+    @staticmethod
+    def _sampled_smoothness(sampled: List[Any]) -> np.ndarray:
+        """Sample the easing curves of all intervals of all elements at once.
+
+        Args:
+            sampled: (key, element, keyframes) per element with at least
+                two values
+
+        Returns:
+            Array of smoothness scores, one per element
+        """
+        samples = SMILTimingAnalyzer.SAMPLES
+        splines = np.concatenate([keyframes["splines"] for _, _, keyframes in sampled])
+        deltas = np.concatenate([keyframes["deltas"] for _, _, keyframes in sampled])
+        spans = np.concatenate([np.diff(keyframes["key_times"]) for _, _, keyframes in sampled])
+        intervals = np.array([len(keyframes["deltas"]) for _, _, keyframes in sampled])
+
+        # Value change per unit of animation time over each interval; an
+        # interval of zero length with a change is an instantaneous jump
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = np.where(spans > 0, deltas / spans, np.where(deltas > 0, np.inf, 0.0))
+
+        # Segment velocities along every easing curve: shape (intervals, samples)
+        t = np.linspace(0.0, 1.0, samples + 1)
+        x = bezier(t, splines[:, 0:1], splines[:, 2:3])
+        y = bezier(t, splines[:, 1:2], splines[:, 3:4])
+        dx = np.maximum(np.diff(x, axis=1), np.finfo(np.float64).tiny)
+        with np.errstate(invalid='ignore'):
+            velocity = (np.diff(y, axis=1) / dx * rates[:, None]).ravel()
+
+        # Each element owns a contiguous run of segments in timeline order;
+        # velocities are speeds along each interval's direction of change
+        ends = np.cumsum(intervals) * samples
+        starts = ends - intervals * samples
+        peak = np.maximum.reduceat(np.abs(velocity), starts)
+
+        jumps = np.zeros_like(velocity)
+        jumps[:-1] = np.abs(np.diff(velocity))
+
+        # At keyframes the direction may turn: |a - b| as vectors
+        last = np.arange(1, len(spans) + 1) * samples - 1
+        following = last + 1
+        following[np.cumsum(intervals) - 1] = starts  # Wrap to the element's first interval
+        turns = np.concatenate([_turns(keyframes["steps"]) for _, _, keyframes in sampled])
+        a = velocity[last]
+        b = velocity[following]
+        with np.errstate(invalid='ignore'):
+            jumps[last] = np.sqrt(np.maximum(a * a + b * b - 2.0 * a * b * turns, 0.0))
+
+        # The last interval only turns back to the first when repeating
+        wraps = jumps[ends - 1].copy()
+        jumps[ends - 1] = 0.0
+        max_jump = np.maximum.reduceat(jumps, starts)
+        for row, (_, element, keyframes) in enumerate(sampled):
+            if not _repeats(element):
+                continue
+            values = keyframes["values"]
+            if element.get('accumulate') != 'sum' and value_steps([values[-1], values[0]]).any():
+                max_jump[row] = 2.0 * peak[row]
+            else:
+                max_jump[row] = max(max_jump[row], wraps[row])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            smoothness = 1.0 - max_jump / (2.0 * peak)
+        smoothness = np.where(peak == 0, 1.0, smoothness)
+        return np.clip(np.nan_to_num(smoothness, nan=0.0), 0.0, 1.0)
@@ -0,0 +1,122 @@
+"""Declarative element rules for SVG validation.
+
+Each rule names the validator check it belongs to, the element it
+applies to, the attributes every such element must carry and the
+attributes that must parse as numbers. Rules are compiled once into a
+single lxml tag filter so all of them run in one walk over the tree;
+adding an element type adds no parsing passes.
+"""
+from typing import Any, Dict, Iterable, List
+from lxml import etree
+
+ELEMENT_RULES: List[Dict[str, Any]] = [
+    {
+        "check": "circle",
+        "tag": "circle",
+        "required": ["cx", "cy", "r"],
+        "numeric": ["cx", "cy", "r"],
+        "missing_element": "No circle element found",
+        "missing_attributes": "Circle missing required attributes",
+        "invalid_numeric": "Invalid numeric values for circle attributes"
+    },
+    {
+        "check": "animation",
+        "tag": "animate",
+        "required": ["attributeName", "dur", "values"],
+        "numeric": [],
+        "missing_element": "No animation elements found",
+        "missing_attributes": "Animation element missing required attributes",
+        "invalid_numeric": "Invalid numeric values for animation attributes"
+    }
+]
+
+
+class RuleSet:
+    """Element rules compiled for a single pass over a document."""
+
+    def __init__(self, rules: Iterable[Dict[str, Any]]):
+        """Compile rules.
+
+        Args:
+            rules: Rule dictionaries in the ELEMENT_RULES format
+        """
+        self.rules = list(rules)
+        self.by_tag: Dict[str, List[Dict[str, Any]]] = {}
+        for rule in self.rules:
+            self.by_tag.setdefault(rule["tag"], []).append(rule)
+
+        # One namespace-agnostic tag filter matching every ruled element,
+        # applied by lxml during a single document-order walk
+        self._tags = tuple(f"{{*}}{tag}" for tag in self.by_tag)
+
+    def new_state(self) -> Dict[str, Dict[str, Any]]:
+        """Create an empty per-check result map.
+
+        Returns:
+            Dictionary mapping check names to ``found`` and ``error``
+        """
+        return {
+            rule["check"]: {"found": False, "error": rule["missing_element"]}
+            for rule in self.rules
+        }
+
+    def check_element(self, element: etree._Element) -> Dict[str, str]:
+        """Check one element against the rules for its tag.
+
+        Args:
+            element: Element to check
+
+        Returns:
+            Dictionary mapping each applicable check name to its error
+            message, or an empty string if the element passes
+        """
+        errors: Dict[str, str] = {}
+        for rule in self.by_tag.get(etree.QName(element).localname, ()):
+            error = ""
+            values = [element.get(attr) for attr in rule["required"]]
+            if not all(values):
+                error = rule["missing_attributes"]
+            else:
+                try:
+                    for attr in rule["numeric"]:
+                        float(element.get(attr))
+                except (TypeError, ValueError):
+                    error = rule["invalid_numeric"]
+            errors[rule["check"]] = errors.get(rule["check"]) or error
+        return errors
+
+    def apply(self, state: Dict[str, Dict[str, Any]], element: etree._Element) -> None:
+        """Fold one element's rule results into a result map.
+
+        Only the first failure per check is kept, matching the order in
+        which elements appear in the document.
+
+        Args:
+            state: Result map from new_state()
+            element: Element to check
+        """
+        for check, error in self.check_element(element).items():
+            result = state[check]
+            if not result["found"]:
+                result["found"] = True
+                result["error"] = ""
+            if not result["error"]:
+                result["error"] = error
+
+    def evaluate(self, root: etree._Element) -> Dict[str, Dict[str, Any]]:
+        """Run every rule over a parsed document.
+
+        Args:
+            root: Root element of the document
+
+        Returns:
+            Dictionary mapping check names to ``found`` and ``error``
+        """
+        state = self.new_state()
+        for element in root.iter(*self._tags):
+            self.apply(state, element)
+        return state
+
+
+# Compiled once at import time
+DEFAULT_RULES = RuleSet(ELEMENT_RULES)
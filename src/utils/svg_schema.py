@@ -0,0 +1,23 @@
+"""Bundled SVG 1.1 / SMIL XML Schema for strict validation."""
+import os
+from typing import Optional
+from lxml import etree
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schemas', 'svg11-smil.xsd')
+
+_schema: Optional[etree.XMLSchema] = None
+
+
+def load_schema() -> etree.XMLSchema:
+    """Get the compiled schema, compiling it on first use in this process.
+
+    Also used as a process pool initializer so each worker pays the
+    compile cost once, before its first frame.
+
+    Returns:
+        Compiled XML Schema validator
+    """
+    global _schema
+    if _schema is None:
+        _schema = etree.XMLSchema(etree.parse(SCHEMA_PATH))
+    return _schema
@@ -1,6 +1,22 @@
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Union, Iterable, Optional, IO
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
 from lxml import etree
-import re
+import io
+import os
+from .parsed_frame import ParsedFrame
+from .cache import LRUCache, content_hash
+from .svg_rules import DEFAULT_RULES
+from .svg_schema import load_schema
+from . import diagnostics
+
+def _validate_task(args: Tuple[str, bool, bool]) -> Dict[str, Any]:
+    """Process pool entry point for SVGValidator.validate_many."""
+    svg_content, require_animation, strict = args
+    return SVGValidator.validate_all(
+        svg_content, require_animation=require_animation, use_cache=False, strict=strict
+    )
+
 
 class SVGValidator:
     """Utility class for validating SVG content and structure."""
@@ -8,189 +24,336 @@ class SVGValidator:
     SVG_NS = "http://www.w3.org/2000/svg"
     NSMAP = {"svg": SVG_NS}
     
-    @staticmethod
-    def _find_element(root: etree._Element, tag: str) -> etree._Element:
-        """Helper method to find an element with or without namespace.
-        
-        Args:
-            root: Root element to search in
-            tag: Tag name to find
-            
-        Returns:
-            Found element or None
-        """
-        element = root.find(f'.//{tag}')
-        if element is None:
-            element = root.find(f'.//{{{SVGValidator.SVG_NS}}}{tag}')
-        return element
+    # validate_all results keyed by content hash; use
+    # cache.configure(maxsize=..., enabled=False) to resize or opt out
+    cache = LRUCache(maxsize=1024)
     
     @staticmethod
-    def _find_elements(root: etree._Element, tag: str) -> List[etree._Element]:
-        """Helper method to find all elements with or without namespace.
-        
-        Args:
-            root: Root element to search in
-            tag: Tag name to find
-            
-        Returns:
-            List of found elements
-        """
-        elements = root.findall(f'.//{tag}')
-        elements.extend(root.findall(f'.//{{{SVGValidator.SVG_NS}}}{tag}'))
-        return elements
+    def _rule_results(frame: ParsedFrame) -> Dict[str, Dict[str, Any]]:
+        """Run the element rules over a parsed frame once and memoize them."""
+        if frame.rule_results is None:
+            frame.rule_results = DEFAULT_RULES.evaluate(frame.root)
+        return frame.rule_results
     
     @staticmethod
-    def validate_syntax(svg_content):
+    @diagnostics.traced("svg_validator", "syntax", lambda result: result)
+    def validate_syntax(svg_content: Union[str, ParsedFrame]) -> Tuple[bool, str]:
         """Validate basic SVG syntax."""
-        try:
-            # Remove XML declaration and normalize whitespace
-            content = re.sub(r'<\?xml[^>]*\?>', '', svg_content)
-            content = re.sub(r'\s+', ' ', content).strip()
-            
-            # Check for required SVG elements and proper XML structure
-            if not re.search(r'<(?:svg:|)svg[^>]*>', content):
-                return False, "Invalid SVG syntax: Missing SVG root element"
-            
-            # Count tags more accurately
-            open_tags = len(re.findall(r'<([^/][^>]*?)(?<!/)>', content))  # Opening tags that aren't self-closing
-            close_tags = len(re.findall(r'</[^>]+>', content))  # Closing tags
-            self_closing = len(re.findall(r'<[^>]+/>', content))  # Self-closing tags
-            
-            # Debug output
-            print(f"\nTag counting:")
-            print(f"Open tags: {open_tags}")
-            print(f"Close tags: {close_tags}")
-            print(f"Self-closing tags: {self_closing}")
-            
-            # Check for basic XML structure
-            if not re.search(r'<svg[^>]*>.*</svg>', content, re.DOTALL):
-                return False, "Invalid SVG syntax: Missing closing SVG tag"
-            
-            # Check for common SVG elements
-            if not re.search(r'<circle[^>]*>', content):
-                return False, "Invalid SVG syntax: No circle elements found"
-            
-            return True, ""
-        except Exception as e:
-            return False, f"Invalid SVG syntax: {str(e)}"
+        frame = ParsedFrame.from_source(svg_content)
+        if not frame.is_parsed:
+            return False, f"Invalid SVG syntax: {frame.error}"
+        
+        # Check for the SVG root element
+        if frame.root_tag != 'svg':
+            return False, "Invalid SVG syntax: Missing SVG root element"
+        
+        # Check for common SVG elements
+        if not SVGValidator._rule_results(frame)["circle"]["found"]:
+            return False, "Invalid SVG syntax: No circle elements found"
+        
+        return True, ""
 
     @staticmethod
-    def validate_structure(svg_content):
+    @diagnostics.traced("svg_validator", "structure", lambda result: result)
+    def validate_structure(svg_content: Union[str, ParsedFrame]) -> Tuple[bool, str]:
         """Validate SVG structure."""
-        try:
-            # Remove XML declaration and normalize whitespace
-            content = re.sub(r'<\?xml[^>]*\?>', '', svg_content)
-            content = re.sub(r'\s+', ' ', content).strip()
-            
-            # Check root element
-            if not re.search(r'^[^<]*<(?:svg:|)svg[^>]*>', content):
-                return False, "Root element must be 'svg'"
-            
-            # Check for required attributes
-            if not re.search(r'<(?:svg:|)svg[^>]+width="[^"]+"[^>]+height="[^"]+"', content):
-                return False, "Missing required attributes"
-            return True, ""
-        except Exception as e:
-            return False, f"Invalid SVG structure: {str(e)}"
+        frame = ParsedFrame.from_source(svg_content)
+        if not frame.is_parsed:
+            return False, f"Invalid SVG structure: {frame.error}"
+        
+        # Check root element
+        if frame.root_tag != 'svg':
+            return False, "Root element must be 'svg'"
+        
+        # Check for required attributes
+        if not frame.root.get('width') or not frame.root.get('height'):
+            return False, "Missing required attributes"
+        return True, ""
 
     @staticmethod
-    def validate_circle(svg_content):
-        """Validate circle element."""
-        try:
-            # Remove XML declaration and normalize whitespace
-            content = re.sub(r'<\?xml[^>]*\?>', '', svg_content)
-            content = re.sub(r'\s+', ' ', content).strip()
-            
-            # Check for circle element
-            if not re.search(r'<(?:svg:|)circle[^>]+/?>', content):
-                return False, "No circle element found"
-            
-            # Check for required circle attributes
-            circle_match = re.search(r'<(?:svg:|)circle[^>]+>', content)
-            if not circle_match:
-                return False, "Circle missing required attributes"
-            
-            circle = circle_match.group(0)
-            
-            # Extract attribute values
-            cx_match = re.search(r'cx="([^"]+)"', circle)
-            cy_match = re.search(r'cy="([^"]+)"', circle)
-            r_match = re.search(r'r="([^"]+)"', circle)
-            
-            # Validate numeric values
-            if cx_match and cy_match and r_match:
-                try:
-                    float(cx_match.group(1))
-                    float(cy_match.group(1))
-                    float(r_match.group(1))
-                except ValueError:
-                    return False, "Invalid numeric values for circle attributes"
-            else:
-                return False, "Circle missing required attributes"
-                
-            return True, ""
-        except Exception as e:
-            return False, f"Invalid circle element: {str(e)}"
+    @diagnostics.traced("svg_validator", "circle", lambda result: result)
+    def validate_circle(svg_content: Union[str, ParsedFrame]) -> Tuple[bool, str]:
+        """Validate circle elements."""
+        frame = ParsedFrame.from_source(svg_content)
+        if not frame.is_parsed:
+            return False, f"Invalid circle element: {frame.error}"
+        
+        # Required elements and attributes come from the rule table
+        error = SVGValidator._rule_results(frame)["circle"]["error"]
+        return not error, error
 
     @staticmethod
-    def validate_animation(svg_content):
-        """Validate animation element."""
-        try:
-            # Remove XML declaration and normalize whitespace
-            content = re.sub(r'<\?xml[^>]*\?>', '', svg_content)
-            content = re.sub(r'\s+', ' ', content).strip()
-            
-            # Check for animation element
-            if not re.search(r'<(?:svg:|)animate[^>]+/?>', content):
-                return False, "No animation elements found"
-            
-            # Check for required animation attributes
-            if not re.search(r'<(?:svg:|)animate[^>]+attributeName="[^"]+"[^>]+dur="[^"]+"[^>]+values="[^"]+"[^>]+repeatCount="[^"]+"', content):
-                return False, "Animation element missing required attributes"
+    @diagnostics.traced("svg_validator", "animation", lambda result: result)
+    def validate_animation(svg_content: Union[str, ParsedFrame]) -> Tuple[bool, str]:
+        """Validate animation elements."""
+        frame = ParsedFrame.from_source(svg_content)
+        if not frame.is_parsed:
+            return False, f"Invalid animation element: {frame.error}"
+        
+        # Required elements and attributes come from the rule table
+        error = SVGValidator._rule_results(frame)["animation"]["error"]
+        return not error, error
+
+    @staticmethod
+    @diagnostics.traced("svg_validator", "schema", lambda result: result)
+    def validate_schema(svg_content: Union[str, ParsedFrame]) -> Tuple[bool, str]:
+        """Validate against the bundled SVG 1.1 / SMIL schema.
+        
+        The schema is compiled once per process and reused.
+        """
+        frame = ParsedFrame.from_source(svg_content)
+        if not frame.is_parsed:
+            return False, f"Schema validation failed: {frame.error}"
+        
+        schema = load_schema()
+        if schema.validate(frame.root):
             return True, ""
-        except Exception as e:
-            return False, f"Invalid animation element: {str(e)}"
+        error = schema.error_log.last_error
+        return False, f"Schema validation failed: {error.message} (line {error.line})"
 
     @staticmethod
-    def validate_all(svg_content, require_animation=False):
+    @diagnostics.traced("svg_validator", "all", lambda result: (result["is_valid"], "; ".join(result["errors"])))
+    def validate_all(
+        svg_content: Union[str, ParsedFrame],
+        require_animation: bool = False,
+        use_cache: bool = True,
+        strict: bool = False
+    ) -> Dict[str, Any]:
         """Perform comprehensive validation of SVG content.
         
+        The document is parsed once, through the shared ParsedFrame
+        cache, and every check runs against the same tree. Per-check results are reported through the
+        diagnostics collector when one is attached.
+        
+        Results are cached by a hash of the markup (up to line endings),
+        so repeated frames are validated once.
+        
         Args:
-            svg_content: String containing SVG markup
+            svg_content: String containing SVG markup, or an already parsed frame
             require_animation: Whether to require animation elements
+            use_cache: Whether to use SVGValidator.cache for this call
+            strict: Whether to also validate against the bundled SVG 1.1 /
+                SMIL schema
             
         Returns:
             Dictionary containing validation results
         """
+        cache = SVGValidator.cache
+        if not (use_cache and cache.enabled):
+            return SVGValidator._run_checks(svg_content, require_animation, strict)
+        
+        source = svg_content.source if isinstance(svg_content, ParsedFrame) else svg_content
+        digest = content_hash(source)
+        key = (digest, require_animation, strict)
+        results = cache.get(key)
+        if results is None:
+            if not isinstance(svg_content, ParsedFrame):
+                # Reuse the frame the feedback parser or critic parsed
+                svg_content = ParsedFrame.shared(svg_content, digest)
+            results = SVGValidator._run_checks(svg_content, require_animation, strict)
+            cache.put(key, results)
+        
+        return SVGValidator._copy_results(results)
+
+    @staticmethod
+    def _copy_results(results: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy cached results so callers cannot mutate the cache."""
+        return {
+            "is_valid": results["is_valid"],
+            "errors": list(results["errors"]),
+            "warnings": list(results["warnings"])
+        }
+
+    @staticmethod
+    def _run_checks(
+        svg_content: Union[str, ParsedFrame],
+        require_animation: bool,
+        strict: bool = False
+    ) -> Dict[str, Any]:
+        """Run every check against a single parse of the document."""
         results = {
             "is_valid": True,
             "errors": [],
             "warnings": []
         }
         
-        # Print the SVG content for debugging
-        print("\nValidating SVG content:")
-        print(svg_content)
+        frame = ParsedFrame.from_source(svg_content)
         
         # Collect all validation results
-        validations = [
-            ("syntax", SVGValidator.validate_syntax),
-            ("structure", SVGValidator.validate_structure),
-            ("circle", SVGValidator.validate_circle)
+        checks = [
+            ("syntax", SVGValidator.validate_syntax(frame)),
+            ("structure", SVGValidator.validate_structure(frame)),
+            ("circle", SVGValidator.validate_circle(frame))
         ]
         
         # Always check animation if present
-        animation_valid, animation_message = SVGValidator.validate_animation(svg_content)
-        if require_animation or not animation_message.startswith("No animation"):
-            validations.append(("animation", SVGValidator.validate_animation))
-        
-        for name, validate in validations:
-            is_valid, message = validate(svg_content)
-            print(f"\n{name} validation:")
-            print(f"Valid: {is_valid}")
-            print(f"Message: {message}")
+        animation_result = SVGValidator.validate_animation(frame)
+        if require_animation or not animation_result[1].startswith("No animation"):
+            checks.append(("animation", animation_result))
+        
+        if strict:
+            checks.append(("schema", SVGValidator.validate_schema(frame)))
+        
+        for name, (is_valid, message) in checks:
             if not is_valid:
                 results["is_valid"] = False
                 results["errors"].append(message)
         
-        return results 
\ No newline at end of file
+        return results
+
+    @staticmethod
+    @diagnostics.traced("svg_validator", "stream", lambda result: (result["is_valid"], "; ".join(result["errors"])))
+    def validate_stream(
+        source: Union[str, bytes, IO[bytes]],
+        require_animation: bool = False
+    ) -> Dict[str, Any]:
+        """Validate an SVG document in a single streaming pass.
+        
+        Uses lxml iterparse and clears each element once it has been
+        checked, so memory stays bounded for documents with very many
+        elements. Reports the same errors as validate_all.
+        
+        Args:
+            source: SVG markup as str or bytes, or a binary file object
+            require_animation: Whether to require animation elements
+            
+        Returns:
+            Dictionary containing validation results
+        """
+        if isinstance(source, str):
+            source = source.strip().encode('utf-8')
+        if isinstance(source, bytes):
+            if not source.strip():
+                # Match the parse error validate_all reports for empty input
+                return SVGValidator._run_checks(source.decode('utf-8'), require_animation)
+            source = io.BytesIO(source.strip())
+        
+        root_tag = None
+        has_size = False
+        rule_results = DEFAULT_RULES.new_state()
+        try:
+            for event, element in etree.iterparse(
+                source, events=('start', 'end'), resolve_entities=False, no_network=True, huge_tree=True
+            ):
+                if event == 'end':
+                    # Free checked elements and their already processed siblings
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+                    continue
+                if root_tag is None:
+                    root_tag = etree.QName(element).localname
+                    has_size = bool(element.get('width')) and bool(element.get('height'))
+                DEFAULT_RULES.apply(rule_results, element)
+        except etree.XMLSyntaxError as e:
+            error = str(e) or "Malformed XML"
+            return {
+                "is_valid": False,
+                "errors": [
+                    f"Invalid SVG syntax: {error}",
+                    f"Invalid SVG structure: {error}",
+                    f"Invalid circle element: {error}",
+                    f"Invalid animation element: {error}"
+                ],
+                "warnings": []
+            }
+        
+        circle = rule_results["circle"]
+        animation = rule_results["animation"]
+        errors = []
+        if root_tag != 'svg':
+            errors.append("Invalid SVG syntax: Missing SVG root element")
+        elif not circle["found"]:
+            errors.append("Invalid SVG syntax: No circle elements found")
+        if root_tag != 'svg':
+            errors.append("Root element must be 'svg'")
+        elif not has_size:
+            errors.append("Missing required attributes")
+        if circle["error"]:
+            errors.append(circle["error"])
+        if animation["error"] and (require_animation or animation["found"]):
+            errors.append(animation["error"])
+        
+        return {
+            "is_valid": not errors,
+            "errors": errors,
+            "warnings": []
+        }
+
+    @staticmethod
+    def validate_many(
+        frames: Iterable[str],
+        workers: Optional[int] = None,
+        require_animation: bool = False,
+        chunksize: Optional[int] = None,
+        strict: bool = False
+    ) -> Dict[str, Any]:
+        """Validate a batch of SVG frames across a process pool.
+        
+        Cached and duplicate frames are resolved in this process, so
+        only distinct uncached frames are sent to workers. Diagnostics
+        recorded inside worker processes are not collected; use
+        workers=1 to validate in-process.
+        
+        Args:
+            frames: List or iterator of SVG markup strings
+            workers: Number of worker processes (default: CPU count);
+                1 or less validates serially in this process
+            require_animation: Whether to require animation elements
+            chunksize: Frames sent to a worker per task (default: derived
+                from the batch size)
+            strict: Whether to also validate against the bundled schema;
+                each worker compiles it once on start-up
+            
+        Returns:
+            Dictionary containing:
+            - results: validate_all results, in input order
+            - summary: total, valid and invalid counts, indices of
+              invalid frames and a count of each error message
+        """
+        frames = list(frames)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        # Serve cached and duplicate frames locally; validate each
+        # distinct uncached frame once
+        cache = SVGValidator.cache
+        keys = [(content_hash(frame), require_animation, strict) for frame in frames]
+        unique = {}
+        sources = {}
+        for key, frame in zip(keys, frames):
+            if key not in unique:
+                unique[key] = cache.get(key)
+                sources[key] = frame
+        pending = [key for key, result in unique.items() if result is None]
+        tasks = [(sources[key], require_animation, strict) for key in pending]
+        
+        workers = min(workers, len(tasks))
+        if workers <= 1:
+            validated = [_validate_task(task) for task in tasks]
+        else:
+            if chunksize is None:
+                chunksize = max(1, len(tasks) // (workers * 4))
+            initializer = load_schema if strict else None
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as executor:
+                validated = list(executor.map(_validate_task, tasks, chunksize=chunksize))
+        
+        for key, result in zip(pending, validated):
+            unique[key] = result
+            cache.put(key, result)
+        
+        results = [SVGValidator._copy_results(unique[key]) for key in keys]
+        
+        invalid_indices = [i for i, result in enumerate(results) if not result["is_valid"]]
+        error_counts = Counter(error for result in results for error in result["errors"])
+        
+        return {
+            "results": results,
+            "summary": {
+                "total": len(results),
+                "valid": len(results) - len(invalid_indices),
+                "invalid": len(invalid_indices),
+                "invalid_indices": invalid_indices,
+                "error_counts": dict(error_counts)
+            }
+        }
@@ -0,0 +1,88 @@
+import numpy as np
+from src.utils.cache import FeedbackCache, RasterCache, content_hash
+
+def test_raster_cache_memory_budget():
+    """Test LRU eviction by total array size."""
+    cache = RasterCache(max_bytes=250)
+    for i in range(3):
+        cache.put(f"k{i}", np.full((10, 10), i, dtype=np.uint8))
+    assert "k0" not in cache and len(cache) == 2
+    assert cache.get("k1") is not None
+    cache.put("k3", np.zeros(100, dtype=np.uint8))
+    assert "k2" not in cache  # k1 was used more recently
+    assert cache.stats()["bytes"] == 200
+    
+    # Arrays over budget are not kept, and cached arrays are read-only
+    cache.put("big", np.zeros(1000, dtype=np.uint8))
+    assert cache.get("big") is None
+    assert not cache.get("k1").flags.writeable
+    
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert abs(stats["hit_rate"] - 2 / 3) < 1e-9
+
+def test_raster_cache_disk_tier(tmp_path):
+    """Test that renders survive in the disk tier and are promoted."""
+    key = RasterCache.make_key('<svg><circle r="1"/></svg>', (64, 48))
+    assert key == RasterCache.make_key('<svg><circle r="1"/></svg>', (64, 48))
+    assert key != RasterCache.make_key('<svg><circle r="1"/></svg>')
+    
+    pixels = np.arange(64 * 48 * 4, dtype=np.uint32).astype(np.uint8).reshape(48, 64, 4)
+    cache = RasterCache(directory=str(tmp_path))
+    cache.put(key, pixels.copy())
+    
+    # A new process-level cache finds the file
+    cache = RasterCache(directory=str(tmp_path))
+    assert key in cache and len(cache) == 0
+    np.testing.assert_array_equal(cache.get(key), pixels)
+    assert cache.stats()["disk_hits"] == 1
+    cache.get(key)
+    assert cache.stats()["memory_hits"] == 1
+    
+    # Disk budget evicts least recently used files
+    cache.put("other", np.zeros(10000, dtype=np.uint8))
+    cache.configure(max_disk_bytes=cache.stats()["disk_bytes"] - 1)
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+    assert "other" in cache
+    cache.clear(disk=True)
+    assert not list(tmp_path.glob("*.npy"))
+
+def test_feedback_cache_persistence_and_eviction(tmp_path, monkeypatch):
+    """Test feedback persisted on disk, expiring and evicted by entry budget."""
+    import src.utils.cache as cache_module
+    path = str(tmp_path / "feedback.sqlite3")
+    key = FeedbackCache.make_key("model-a", "system", "prompt")
+    assert key != FeedbackCache.make_key("model-b", "system", "prompt")
+    assert key != FeedbackCache.make_key("model-a", "system", "prompt 2")
+    
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = FeedbackCache(path, max_entries=2)
+    cache.put(key, {"feedback": ["ok"], "suggestions": []})
+    assert FeedbackCache(path).get(key) == {"feedback": ["ok"], "suggestions": []}
+    
+    # Least recently used entries go first once over budget
+    for name in ("k1", "k2"):
+        now[0] += 1
+        cache.put(name, name)
+    assert key not in cache and len(cache) == 2
+    now[0] += 1
+    assert cache.get("k1") == "k1"
+    cache.put("k3", "k3")
+    assert "k2" not in cache and "k1" in cache
+    
+    # Entries expire after the TTL
+    cache.configure(ttl=10)
+    now[0] += 11
+    assert cache.get("k3") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["expired"] == 1
+    assert stats["evicted"] == 2 and stats["hit_rate"] == 0.5
+
+def test_content_hash_keeps_significant_whitespace():
+    """Test that documents differing in text or token whitespace get different keys."""
+    spaced = '<svg><text><tspan>a</tspan> <tspan>b</tspan></text></svg>'
+    joined = '<svg><text><tspan>a</tspan><tspan>b</tspan></text></svg>'
+    assert content_hash(spaced) != content_hash(joined)
+    assert content_hash('<svg><text>a  b</text></svg>') != content_hash('<svg><text>a b</text></svg>')
+    assert content_hash('<svg>\r\n<g/>\r\n</svg>') == content_hash('<svg>\n<g/>\n</svg>')
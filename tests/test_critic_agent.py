@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from src.agents.critic import CriticAgent
 from src.agents.designer import DesignerAgent
 from src.utils.feedback_parser import FeedbackParser
@@ -113,4 +114,226 @@ class TestCriticAgent:
         # Verify that both issues affect the score differently
         assert base_score > timing_analysis["score"], "Timing issues should reduce score"
         assert base_score > alignment_analysis["score"], "Alignment issues should reduce score"
-        assert timing_analysis["score"] != alignment_analysis["score"], "Different issues should have different impacts" 
\ No newline at end of file
+        assert timing_analysis["score"] != alignment_analysis["score"], "Different issues should have different impacts" 
+    
+    def test_rasterize_cache(self, critic, monkeypatch):
+        """Test that identical documents are rendered once."""
+        from src.utils import raster
+        
+        renders = []
+        def render_svg(svg_content, size=None, dpi=96, scale=1.0):
+            renders.append(scale)
+            return np.zeros((round(3 * scale), round(4 * scale), 4), dtype=np.uint8)
+        monkeypatch.setattr(raster, 'render_svg', render_svg)
+        
+        critic.raster_cache.clear()
+        svg = '<svg width="4" height="3">\n<circle cx="2" cy="1" r="1"/>\n</svg>'
+        first = critic.rasterize(svg)
+        second = critic.rasterize(svg.replace('\n', '\r\n'))
+        assert len(renders) == 1
+        assert second is first
+        assert first.shape == (3, 4, 4)
+        assert critic.raster_cache.stats()["hit_rate"] == 0.5
+        
+        # Reduced analysis scale renders separately from the native size
+        critic.analysis_scale = 0.5
+        assert critic.rasterize(svg).shape == (2, 2, 4)
+        assert renders == [1.0, 0.5]
+    
+    def test_critique_many_concurrently(self, critic, monkeypatch):
+        """Test concurrent LLM critiques bounded by the concurrency limit."""
+        import json
+        import src.agents.critic as critic_module
+        from src.utils.llm_backend import StubBackend
+        
+        def respond(request):
+            prompt = request["messages"][1]["content"]
+            return json.dumps({"positive_feedback": [prompt[:7]], "suggestions": ["s"]})
+        
+        backend = StubBackend(latency=0.01, responses=respond)
+        monkeypatch.setattr(critic, 'rate_limiter', critic_module.RateLimiter(0, 0))
+        monkeypatch.setattr(critic, 'feedback_cache', critic_module.FeedbackCache())
+        critic.backend = backend
+        critic.use_llm = True
+        critic.llm_concurrency = 3
+        critic.llm_batch_size = 1
+        
+        analyses = [({"brightness": i / 10}, []) for i in range(10)]
+        results = critic.critique_many(analyses)
+        assert len(results) == 10 and backend.requests == 10
+        assert backend.stats()["peak_in_flight"] == 3
+        assert results[0] == {"feedback": ["Analyze"], "suggestions": ["s"]}
+        
+        # Repeated prompts are answered from the feedback cache
+        assert critic.critique_many(analyses[:4]) == results[:4]
+        assert backend.requests == 10
+        assert critic.feedback_cache.stats()["hits"] == 4
+        
+        # The limit holds across concurrent calls on the same critic
+        import asyncio
+        backend.peak_in_flight = 0
+        more = [({"contrast": i / 10}, []) for i in range(1, 7)]
+        
+        async def overlapping():
+            async with critic:
+                return await asyncio.gather(critic.critique_many_async(more[:3]), critic.critique_many_async(more[3:]))
+        asyncio.run(overlapping())
+        assert backend.requests == 16
+        assert backend.stats()["peak_in_flight"] == 3
+    
+    def test_critique_many_batched(self, critic, monkeypatch):
+        """Test batched critiques split per candidate, with per-item fallback."""
+        import json
+        import re
+        import src.agents.critic as critic_module
+        from src.utils.llm_backend import StubBackend
+        
+        prompts = []
+        
+        def respond(request):
+            prompt = request["messages"][1]["content"]
+            prompts.append(prompt)
+            ids = [int(i) for i in re.findall(r"Candidate (\d+):", prompt)]
+            if not ids:
+                body = {"positive_feedback": ["single"], "suggestions": []}
+            elif "Brightness: 0.90" in prompt:
+                body = {"candidates": [{"id": 0}]}  # Incomplete batch response
+            elif "Brightness: 0.50" in prompt:
+                # One entry per candidate, but candidate 0 twice and 3 never
+                body = {"candidates": [
+                    {"id": i, "positive_feedback": [f"duplicate {i}"], "suggestions": ["s"]}
+                    for i in (0, 0, 1, 2)
+                ]}
+            else:
+                body = {"candidates": [
+                    {"id": i, "positive_feedback": [f"batched {i}"], "suggestions": ["s"]}
+                    for i in reversed(ids)
+                ]}
+            return json.dumps(body)
+        
+        monkeypatch.setattr(critic, 'rate_limiter', critic_module.RateLimiter(0, 0))
+        monkeypatch.setattr(critic, 'feedback_cache', critic_module.FeedbackCache())
+        critic.backend = StubBackend(responses=respond)
+        critic.use_llm = True
+        critic.llm_batch_size = 4
+        
+        analyses = [({"brightness": i / 10}, []) for i in range(10)]
+        results = critic.critique_many(analyses)
+        
+        # Batches of 4, 4 and 2; the second batch's response repeats an id
+        # and the last one is incomplete, so both fall back to one request
+        # per candidate
+        assert len(prompts) == 3 + 4 + 2
+        singles = sum(len(critic.build_feedback_prompt(*analysis)) for analysis in analyses[:4])
+        assert len(prompts[0]) < singles / 2
+        assert results[:4] == [{"feedback": [f"batched {i}"], "suggestions": ["s"]} for i in range(4)]
+        assert results[4:] == [{"feedback": ["single"], "suggestions": []}] * 6
+        
+        # Split results are cached per candidate for later single critiques
+        assert critic.critique_many(analyses[:3]) == results[:3]
+        assert critic.critique_many(analyses[4:7]) == results[4:7]
+        assert len(prompts) == 9
+    
+    def test_analyze_frame_visuals(self, critic, monkeypatch):
+        """Test sampled per-frame visual metrics aggregated over time."""
+        from src.utils import raster
+        
+        def render_svg(svg_content, size=None, dpi=96, scale=1.0):
+            level = int(svg_content.split('data-level="')[1].split('"')[0])
+            return np.full((4, 4, 4), level, dtype=np.uint8)
+        monkeypatch.setattr(raster, 'render_svg', render_svg)
+        critic.raster_cache.clear()
+        
+        frames = [
+            f'<svg data-level="{level}"><circle cx="50" cy="50" r="10"/></svg>'
+            for level in (20, 200, 20, 200, 200)
+        ]
+        timeline = critic.analyze_frame_visuals(frames, step=3, workers=1)
+        assert timeline["indices"] == [0, 3, 4]
+        assert timeline["metrics"]["brightness"] == pytest.approx([20 / 255, 200 / 255, 200 / 255])
+        assert timeline["summary"]["brightness"]["max_change"] == pytest.approx(180 / 255)
+        assert timeline["issues"]["Image is too dark"] == [0]
+        assert not timeline["errors"]
+        
+        assert critic.analyze_frame_visuals(frames, step=1, workers=1)["indices"] == [0, 1, 2, 3, 4]
+    
+    def test_heavy_imports_deferred(self):
+        """Test that importing and constructing the critic skips heavy modules."""
+        import os
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys\n"
+            "from src.agents.critic import CriticAgent\n"
+            "CriticAgent()\n"
+            "print(sorted(m for m in ('openai', 'cairosvg', 'cairocffi', 'PIL', 'dotenv', 'http.server') if m in sys.modules))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, OPENAI_API_KEY="sk-test", LLM_BACKEND="")
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+    
+    def test_render_pool_shut_down_at_exit(self):
+        """Test that a started render pool is stopped when the interpreter exits."""
+        import os
+        import subprocess
+        import sys
+        
+        # Exit handlers run last-registered first, so this one runs after the critic's
+        code = (
+            "import atexit\n"
+            "atexit.register(lambda: print(CriticAgent._render_pool is None))\n"
+            "from src.agents.critic import CriticAgent\n"
+            "CriticAgent.render_pool(1).submit(abs, -1).result()\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "True"
+    
+    def test_analyze_animation_renders_sampled_frames_once(self, critic, designer, monkeypatch):
+        """Test that timeline scoring does not render the last frame twice."""
+        import src.agents.critic as critic_module
+        from src.utils import raster
+        
+        renders = []
+        
+        def render_svg(svg_content, size=None, dpi=96, scale=1.0):
+            renders.append(svg_content)
+            return np.full((4, 4, 4), 128, dtype=np.uint8)
+        monkeypatch.setattr(raster, 'render_svg', render_svg)
+        monkeypatch.setattr(critic, 'raster_cache', critic_module.RasterCache(enabled=False))
+        critic.visual_workers = 1
+        critic.visual_frame_step = 2
+        
+        frames = designer.create_animation(width=100, height=100, circle_radius=40, duration=1.0, steps=5)
+        analysis = critic.analyze_animation(frames)
+        
+        sampled = sorted(set(range(0, len(frames), 2)) | {len(frames) - 1})
+        assert analysis["visual_timeline"]["indices"] == sampled
+        assert sorted(renders) == sorted(frames[i] for i in sampled)
+        assert analysis["visual_metrics"]["brightness"] == pytest.approx(128 / 255)
+    
+    def test_analyze_animation_parses_first_frame_only(self, critic, monkeypatch):
+        """Test that frames after the first are validated as deltas, and re-scoring hits the cache."""
+        from src.utils.parsed_frame import ParsedFrame
+        from src.utils.svg_validator import SVGValidator
+        
+        monkeypatch.setattr(critic, 'analyze_visual_appearance', lambda svg: {"score": 1.0, "feedback": [], "suggestions": [], "metrics": {}})
+        frames = [
+            f'<svg width="100" height="100"><circle cx="{cx}" cy="50" r="9"><animate attributeName="r" dur="1s" values="0;9"/></circle></svg>'
+            for cx in (41, 42, 43, 44)
+        ]
+        
+        misses = ParsedFrame.cache.misses
+        analysis = critic.analyze_animation(frames)
+        assert analysis["is_valid"]
+        assert ParsedFrame.cache.misses - misses == 1
+        
+        # Every frame is now in the validation cache
+        hits = SVGValidator.cache.hits
+        assert critic.analyze_animation(frames)["score"] == analysis["score"]
+        assert SVGValidator.cache.hits - hits == len(frames)
+
@@ -0,0 +1,90 @@
+from src.agents.designer import DesignerAgent
+from src.utils.cache import content_hash
+from src.utils.delta_validator import DeltaValidator
+from src.utils.svg_validator import SVGValidator
+from src.utils.parsed_frame import ParsedFrame
+
+def test_animation_frames_validated_incrementally():
+    """Test that frames differing only in attribute values are patched."""
+    frames = DesignerAgent().create_animation(
+        width=100,
+        height=100,
+        circle_radius=40,
+        duration=1.0,
+        steps=10
+    )
+    validator = DeltaValidator(require_animation=True, use_cache=False)
+    for frame in frames:
+        expected = SVGValidator.validate_all(frame, require_animation=True, use_cache=False)
+        assert validator.validate(frame) == expected
+    
+    stats = validator.stats()
+    assert stats["full_validations"] == 1
+    assert stats["incremental_validations"] == 9
+    assert stats["elements_rechecked"] == 9
+
+def test_delta_matches_full_validation():
+    """Test incremental results against full validation for each change."""
+    template = (
+        '<svg width="{0}" height="100">\n'
+        '<circle cx="{1}" cy="50" r="{2}">\n'
+        '<animate attributeName="r" dur="{3}" values="0;40"/></circle>\n'
+        '<circle cx="1" cy="2" r="{4}"/></svg>'
+    )
+    sequence = [
+        ("100", "50", "40", "1s", "3"),
+        ("100", "50", "41", "1s", "3"),  # Single attribute
+        ("100", "x", "41", "1s", "-3"),  # Invalid numeric value, separate lines
+        ("100", "50", "", "1s", "3"),  # Two values on one line: full validation
+        ("", "50", "40", "", "3"),  # Root and animation attributes
+        ("100", "50", "40", "1s", "3"),  # Back to valid
+    ]
+    validator = DeltaValidator(require_animation=True, use_cache=False)
+    for values in sequence:
+        frame = template.format(*values)
+        expected = SVGValidator.validate_all(frame, require_animation=True, use_cache=False)
+        assert validator.validate(frame) == expected
+    assert validator.stats()["full_validations"] == 2
+    assert validator.stats()["incremental_validations"] == 4
+    
+    # Structural changes fall back to full validation
+    frame = template.format(*sequence[0]).replace('<circle cx="1"', '<rect x="1"').replace('r="3"/>', '/>')
+    expected = SVGValidator.validate_all(frame, require_animation=True, use_cache=False)
+    assert validator.validate(frame) == expected
+    assert validator.stats()["full_validations"] == 3
+    
+    # Malformed frames are validated in full
+    assert validator.validate('<svg width="100"') == SVGValidator.validate_all(
+        '<svg width="100"', require_animation=True, use_cache=False
+    )
+
+def test_shared_frames_not_patched():
+    """Test that incremental patches never modify a shared parsed frame."""
+    template = '<svg width="100" height="100"><circle cx="50" cy="50" r="{0}"><animate attributeName="r" dur="1s" values="0;40"/></circle></svg>'
+    first = ParsedFrame.shared(template.format(10))
+    validator = DeltaValidator(require_animation=True, use_cache=False)
+    validator.validate(first)
+    validator.validate(template.format("x"))
+    assert validator.stats()["incremental_validations"] == 1
+    assert first.root[0].get("r") == "10"
+    assert SVGValidator.validate_all(first, require_animation=True, use_cache=False)["is_valid"]
+
+def test_cached_frames_skip_delta_work():
+    """Test that cached frames are answered without delta work and fill the cache."""
+    template = '<svg width="100" height="100"><circle cx="{0}" cy="50" r="7"><animate attributeName="cx" dur="2s" values="0;9"/></circle></svg>'
+    frames = [template.format(cx) for cx in (11, 12, 13)]
+    SVGValidator.validate_all(frames[1], require_animation=True)
+    validator = DeltaValidator(require_animation=True)
+    for frame in frames:
+        expected = SVGValidator.validate_all(frame, require_animation=True, use_cache=False)
+        assert validator.validate(frame) == expected
+        assert (validator.frame is None) == (frame == frames[1])
+    
+    # The last frame is compared against the first frame's tree
+    assert validator.stats() == {
+        "full_validations": 1,
+        "incremental_validations": 1,
+        "elements_rechecked": 1,
+        "cache_hits": 1
+    }
+    assert SVGValidator.cache.get((content_hash(frames[2]), True, False)) is not None
@@ -0,0 +1,65 @@
+import pytest
+from src.utils import diagnostics
+from src.utils.svg_validator import SVGValidator
+from src.utils.feedback_parser import FeedbackParser
+
+@pytest.fixture(autouse=True)
+def clear_validation_cache():
+    """Cached validations skip the per-check records."""
+    SVGValidator.cache.clear()
+
+VALID_SVG = '''
+<svg width="100" height="100">
+    <circle cx="50" cy="50" r="40">
+        <animate attributeName="r" dur="1s" values="0;20;40"/>
+    </circle>
+</svg>
+'''
+
+def test_diagnostics_off_by_default(capsys):
+    """Test that validation is silent and unrecorded without a collector."""
+    assert diagnostics.get_collector() is None
+    SVGValidator.validate_all(VALID_SVG)
+    assert capsys.readouterr().out == ""
+
+def test_collect_validation_records():
+    """Test structured records from the validator and feedback parser."""
+    with diagnostics.collecting() as collector:
+        SVGValidator.validate_all('<svg><circle cx="50" cy="50" r="40"/></svg>')
+        FeedbackParser.generate_feedback([VALID_SVG])
+    assert diagnostics.get_collector() is None
+    
+    structure = collector.get_records(component="svg_validator", check="structure")
+    assert len(structure) == 1
+    assert not structure[0]["passed"]
+    assert structure[0]["message"] == "Missing required attributes"
+    assert structure[0]["level"] == "WARNING"
+    assert structure[0]["duration"] >= 0
+    
+    assert collector.get_records(component="feedback_parser", check="animation_timing")[0]["passed"]
+    summary = collector.summary()
+    assert summary["svg_validator.all"]["count"] == 1
+    assert summary["svg_validator.all"]["failures"] == 1
+
+def test_collector_level_filters_passing_checks():
+    """Test that a WARNING collector only keeps failures."""
+    collector = diagnostics.attach(diagnostics.WARNING)
+    try:
+        SVGValidator.validate_all(VALID_SVG)
+        assert not collector.records
+        SVGValidator.validate_all('<svg width="100" height="100"></svg>')
+        assert collector.records
+        assert all(not record["passed"] for record in collector.records)
+    finally:
+        assert diagnostics.detach() is collector
+
+def test_critic_without_llm_is_silent(capsys, monkeypatch):
+    """Test that a critic without an LLM backend records instead of printing."""
+    from src.agents.critic import CriticAgent
+    monkeypatch.setenv("OPENAI_API_KEY", "")
+    monkeypatch.setenv("LLM_BACKEND", "")
+    with diagnostics.collecting() as collector:
+        assert not CriticAgent().use_llm
+    assert capsys.readouterr().out == ""
+    record, = collector.get_records(component="critic", check="llm_backend")
+    assert "OPENAI_API_KEY" in record["message"]
@@ -1,6 +1,8 @@
 import pytest
 import numpy as np
 from src.utils.feedback_parser import FeedbackParser
+from src.utils.parsed_frame import ParsedFrame
+from src.utils.svg_validator import SVGValidator
 
 def test_parse_animation_timing():
     """Test animation timing analysis."""
@@ -63,6 +65,33 @@ def test_analyze_circle_attributes():
     assert result["has_circle"]
     assert any("not centered" in err for err in result["alignment_errors"])
 
+def test_analyze_every_circle():
+    """Test vectorized checks over all circles with per-circle indices."""
+    svg = (
+        '<svg width="100" height="100">'
+        '<circle cx="50" cy="50" r="40"/>'
+        '<circle cx="20" cy="20" r="-5"/>'
+        '<circle cx="x" cy="30" r="5"/>'
+        '<circle cx="30" cy="70" r="10"/>'
+        '<circle cx="10" cy="10"/>'
+        '</svg>'
+    )
+    result = FeedbackParser.analyze_circle_attributes(svg)
+    assert result["has_circle"]
+    assert result["error_indices"] == {
+        "Missing r attribute": [4],
+        "Invalid cx value": [2],
+        "Negative r value": [1],
+    }
+    assert "Missing r attribute (circle 4)" in result["attribute_errors"]
+    np.testing.assert_array_equal(result["circles"]["cx"][[0, 1, 3, 4]], [50, 20, 30, 10])
+    
+    # Only the first circle must be centered
+    result = FeedbackParser.analyze_circle_attributes(
+        '<svg width="100" height="100"><circle cx="30" cy="70" r="10"/><circle cx="50" cy="50" r="40"/></svg>'
+    )
+    assert result["error_indices"] == {"Circle not centered (cx != cy)": [0]}
+
 def test_generate_feedback():
     """Test comprehensive feedback generation."""
     # Valid animation sequence
@@ -112,4 +141,58 @@ def test_generate_feedback():
     # Empty sequence
     result = FeedbackParser.generate_feedback([])
     assert "No frames provided" in result["alignment_errors"]
-    assert result["overall_error"] == 1.0 
\ No newline at end of file
+    assert result["overall_error"] == 1.0 
+
+def test_frames_parsed_once():
+    """Test that feedback and validation share one parse per frame."""
+    frames = [
+        f'<svg width="100" height="100"><circle cx="50" cy="50" r="{r}"><animate attributeName="r" dur="1s" values="0;20;40"/></circle></svg>'
+        for r in (0, 20, 40)
+    ]
+    ParsedFrame.cache.clear()
+    SVGValidator.cache.clear()
+    FeedbackParser.generate_feedback(frames)
+    for frame in frames:
+        SVGValidator.validate_all(frame, require_animation=True)
+    stats = ParsedFrame.cache.stats()
+    assert stats["misses"] == len(frames)
+    assert stats["size"] == len(frames)
+
+def test_parse_sequence_timing_matches_per_frame():
+    """Test that batch timing gives the per-frame results."""
+    template = '<svg width="100" height="100"><circle cx="50" cy="50" r="40">{0}</circle></svg>'
+    animations = [
+        '<animate attributeName="r" dur="1s" values="0;20;40"/>',
+        '<animate attributeName="r" dur="2s" values="0;5;40;41"/>',
+        '<animate attributeName="r" dur="1s" values="0;5;40;41"/>',  # Shared values list
+        '<animate attributeName="r" dur="500ms" values="40;10;0"/>',  # Decreasing
+        '<animate attributeName="r" dur="1s" values="0"/>',  # Single value
+        '<animate attributeName="r" dur="1s" values="0;x;40"/>',  # Not numeric
+        '<animate attributeName="r" values="0;40"/>',  # No duration
+        '<animate attributeName="r" dur="soon" values="0;40"/>',  # Invalid duration
+        '',  # No animation
+    ]
+    frames = [template.format(animation) for animation in animations] + ['<svg><circle']
+    result = FeedbackParser.parse_sequence_timing(frames)
+    for i, frame in enumerate(frames):
+        expected = FeedbackParser.parse_animation_timing(frame)
+        assert result["has_timing"][i] == expected["has_timing"]
+        assert result["duration"][i] == expected["duration"]
+        assert result["timing_error"][i] == pytest.approx(expected["timing_error"])
+        assert result["smoothness"][i] == pytest.approx(expected["smoothness"])
+
+def test_timing_covers_every_animation():
+    """Test that timing accounts for all animations and their easing."""
+    template = '<svg width="100" height="100"><circle cx="50" cy="50" r="40">{0}</circle></svg>'
+    smooth = '<animate attributeName="r" dur="1s" values="0;20;40"/>'
+    eased = '<animate attributeName="r" dur="2s" values="40;50;40" calcMode="spline" keySplines="0.4 0 0.2 1;0.4 0 0.2 1" repeatCount="indefinite"/>'
+    jumping = '<animate attributeName="cx" dur="1s" values="0;50" calcMode="discrete"/>'
+    
+    result = FeedbackParser.parse_animation_timing(template.format(smooth + eased))
+    assert result["duration"] == 2.0
+    assert result["timing_error"] < 0.1
+    
+    # A later animation that jumps is no longer hidden behind the first
+    result = FeedbackParser.parse_animation_timing(template.format(smooth + jumping))
+    assert result["has_timing"]
+    assert result["timing_error"] == 1.0
@@ -0,0 +1,47 @@
+import numpy as np
+from src.utils import image_stats
+
+def make_pixels(rgb):
+    """Build an opaque image in the rendered pixel layout from RGB values."""
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    pixels = np.full(rgb.shape[:-1] + (4,), 255, dtype=np.uint8)
+    image_stats.channel_views(pixels)[0][...] = rgb
+    return pixels
+
+def test_count_colors_matches_unique(monkeypatch):
+    """Test packed counting against row-wise np.unique, across chunks."""
+    monkeypatch.setattr(image_stats, 'CHUNK_PIXELS', 64)
+    rgb = np.random.default_rng(0).integers(0, 4, size=(37, 23, 3)) * 60
+    pixels = make_pixels(rgb)
+    expected = len(np.unique(rgb.reshape(-1, 3), axis=0))
+    assert image_stats.count_colors(pixels) == expected
+    assert image_stats.color_variety(pixels) == expected / 256 ** 3
+
+def test_quantized_palette():
+    """Test that palette mode merges colors within a quantization bin."""
+    pixels = make_pixels([[[0, 0, 0], [15, 15, 15], [16, 0, 0], [255, 255, 255]]])
+    assert image_stats.count_colors(pixels) == 4
+    assert image_stats.count_colors(pixels, bits=4) == 3
+    assert image_stats.color_variety(pixels, bits=1) == 2 / 8
+
+def test_image_statistics_match_separate_passes(monkeypatch):
+    """Test fused statistics against the per-metric NumPy computations."""
+    monkeypatch.setattr(image_stats, 'CHUNK_PIXELS', 100)
+    pixels = np.random.default_rng(1).integers(0, 256, size=(31, 17, 4)).astype(np.uint8)
+    stats = image_stats.image_statistics(pixels)
+    
+    rgb = image_stats.channel_views(pixels)[0].astype(float)
+    high, low = rgb.max(axis=-1), rgb.min(axis=-1)
+    saturation = np.where(high > 0, (high - low) / np.maximum(high, 1), 0).mean()
+    assert abs(stats["brightness"] - pixels.mean() / 255.0) < 1e-6
+    assert abs(stats["contrast"] - pixels.std() / 255.0) < 1e-5
+    assert abs(stats["saturation"] - saturation) < 1e-5
+    assert stats["color_variety"] == image_stats.color_variety(pixels)
+
+def test_contrast_of_bright_uniform_frame():
+    """Test that contrast stays exact for a bright, near-uniform 4K frame."""
+    pixels = np.random.default_rng(2).integers(249, 252, size=(2160, 3840, 4)).astype(np.uint8)
+    stats = image_stats.image_statistics(pixels)
+    expected = pixels.std(dtype=np.float64) / 255.0
+    assert abs(stats["contrast"] - expected) < 1e-9
+    assert abs(stats["brightness"] - pixels.mean(dtype=np.float64) / 255.0) < 1e-12
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import time
+import pytest
+from src.utils.llm_backend import BackendError, CritiqueBackend, OpenAIBackend, StubBackend, serve_stub
+
+def _request(prompt):
+    return {
+        "model": "stub-model",
+        "messages": [{"role": "system", "content": "Critic"}, {"role": "user", "content": prompt}]
+    }
+
+def test_stub_backend_responses_and_errors():
+    """Test canned responses, chat-completions format and injected errors."""
+    backend = StubBackend(responses=["a", "b"])
+    contents = [backend.complete(_request("x"))["choices"][0]["message"]["content"] for _ in range(3)]
+    assert contents == ["a", "b", "a"]
+
+    # Default content is valid feedback JSON, one entry per batch candidate
+    response = StubBackend().complete(_request("Candidate 0:\n...\nCandidate 1:\n..."))
+    assert response["model"] == "stub-model"
+    assert response["usage"]["total_tokens"] > 0
+    body = json.loads(response["choices"][0]["message"]["content"])
+    assert [entry["id"] for entry in body["candidates"]] == [0, 1]
+
+    failing = StubBackend(error_rate=1.0, error_status=503)
+    with pytest.raises(BackendError) as error:
+        failing.complete(_request("x"))
+    assert error.value.status == 503
+    assert failing.stats()["errors"] == 1
+
+def test_stub_backend_async_latency():
+    """Test that async requests overlap instead of queueing."""
+    backend = StubBackend(latency=0.1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(backend.acomplete(_request(str(i))) for i in range(5)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.3
+    assert backend.stats()["peak_in_flight"] == 5
+
+def test_stub_server_with_openai_client():
+    """Test the localhost server with the OpenAI client, including retries."""
+    stub = StubBackend(responses='{"positive_feedback": ["served"]}')
+    server = serve_stub(stub)
+    try:
+        backend = OpenAIBackend("test-key", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+        response = backend.complete(_request("x"))
+        assert response["choices"][0]["message"]["content"] == '{"positive_feedback": ["served"]}'
+
+        # Each event loop gets its own async client
+        async def acomplete():
+            response = await backend.acomplete(_request("x"))
+            return response["choices"][0]["message"]["content"]
+        assert asyncio.run(acomplete()) == asyncio.run(acomplete()) == '{"positive_feedback": ["served"]}'
+
+        # A rate-limited request is retried by the client before failing
+        stub.error_rate = 1.0
+        backend.max_retries = 1
+        backend._client = None
+        with pytest.raises(Exception):
+            backend.complete(_request("x"))
+        assert stub.stats()["requests"] == 5
+    finally:
+        server.shutdown()
+
+def test_critique_backend_is_abstract():
+    """Test that backends must implement complete()."""
+    with pytest.raises(TypeError):
+        CritiqueBackend()
+
+    class EchoBackend(CritiqueBackend):
+        def complete(self, request):
+            return {"choices": [{"message": {"content": request["messages"][-1]["content"]}}]}
+
+    response = asyncio.run(EchoBackend().acomplete(_request("echo")))
+    assert response["choices"][0]["message"]["content"] == "echo"
@@ -0,0 +1,26 @@
+import numpy as np
+from src.utils import raster
+
+def test_render_svg_zero_copy():
+    """Test that rendered pixels are exposed as views of the cairo buffer."""
+    svg = '<svg xmlns="http://www.w3.org/2000/svg" width="5" height="3"><rect width="5" height="3" fill="#ff8000"/></svg>'
+    pixels = raster.render_svg(svg)
+    assert pixels.shape == (3, 5, 4) and pixels.dtype == np.uint8
+
+    rgb, alpha = raster.channel_views(pixels)
+    assert np.shares_memory(rgb, pixels) and np.shares_memory(alpha, pixels)
+    assert (rgb == (255, 128, 0)).all()
+    assert (alpha == 255).all()
+
+def test_translucent_pixels_are_premultiplied():
+    """Test that to_rgba() undoes cairo's alpha premultiplication."""
+    svg = '<svg xmlns="http://www.w3.org/2000/svg" width="2" height="2"><rect width="2" height="2" fill="#ff0000" fill-opacity="0.5"/></svg>'
+    pixels = raster.render_svg(svg, size=(4, 4))
+    assert pixels.shape == (4, 4, 4)
+
+    rgb, alpha = raster.channel_views(pixels)
+    assert abs(int(rgb[0, 0, 0]) - int(alpha[0, 0])) <= 1
+    rgba = raster.to_rgba(pixels)
+    assert not np.shares_memory(rgba, pixels)
+    assert tuple(rgba[0, 0, :3]) == (255, 0, 0)
+    assert abs(int(rgba[0, 0, 3]) - 128) <= 1
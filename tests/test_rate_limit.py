@@ -0,0 +1,32 @@
+import asyncio
+import time
+from src.utils.rate_limit import RateLimiter, TokenBucket
+
+def test_token_bucket_reservations():
+    """Test bursts up to capacity, then waits at the refill rate."""
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    bucket.updated = 0.0
+    assert bucket.reserve(1, now=0.0) == 0.0
+    assert bucket.reserve(1, now=0.0) == 0.0
+    assert bucket.reserve(1, now=0.0) == 1.0  # One token per second
+    assert bucket.reserve(1, now=0.5) == 1.5
+    
+    bucket.refund(2)
+    assert bucket.reserve(1, now=0.5) == 0.5
+    assert TokenBucket(per_minute=0).reserve(1000, now=0.0) == 0.0
+
+def test_rate_limiter_paces_concurrent_tasks():
+    """Test that async callers are spaced by the tightest limit."""
+    limiter = RateLimiter(requests_per_minute=1200, tokens_per_minute=6000)
+    limiter.configure(requests_per_minute=1200)
+    limiter.requests.level = limiter.tokens.level = 0  # Start with empty buckets
+    
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(tokens=10) for _ in range(4)))
+        return time.monotonic() - start
+    
+    # Tokens allow one request per 0.1 s, requests one per 0.05 s
+    elapsed = asyncio.run(run())
+    assert 0.35 <= elapsed < 0.6
+    assert limiter.stats()["waits"] == 4
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from lxml import etree
+from src.agents.designer_agent import DesignerAgent
+from src.utils.smil_timeline import SMILTimeline
+
+TEMPLATE = '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100"><circle id="c" cx="50" cy="50" r="40" fill="#000000">{0}</circle></svg>'
+
+def test_evaluate_timing_model():
+    """Test interpolation, repeats, freezing and begin offsets together."""
+    timeline = SMILTimeline(TEMPLATE.format(
+        '<animate attributeName="r" dur="2s" values="10;20;40"/>'
+        '<animate attributeName="fill" dur="1s" values="#000000;#ff0000" repeatCount="2" fill="freeze"/>'
+        '<animate attributeName="cy" dur="1s" values="a;b" calcMode="discrete" begin="0.5s"/>'
+        '<set attributeName="cx" to="5" begin="1s"/>'
+    ))
+    assert not timeline.issues
+    result = timeline.evaluate([0.0, 0.5, 1.0, 1.5, 2.0, 3.0])
+    values, applied = result["values"][..., 0], result["applied"]
+    
+    assert values[0, :4] == pytest.approx([10, 15, 20, 30])
+    assert applied[0].tolist() == [True] * 4 + [False] * 2  # Removed after one run
+    assert values[1] == pytest.approx([0, 127.5, 0, 127.5, 255, 255])  # Frozen at the end value
+    assert applied[2].tolist() == [False, True, True, False, False, False]
+    assert result["rows"][2, 1:3].tolist() == [0, 1]
+    assert applied[3].tolist() == [False, False, True, True, True, True]
+
+def test_spline_easing():
+    """Test keySpline easing against the curve evaluated directly."""
+    timeline = SMILTimeline(TEMPLATE.format(
+        '<animate attributeName="r" dur="1s" values="0;100" calcMode="spline" keySplines="0.4 0 0.2 1"/>'
+    ))
+    s = np.linspace(0, 1, 11)
+    x = 3 * (1 - s) ** 2 * s * 0.4 + 3 * (1 - s) * s ** 2 * 0.2 + s ** 3
+    y = 3 * (1 - s) * s ** 2 + s ** 3
+    values = timeline.evaluate(x * 0.999999)["values"][0, :, 0]
+    assert values == pytest.approx(y * 100, abs=1e-3)
+
+def test_designer_snapshots():
+    """Test static snapshots of the designer's animated circles."""
+    timeline = SMILTimeline(DesignerAgent().generate_svg())
+    assert len(timeline.tracks) == 8 and timeline.period == 4.0
+    snapshots = timeline.snapshots([0.0, 1.0, 2.0])
+    
+    radii = []
+    for snapshot in snapshots:
+        root = etree.fromstring(snapshot)
+        assert not root.findall('.//{*}animate')
+        circle = root.find('.//{*}circle')
+        radii.append(float(circle.get('r')))
+    assert radii == [160.0, 200.0, 160.0]
+    assert etree.fromstring(snapshots[2]).find('.//{*}circle').get('fill') == '#00ffff'
@@ -0,0 +1,77 @@
+import pytest
+from src.agents.designer_agent import DesignerAgent
+from src.utils.smil_timing import SMILTimingAnalyzer
+
+TEMPLATE = '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100"><circle cx="50" cy="50" r="40">{0}</circle></svg>'
+
+def test_designer_animations_are_smooth():
+    """Test that every spline-eased designer animation is analyzed."""
+    result = SMILTimingAnalyzer.analyze(DesignerAgent().generate_svg())
+    assert len(result["elements"]) == 8  # Radius and fill for four circles
+    assert not result["issues"]
+    assert all(element["calc_mode"] == "spline" for element in result["elements"])
+    assert result["min_smoothness"] > 0.9
+
+def test_smoothness():
+    """Test smoothness of eased, linear and discrete animations."""
+    eased = '<animate attributeName="r" dur="2s" values="40;50;40" calcMode="spline" keySplines="0.4 0 0.2 1;0.4 0 0.2 1" repeatCount="indefinite"/>'
+    linear = '<animate attributeName="r" dur="2s" values="40;50;40" repeatCount="indefinite"/>'
+    discrete = '<animate attributeName="r" dur="2s" values="40;50" calcMode="discrete"/>'
+    monotone = '<animate attributeName="r" dur="2s" values="0;20;40"/>'
+    assert SMILTimingAnalyzer.analyze(TEMPLATE.format(eased))["smoothness"] > 0.9
+    assert SMILTimingAnalyzer.analyze(TEMPLATE.format(linear))["smoothness"] == 0.0
+    assert SMILTimingAnalyzer.analyze(TEMPLATE.format(discrete))["smoothness"] == 0.0
+    assert SMILTimingAnalyzer.analyze(TEMPLATE.format(monotone))["smoothness"] == 1.0
+    
+    # Repeating without returning to the first value jumps on every repeat
+    repeating = monotone.replace('/>', ' repeatCount="indefinite"/>')
+    assert SMILTimingAnalyzer.analyze(TEMPLATE.format(repeating))["smoothness"] == 0.0
+    once = monotone.replace('/>', ' repeatCount="1"/>')
+    assert SMILTimingAnalyzer.analyze(TEMPLATE.format(once))["smoothness"] == 1.0
+    
+    # Uneven keyTimes change speed at the middle keyframe
+    uneven = monotone.replace('/>', ' keyTimes="0;0.2;1"/>')
+    assert SMILTimingAnalyzer.analyze(TEMPLATE.format(uneven))["smoothness"] == pytest.approx(0.625)
+
+def test_timing_model_issues():
+    """Test reporting of invalid timing attributes."""
+    animations = [
+        '<animate attributeName="r" dur="1s" values="0;40;0" calcMode="spline" keySplines="0.4 0 0.2 1"/>',
+        '<animate attributeName="r" dur="1s" values="0;40;0" keyTimes="0;1"/>',
+        '<animate attributeName="r" values="0;40"/>',
+        '<animate attributeName="r" dur="1s" values="40"/>',
+    ]
+    result = SMILTimingAnalyzer.analyze(TEMPLATE.format(''.join(animations)))
+    issues = [element["issues"] for element in result["elements"]]
+    assert issues == [
+        ["keySplines must list four control values per interval"],
+        ["keyTimes must list one time per value"],
+        ["Missing or invalid duration"],
+        ["Animation needs at least two values"],
+    ]
+    assert result["elements"][3]["smoothness"] is None
+    assert len(result["issues"]) == 4
+
+def test_bulk_evaluation_matches_single_elements():
+    """Test that sampling elements together gives per-element results."""
+    animations = [
+        '<animate attributeName="r" dur="2s" values="40;50;40" calcMode="spline" keySplines="0.4 0 0.2 1;0 0 1 1" repeatCount="indefinite"/>',
+        '<animate attributeName="fill" dur="4s" values="#ff0000;#00ff00;#0000ff;#ff0000" repeatCount="indefinite"/>',
+        '<animateTransform attributeName="transform" type="translate" dur="1s" values="0 0;10 0;10 10" keyTimes="0;0.7;1"/>',
+    ]
+    combined = SMILTimingAnalyzer.analyze(TEMPLATE.format(''.join(animations)))
+    for animation, element in zip(animations, combined["elements"]):
+        single = SMILTimingAnalyzer.analyze(TEMPLATE.format(animation))
+        assert single["elements"] == [element]
+
+def test_analyze_many_matches_analyze():
+    """Test that a frame sequence analyzed at once gives per-frame results."""
+    frames = [
+        TEMPLATE.format('<animate attributeName="r" dur="2s" values="40;50;40" repeatCount="indefinite"/>'),
+        TEMPLATE.format('<animate attributeName="r" dur="1s" values="40;50;40" repeatCount="indefinite"/>'),  # Same timing
+        TEMPLATE.format('<animate attributeName="r" dur="1s" values="40;50;40"/>'),  # Plays once
+        TEMPLATE.format(''),
+        '<svg><circle',
+    ]
+    assert SMILTimingAnalyzer.analyze_many(frames) == [SMILTimingAnalyzer.analyze(frame) for frame in frames]
+
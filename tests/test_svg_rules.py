@@ -0,0 +1,49 @@
+from lxml import etree
+from src.utils.svg_rules import ELEMENT_RULES, DEFAULT_RULES, RuleSet
+
+def test_default_rules():
+    """Test the default circle and animation rules in one pass."""
+    root = etree.fromstring(
+        '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">'
+        '<circle cx="50" cy="50" r="40"><animate dur="1s" values="0;40" attributeName="r"/></circle>'
+        '</svg>'
+    )
+    results = DEFAULT_RULES.evaluate(root)
+    assert results["circle"] == {"found": True, "error": ""}
+    assert results["animation"] == {"found": True, "error": ""}
+    
+    root = etree.fromstring('<svg><circle cx="50" cy="x" r="40"/><circle/></svg>')
+    results = DEFAULT_RULES.evaluate(root)
+    assert results["circle"]["error"] == "Invalid numeric values for circle attributes"
+    assert results["animation"] == {"found": False, "error": "No animation elements found"}
+
+def test_custom_rules():
+    """Test that new element types are checked in the same pass."""
+    rules = RuleSet(ELEMENT_RULES + [
+        {
+            "check": "rect",
+            "tag": "rect",
+            "required": ["width", "height"],
+            "numeric": ["x", "y"],
+            "missing_element": "No rect element found",
+            "missing_attributes": "Rect missing required attributes",
+            "invalid_numeric": "Invalid numeric values for rect attributes"
+        },
+        {
+            "check": "transform",
+            "tag": "animateTransform",
+            "required": ["attributeName", "type", "dur"],
+            "numeric": [],
+            "missing_element": "No animateTransform element found",
+            "missing_attributes": "animateTransform missing required attributes",
+            "invalid_numeric": ""
+        }
+    ])
+    root = etree.fromstring(
+        '<svg><rect x="0" y="0" width="10" height="10">'
+        '<animateTransform attributeName="transform" dur="1s"/></rect></svg>'
+    )
+    results = rules.evaluate(root)
+    assert results["rect"] == {"found": True, "error": ""}
+    assert results["transform"]["error"] == "animateTransform missing required attributes"
+    assert results["circle"]["error"] == "No circle element found"
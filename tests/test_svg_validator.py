@@ -1,5 +1,9 @@
 import pytest
+import io
 from src.utils.svg_validator import SVGValidator
+from lxml import etree
+from src.utils.parsed_frame import ParsedFrame
+from src.utils.svg_schema import load_schema
 
 def test_validate_syntax():
     """Test SVG syntax validation."""
@@ -120,4 +124,191 @@ def test_validate_all():
     assert not results["is_valid"]
     assert len(results["errors"]) > 1  # Should have multiple errors
     assert any("Missing required attributes" in error for error in results["errors"])
-    assert any("Animation element missing required attributes" in error for error in results["errors"]) 
\ No newline at end of file
+    assert any("Animation element missing required attributes" in error for error in results["errors"]) 
+
+def test_validate_all_parsed_frame():
+    """Test validation against a single pre-parsed, namespaced document."""
+    svg = '''<?xml version="1.0" encoding="UTF-8"?>
+    <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+        <circle cx="50" cy="50" r="40">
+            <animate attributeName="r" dur="1s" values="0;40" repeatCount="indefinite"/>
+        </circle>
+    </svg>
+    '''
+    frame = ParsedFrame(svg)
+    assert frame.is_parsed
+    assert frame.root_tag == "svg"
+    assert len(frame.find_all("circle")) == 1
+    
+    results = SVGValidator.validate_all(frame, require_animation=True)
+    assert results["is_valid"]
+    assert SVGValidator.validate_all(svg, require_animation=True) == results
+    
+    # Malformed XML is reported by every check without raising
+    broken = ParsedFrame('<svg width="100" height="100"><circle cx="50"></svg>')
+    assert not broken.is_parsed
+    results = SVGValidator.validate_all(broken)
+    assert not results["is_valid"]
+    assert any("Invalid SVG syntax" in error for error in results["errors"])
+
+def test_shared_parsed_frame():
+    """Test that markup is parsed once and shared across consumers."""
+    svg = '<svg width="100" height="100"><circle cx="50" cy="x" r="40"><animate attributeName="r" dur="500ms" values="0;40"/></circle></svg>'
+    ParsedFrame.cache.clear()
+    SVGValidator.cache.clear()
+    frame = ParsedFrame.shared(svg)
+    assert ParsedFrame.shared(svg) is frame
+    assert ParsedFrame.from_source(svg) is frame
+    SVGValidator.validate_all(svg)
+    assert ParsedFrame.cache.stats()["misses"] == 1
+    
+    # Extracted values are memoized on the frame
+    assert frame.numeric_attributes('circle', ('cx', 'cy', 'r', 'fill')) == [{'cx': 50.0, 'cy': None, 'r': 40.0}]
+    animation, = frame.animations
+    assert animation["attribute"] == "r"
+    assert animation["duration"] == 0.5
+    assert frame.animations is frame.animations
+    
+    # Copies have a private tree
+    copy = frame.copy()
+    copy.root.set("width", "1")
+    assert frame.root.get("width") == "100"
+
+def test_validate_many():
+    """Test ordered batch validation with an aggregate summary."""
+    valid_svg = '<svg width="100" height="100"><circle cx="50" cy="50" r="40"/></svg>'
+    invalid_svg = '<svg><circle cx="50" cy="50" r="40"/></svg>'
+    frames = [valid_svg, invalid_svg, valid_svg, invalid_svg, valid_svg]
+    
+    serial = SVGValidator.validate_many(iter(frames), workers=1)
+    parallel = SVGValidator.validate_many(frames, workers=2)
+    assert serial == parallel
+    assert parallel["results"] == [SVGValidator.validate_all(frame) for frame in frames]
+    
+    summary = parallel["summary"]
+    assert summary["total"] == 5
+    assert summary["valid"] == 3
+    assert summary["invalid"] == 2
+    assert summary["invalid_indices"] == [1, 3]
+    assert summary["error_counts"] == {"Missing required attributes": 2}
+    
+    # Empty batch
+    assert SVGValidator.validate_many([])["summary"]["total"] == 0
+
+def test_validation_cache():
+    """Test that identical documents share cached results."""
+    SVGValidator.cache.clear()
+    svg = '<svg width="100" height="100">\n<circle cx="50" cy="50" r="40"/>\n</svg>'
+    reformatted = svg.replace('\n', '\r\n')
+    
+    first = SVGValidator.validate_all(svg)
+    first["errors"].append("caller mutation")
+    second = SVGValidator.validate_all(reformatted)
+    assert second == {"is_valid": True, "errors": [], "warnings": []}
+    stats = SVGValidator.cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    
+    # require_animation is part of the key
+    assert not SVGValidator.validate_all(svg, require_animation=True)["is_valid"]
+    assert SVGValidator.cache.stats()["size"] == 2
+    
+    # Per-call and global opt-out
+    SVGValidator.validate_all(svg, use_cache=False)
+    assert SVGValidator.cache.stats()["hits"] == 1
+    SVGValidator.cache.configure(enabled=False)
+    try:
+        SVGValidator.validate_all(svg)
+        assert SVGValidator.cache.stats()["hits"] == 1
+    finally:
+        SVGValidator.cache.configure(enabled=True)
+    
+    # LRU eviction
+    SVGValidator.cache.configure(maxsize=1)
+    try:
+        assert len(SVGValidator.cache) == 1
+        SVGValidator.validate_all(svg)
+        assert SVGValidator.cache.stats()["misses"] == 3
+    finally:
+        SVGValidator.cache.configure(maxsize=1024)
+        SVGValidator.cache.clear()
+
+def test_validate_stream_matches_validate_all():
+    """Test that streaming validation reports the same errors as validate_all."""
+    documents = [
+        '',
+        '<svg><circle cx="50" cy="50" r="40"></svg>',
+        '<circle cx="50" cy="50" r="40"/>',
+        '<svg width="100" height="100"><circle/><circle cx="invalid" cy="50" r="40"/></svg>',
+        '''<?xml version="1.0" encoding="UTF-8"?>
+        <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+            <!-- comment -->
+            <g><circle cx="50" cy="50" r="40"><animate attributeName="r"/></circle></g>
+        </svg>''',
+        '''<svg width="100" height="100">
+            <circle cx="50" cy="50" r="40">
+                <animate attributeName="r" dur="1s" values="0;40"/>
+            </circle>
+        </svg>'''
+    ]
+    for svg in documents:
+        for require_animation in (False, True):
+            expected = SVGValidator.validate_all(svg, require_animation=require_animation, use_cache=False)
+            assert SVGValidator.validate_stream(svg, require_animation=require_animation) == expected
+    
+    # Large documents and file objects
+    circles = ''.join(f'<circle cx="{i}" cy="{i}" r="1"/>' for i in range(20000))
+    large_svg = f'<svg width="100" height="100">{circles}<circle cx="1" cy="1"/></svg>'
+    results = SVGValidator.validate_stream(io.BytesIO(large_svg.encode('utf-8')))
+    assert results["errors"] == ["Circle missing required attributes"]
+
+def test_find_elements_index():
+    """Test namespace-agnostic lookups through the frame's tag index."""
+    frame = ParsedFrame(
+        '<svg xmlns:svg="http://www.w3.org/2000/svg" width="100" height="100">'
+        '<circle cx="10" cy="10" r="5"/>'
+        '<svg:circle cx="20" cy="20" r="5"/>'
+        '<g><svg><circle cx="30" cy="30" r="5"/></svg></g>'
+        '</svg>'
+    )
+    circles = frame.find_all('circle')
+    assert [circle.get('cx') for circle in circles] == ['10', '20', '30']
+    assert frame.find('circle') is circles[0]
+    assert len(frame.find_all('svg')) == 2
+    assert frame.find('rect') is None
+    assert frame.find_all('rect') == []
+    
+    # Repeated lookups reuse the same index until the tree changes
+    assert frame.index is frame.index
+    frame.find('g').append(etree.Element('rect'))
+    assert frame.find('rect') is None
+    frame.tree_changed()
+    assert frame.find('rect') is not None
+
+def test_validate_schema():
+    """Test strict validation against the bundled SVG / SMIL schema."""
+    valid_svg = '''
+    <svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+        <circle cx="50" cy="50" r="40">
+            <animate attributeName="r" dur="1s" values="0;40" repeatCount="indefinite" fill="freeze"/>
+        </circle>
+    </svg>
+    '''
+    is_valid, message = SVGValidator.validate_schema(valid_svg)
+    assert is_valid
+    assert message == ""
+    assert SVGValidator.validate_all(valid_svg, require_animation=True, strict=True)["is_valid"]
+    
+    # Invalid clock value passes the basic checks but not the schema
+    invalid_svg = valid_svg.replace('dur="1s"', 'dur="fast"')
+    assert SVGValidator.validate_all(invalid_svg, require_animation=True)["is_valid"]
+    results = SVGValidator.validate_all(invalid_svg, require_animation=True, strict=True)
+    assert not results["is_valid"]
+    assert any("Schema validation failed" in error and "dur" in error for error in results["errors"])
+    
+    # Elements outside the SVG namespace are not conformant
+    is_valid, message = SVGValidator.validate_schema('<svg width="100" height="100"><circle r="4"/></svg>')
+    assert not is_valid
+    
+    # The compiled schema is reused
+    assert load_schema() is load_schema()